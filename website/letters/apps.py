@@ -6,19 +6,35 @@ class LettersConfig(AppConfig):
     name = 'letters'
 
     def ready(self):
-        """Pre-load GeoJSON data on startup for improved performance."""
+        """
+        Connect signal receivers and optionally pre-load GeoJSON data on
+        startup (settings.PRELOAD_BOUNDARIES).
+
+        With gunicorn --preload this runs once in the master process, so forked
+        workers share the parsed geometries copy-on-write instead of each
+        parsing them on their first request.
+        """
+        from django.conf import settings
+
+        from . import signals  # noqa: F401
+
+        if not getattr(settings, 'PRELOAD_BOUNDARIES', False):
+            return
+
+        import gc
+        import logging
+
+        logger = logging.getLogger(__name__)
         try:
             from .services import WahlkreisLocator
-            import logging
 
-            logger = logging.getLogger(__name__)
             logger.info("Warming WahlkreisLocator cache on startup...")
-
-            # Initialize to load and cache GeoJSON data
-            WahlkreisLocator()
-
+            WahlkreisLocator.warm_up()
             logger.info("WahlkreisLocator cache warmed successfully")
         except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
             logger.warning(f"Failed to warm WahlkreisLocator cache: {e}")
+            return
+
+        # Move the warmed objects out of the collector's reach so GC passes in
+        # forked workers don't write to (and thereby copy) their pages
+        gc.freeze()
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import re
+import unicodedata
 from typing import Optional
 
 GERMAN_STATE_ALIASES = {
@@ -126,3 +128,28 @@ def normalize_party_name(party: Optional[str]) -> Optional[str]:
 
     canonical = PARTY_ALIASES.get(cleaned.lower())
     return canonical or cleaned
+
+
+_UMLAUT_FOLDING = str.maketrans({'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'ß': 'ss'})
+# "Straße", "Strasse", "Str." (standalone or as a suffix) all become "str"
+_STREET_SUFFIX_RE = re.compile(r'str(?:asse|\.)(?=\W|$)')
+_NON_ALPHANUMERIC_RE = re.compile(r'[^0-9a-z]+')
+
+
+def normalize_address(address: Optional[str]) -> str:
+    """Return a canonical form of a free-text address for cache lookups.
+
+    Folds case, umlauts and ß, unifies street suffixes ("Straße", "Strasse",
+    "Str.") and reduces punctuation and whitespace runs to single spaces, so
+    "Unter den Linden 1, 10117 Berlin" and "unter den linden 1,10117  berlin"
+    map to the same key.
+    """
+    if not address:
+        return ''
+
+    value = unicodedata.normalize('NFKC', address).lower().translate(_UMLAUT_FOLDING)
+    value = _STREET_SUFFIX_RE.sub('str', value)
+    # Strip remaining accents (é -> e) before dropping everything non-alphanumeric
+    value = unicodedata.normalize('NFKD', value)
+    value = ''.join(char for char in value if not unicodedata.combining(char))
+    return _NON_ALPHANUMERIC_RE.sub(' ', value).strip()
@@ -4,68 +4,225 @@ from __future__ import annotations
 
 import json
 import logging
+import mmap
+import struct
+import threading
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
+import numpy as np
+import shapely
+from pyproj import Transformer
 from shapely.geometry import Point, shape
-from shapely.prepared import prep
+from shapely.strtree import STRtree
 
 logger = logging.getLogger(__name__)
 
+WGS84 = "EPSG:4326"
+
+# Degrees; see simplified_tiers(). About 35-55 m across Germany.
+DEFAULT_SIMPLIFY_TOLERANCE = 0.0005
+
+# Grid cell (row, column) pairs are packed into one int64 key; see cell_key()
+CELL_KEY_STRIDE = 1 << 32
+
+
+@lru_cache(maxsize=None)
+def get_transformer(source_crs: str, target_crs: str = WGS84) -> Transformer:
+    """Return a cached pyproj Transformer; building one costs far more than using it."""
+    return Transformer.from_crs(source_crs, target_crs, always_xy=True)
+
+
+def reproject_to_wgs84(geometries: List[Any], source_crs: str) -> List[Any]:
+    """Reproject geometries from ``source_crs`` to WGS84 with one vectorized pyproj call."""
+    transformer = get_transformer(source_crs)
+
+    def _transform(coords):
+        x, y = transformer.transform(coords[:, 0], coords[:, 1])
+        return np.column_stack([x, y])
+
+    return list(shapely.transform(geometries, _transform))
+
+
+def _looks_geographic(geometries: List[Any]) -> bool:
+    """Return True if all coordinates fall inside the lon/lat value range."""
+    if not geometries:
+        return True
+    minx, miny, maxx, maxy = shapely.total_bounds(geometries)
+    return -180 <= minx <= maxx <= 180 and -90 <= miny <= maxy <= 90
+
+
+def _declared_crs(data: Dict[str, Any]) -> Optional[str]:
+    """Read a legacy GeoJSON ``crs`` member, e.g. ``urn:ogc:def:crs:EPSG::25832``."""
+    name = ((data.get("crs") or {}).get("properties") or {}).get("name")
+    if not name:
+        return None
+    if "CRS84" in name:
+        return WGS84
+    if "EPSG" in name:
+        return f"EPSG:{name.rsplit(':', 1)[-1]}"
+    return None
+
+
+def simplified_tiers(geometries: List[Any], tolerance: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Return low-vertex (inner, outer) approximations of each geometry.
+
+    ``inner`` is shrunk by ``2 * tolerance`` and then simplified by
+    ``tolerance``, so it lies inside the original; ``outer`` is grown and
+    simplified the same way, so it covers the original. Both guarantees are
+    checked: an inner polygon that pokes out is replaced by an empty one and
+    an outer one that misses part of the geometry by its convex hull.
+    """
+    geometries = np.asarray(geometries, dtype=object)
+    inner = shapely.simplify(shapely.buffer(geometries, -2 * tolerance), tolerance)
+    outer = shapely.simplify(shapely.buffer(geometries, 2 * tolerance), tolerance)
+
+    inner_ok = shapely.contains(geometries, inner) | shapely.is_empty(inner)
+    inner[~inner_ok] = shapely.Polygon()
+    outer_ok = shapely.covers(outer, geometries)
+    outer[~outer_ok] = shapely.convex_hull(geometries[~outer_ok])
+    return inner, outer
+
+
+def cell_key(row: Any, column: Any) -> Any:
+    """Pack grid cell rows and columns (ints or int64 arrays) into int64 keys."""
+    return row * CELL_KEY_STRIDE + column
+
+
+def boundary_cells(geometries: List[Any], cell_size: float) -> np.ndarray:
+    """Return the sorted keys of the grid cells that the geometries' boundaries pass through.
+
+    A cell of ``cell_size`` degrees covers ``[column, column + 1) * cell_size``
+    in longitude and ``[row, row + 1) * cell_size`` in latitude. Boundaries
+    are segmentized to half a cell, so consecutive vertices lie in the same
+    or a neighbouring cell; for diagonal neighbours both cells sharing the
+    corner are flagged as well. The result may include extra cells but
+    never misses one: a cell that is not listed lies wholly inside the same
+    features, or outside all of them.
+    """
+    geometries = np.asarray(geometries, dtype=object)
+    if not len(geometries):
+        return np.empty(0, dtype=np.int64)
+
+    lines = shapely.segmentize(shapely.boundary(geometries), cell_size / 2)
+    coordinates = shapely.get_coordinates(lines)
+    rows = np.floor(coordinates[:, 1] / cell_size).astype(np.int64)
+    columns = np.floor(coordinates[:, 0] / cell_size).astype(np.int64)
+
+    diagonal = np.flatnonzero((np.abs(np.diff(rows)) == 1) & (np.abs(np.diff(columns)) == 1))
+    rows = np.concatenate([rows, rows[diagonal], rows[diagonal + 1]])
+    columns = np.concatenate([columns, columns[diagonal + 1], columns[diagonal]])
+    return np.unique(cell_key(rows, columns))
+
 
 @dataclass
 class BoundaryFeature:
     """Represents a single boundary feature with prepared geometry."""
 
     properties: Dict[str, Any]
-    minx: float
-    miny: float
-    maxx: float
-    maxy: float
-    prepared_geometry: Any
+    geometry: Any
 
     def contains(self, point: Point) -> bool:
-        if point.x < self.minx or point.x > self.maxx:
-            return False
-        if point.y < self.miny or point.y > self.maxy:
-            return False
-        return self.prepared_geometry.contains(point)
+        return self.geometry.contains(point)
 
 
 class BoundaryIndex:
-    """Spatial index over Wahlkreis polygon features."""
+    """Spatial index over Wahlkreis polygon features.
 
-    def __init__(self, features: Iterable[Dict[str, Any]]):
-        self._features = []
+    Geometries are prepared in place and indexed with an STRtree, so a lookup
+    only runs ``contains`` tests on features whose bounding box holds the
+    point. Features keep their load order, and candidates are tested in
+    that order so results match a linear scan.
+
+    With a ``simplify_tolerance`` each feature also gets a simplified inner
+    polygon and outer hull (see ``simplified_tiers``). A point inside the
+    inner polygon is accepted and a point outside the hull rejected without
+    touching the full geometry; only points in the band between the two
+    need the exact test. ``tier_stats`` counts how candidate tests were
+    decided.
+    """
+
+    # Guards tier_stats, which request threads update concurrently
+    _stats_lock = threading.Lock()
+
+    def __init__(
+        self,
+        features: Iterable[Dict[str, Any]],
+        source_crs: Optional[str] = None,
+        simplify_tolerance: float = DEFAULT_SIMPLIFY_TOLERANCE,
+    ):
+        properties_list = []
+        geometries = []
         for feature in features:
             geometry_mapping = feature.get("geometry")
-            properties = feature.get("properties", {})
             if not geometry_mapping:
                 continue
+            properties_list.append(feature.get("properties", {}))
+            geometries.append(shape(geometry_mapping))
 
-            geometry = shape(geometry_mapping)
-            if not geometry.is_valid:
-                geometry = geometry.buffer(0)
-
-            minx, miny, maxx, maxy = geometry.bounds
-            prepared = prep(geometry)
-
-            self._features.append(
-                BoundaryFeature(
-                    properties=properties,
-                    minx=minx,
-                    miny=miny,
-                    maxx=maxx,
-                    maxy=maxy,
-                    prepared_geometry=prepared,
-                )
-            )
+        # Store everything in WGS84 so lookups never need a per-request transform
+        if source_crs and source_crs != WGS84:
+            if _looks_geographic(geometries):
+                logger.debug("Coordinates already geographic; ignoring declared CRS %s", source_crs)
+            else:
+                geometries = reproject_to_wgs84(geometries, source_crs)
+
+        repaired = [geometry if geometry.is_valid else geometry.buffer(0) for geometry in geometries]
+        self._index(properties_list, repaired, simplify_tolerance)
+
+    def _index(
+        self,
+        properties_list: List[Dict[str, Any]],
+        geometries: List[Any],
+        simplify_tolerance: float,
+        tiers: Optional[Tuple[Any, Any]] = None,
+    ) -> None:
+        self._features: List[BoundaryFeature] = [
+            BoundaryFeature(properties=properties, geometry=geometry)
+            for properties, geometry in zip(properties_list, geometries)
+        ]
+        shapely.prepare(geometries)
+        self._tree = STRtree(geometries)
+
+        self.simplify_tolerance = simplify_tolerance if geometries else 0
+        self._inner = self._outer = None
+        if self.simplify_tolerance:
+            if tiers is None:
+                tiers = simplified_tiers(geometries, self.simplify_tolerance)
+            self._inner, self._outer = (np.asarray(tier, dtype=object) for tier in tiers)
+            shapely.prepare(self._inner)
+            shapely.prepare(self._outer)
+        self.tier_stats = {"inner": 0, "outer": 0, "exact": 0}
 
         logger.debug("Loaded %s boundary features", len(self._features))
 
     @classmethod
-    def from_geojson(cls, path: Path) -> "BoundaryIndex":
+    def from_geometries(
+        cls,
+        properties_list: List[Dict[str, Any]],
+        geometries: List[Any],
+        simplify_tolerance: float = DEFAULT_SIMPLIFY_TOLERANCE,
+        tiers: Optional[Tuple[Any, Any]] = None,
+    ) -> "BoundaryIndex":
+        """Build an index from valid WGS84 geometries, skipping parsing and repair.
+
+        ``tiers`` are precomputed ``(inner, outer)`` geometries for
+        ``simplify_tolerance``; they are computed when omitted.
+        """
+        index = cls([], simplify_tolerance=0)
+        index._index(list(properties_list), list(geometries), simplify_tolerance, tiers)
+        return index
+
+    @classmethod
+    def from_geojson(
+        cls,
+        path: Path,
+        source_crs: Optional[str] = None,
+        simplify_tolerance: float = DEFAULT_SIMPLIFY_TOLERANCE,
+    ) -> "BoundaryIndex":
+        """Load a GeoJSON file; a ``crs`` member in the file wins over ``source_crs``."""
         logger.info("Loading constituency boundaries from %s", path)
         with path.open("r", encoding="utf-8") as geojson_file:
             data = json.load(geojson_file)
@@ -73,36 +230,350 @@ class BoundaryIndex:
         features = data.get("features", [])
         if not features:
             logger.warning("Boundary dataset at %s contains no features", path)
-        return cls(features)
+        return cls(
+            features,
+            source_crs=_declared_crs(data) or source_crs,
+            simplify_tolerance=simplify_tolerance,
+        )
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+    def __iter__(self) -> Iterator[BoundaryFeature]:
+        return iter(self._features)
+
+    def __getitem__(self, position: int) -> BoundaryFeature:
+        return self._features[position]
+
+    @property
+    def tree(self) -> STRtree:
+        return self._tree
+
+    @property
+    def tiers(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """The ``(inner, outer)`` simplified geometries, or None without a tolerance."""
+        if self._inner is None:
+            return None
+        return self._inner, self._outer
+
+    def candidates(self, point: Point) -> List[BoundaryFeature]:
+        """Return features whose bounding box contains the point, in load order."""
+        return [self._features[position] for position in sorted(self._tree.query(point).tolist())]
+
+    def find(self, point: Point) -> Optional[BoundaryFeature]:
+        """Return the first feature containing the point."""
+        for position in sorted(self._tree.query(point).tolist()):
+            if self._inner is not None:
+                if self._inner[position].contains(point):
+                    self._count("inner")
+                    return self._features[position]
+                if not self._outer[position].contains(point):
+                    self._count("outer")
+                    continue
+            self._count("exact")
+            if self._features[position].contains(point):
+                return self._features[position]
+        return None
+
+    def find_many(self, points: Any) -> np.ndarray:
+        """Vectorized ``find``: return the matching feature position per point, or -1.
+
+        One STRtree bulk query yields bounding-box candidate pairs, and a
+        single vectorized ``shapely.contains`` call over the prepared tree
+        geometries filters them. On overlaps the lowest position wins, as in
+        ``find``.
+        """
+        points = np.asarray(points, dtype=object)
+        positions = np.full(len(points), -1, dtype=np.int64)
+        if not len(points) or not self._features:
+            return positions
+
+        point_indexes, tree_indexes = self._tree.query(points)
+        if self._inner is None:
+            hits = shapely.contains(self._tree.geometries[tree_indexes], points[point_indexes])
+            self._count("exact", len(hits))
+        else:
+            hits = shapely.contains(self._inner[tree_indexes], points[point_indexes])
+            undecided = np.flatnonzero(~hits)
+            in_outer = shapely.contains(self._outer[tree_indexes[undecided]], points[point_indexes[undecided]])
+            exact = undecided[in_outer]
+            hits[exact] = shapely.contains(self._tree.geometries[tree_indexes[exact]], points[point_indexes[exact]])
+            self._count("inner", len(hits) - len(undecided))
+            self._count("outer", len(undecided) - len(exact))
+            self._count("exact", len(exact))
+        point_indexes = point_indexes[hits]
+        tree_indexes = tree_indexes[hits]
+
+        # Assign in descending tree order so the lowest position is written last
+        order = np.argsort(-tree_indexes, kind="stable")
+        positions[point_indexes[order]] = tree_indexes[order]
+        return positions
+
+    def boundary_cells(self, cell_size: float) -> np.ndarray:
+        """Sorted keys of the grid cells crossed by a feature boundary (see ``boundary_cells``)."""
+        return boundary_cells(self._tree.geometries, cell_size)
 
     def lookup(self, latitude: float, longitude: float) -> Optional[Dict[str, Any]]:
         """Return feature properties for the polygon containing the given point."""
-        point = Point(longitude, latitude)
-        for feature in self._features:
-            if feature.contains(point):
-                return feature.properties
-        return None
+        feature = self.find(Point(longitude, latitude))
+        return feature.properties if feature else None
+
+    def _count(self, tier: str, count: int = 1) -> None:
+        with self._stats_lock:
+            self.tier_stats[tier] += count
+
+    def reset_tier_stats(self) -> None:
+        with self._stats_lock:
+            self.tier_stats = {"inner": 0, "outer": 0, "exact": 0}
+
+
+class BoundaryArtifact:
+    """Precompiled binary snapshot of several boundary datasets.
+
+    Layout: an 8-byte magic, a little-endian uint64 header length, a JSON
+    header (per dataset: source file size/mtime, property table, simplify
+    tolerance, WKB offsets) and finally the concatenated WKB blobs.
+    Geometries are stored already reprojected to WGS84 and repaired, along
+    with their simplified inner/outer tiers, so loading skips JSON parsing,
+    ``shape()``, reprojection, ``buffer(0)`` and the tier computation. The file is memory-mapped
+    read-only, so worker processes on one host share its pages through the
+    OS page cache.
+    """
+
+    MAGIC = b"WTBNDRY1"
+    VERSION = 2
+    _HEADER_LENGTH = struct.Struct("<Q")
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with self.path.open("rb") as artifact_file:
+            self._buffer = mmap.mmap(artifact_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        prefix_size = len(self.MAGIC) + self._HEADER_LENGTH.size
+        if self._buffer[: len(self.MAGIC)] != self.MAGIC:
+            raise ValueError(f"{self.path} is not a boundary artifact")
+        (header_length,) = self._HEADER_LENGTH.unpack_from(self._buffer, len(self.MAGIC))
+        header = json.loads(self._buffer[prefix_size : prefix_size + header_length].decode("utf-8"))
+        if header.get("version") != self.VERSION:
+            raise ValueError(f"Unsupported boundary artifact version in {self.path}")
+
+        self._datasets: Dict[str, Dict[str, Any]] = header["datasets"]
+        self._blob_offset = prefix_size + header_length
+
+    @staticmethod
+    def _source_stamp(source_path: Path) -> Dict[str, int]:
+        stat = Path(source_path).stat()
+        return {"source_size": stat.st_size, "source_mtime_ns": stat.st_mtime_ns}
+
+    @classmethod
+    def compile(
+        cls,
+        datasets: Dict[Path, Optional[str]],
+        output_path: Path,
+        simplify_tolerance: float = DEFAULT_SIMPLIFY_TOLERANCE,
+    ) -> Dict[str, int]:
+        """Write an artifact for ``{geojson_path: source_crs}`` and return feature counts per dataset."""
+        header_datasets: Dict[str, Dict[str, Any]] = {}
+        blobs: List[bytes] = []
+        offset = 0
+        counts: Dict[str, int] = {}
+
+        def _append(geometries) -> List[List[int]]:
+            nonlocal offset
+            offsets = []
+            for blob in shapely.to_wkb(np.asarray(geometries, dtype=object)).tolist():
+                offsets.append([offset, len(blob)])
+                blobs.append(blob)
+                offset += len(blob)
+            return offsets
+
+        for source_path, source_crs in datasets.items():
+            source_path = Path(source_path)
+            index = BoundaryIndex.from_geojson(
+                source_path,
+                source_crs=source_crs,
+                simplify_tolerance=simplify_tolerance,
+            )
+            dataset = {
+                **cls._source_stamp(source_path),
+                "properties": [feature.properties for feature in index],
+                "offsets": _append([feature.geometry for feature in index]),
+                "simplify_tolerance": index.simplify_tolerance,
+            }
+            if index.tiers is not None:
+                inner, outer = index.tiers
+                dataset["inner_offsets"] = _append(inner)
+                dataset["outer_offsets"] = _append(outer)
+
+            header_datasets[source_path.name] = dataset
+            counts[source_path.name] = len(index)
+
+        header = json.dumps(
+            {"version": cls.VERSION, "datasets": header_datasets},
+            ensure_ascii=False,
+        ).encode("utf-8")
+
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = output_path.with_suffix(output_path.suffix + ".tmp")
+        with temporary_path.open("wb") as artifact_file:
+            artifact_file.write(cls.MAGIC)
+            artifact_file.write(cls._HEADER_LENGTH.pack(len(header)))
+            artifact_file.write(header)
+            for blob in blobs:
+                artifact_file.write(blob)
+        # Atomic swap so running workers never map a half-written file
+        temporary_path.replace(output_path)
+        return counts
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._datasets
+
+    def _geometries(self, offsets: List[List[int]]) -> List[Any]:
+        base = self._blob_offset
+        blobs = [self._buffer[base + start : base + start + length] for start, length in offsets]
+        return list(shapely.from_wkb(np.array(blobs, dtype=object)))
+
+    def load_index(
+        self,
+        source_path: Path,
+        simplify_tolerance: float = DEFAULT_SIMPLIFY_TOLERANCE,
+    ) -> Optional[BoundaryIndex]:
+        """Return the index for ``source_path``, or None if absent or stale.
+
+        A dataset is stale when its source file exists but its size or
+        modification time differs from the compiled snapshot. Stored tiers
+        are used when they were compiled with ``simplify_tolerance``;
+        otherwise the tiers are recomputed.
+        """
+        source_path = Path(source_path)
+        dataset = self._datasets.get(source_path.name)
+        if dataset is None:
+            return None
+
+        if source_path.exists():
+            stamp = self._source_stamp(source_path)
+            if any(dataset[key] != value for key, value in stamp.items()):
+                logger.warning(
+                    "Boundary artifact %s is stale for %s; re-run compile_boundaries",
+                    self.path,
+                    source_path.name,
+                )
+                return None
+
+        geometries = self._geometries(dataset["offsets"])
+        tiers = None
+        if simplify_tolerance and dataset.get("simplify_tolerance") == simplify_tolerance and "inner_offsets" in dataset:
+            tiers = (self._geometries(dataset["inner_offsets"]), self._geometries(dataset["outer_offsets"]))
+        logger.info("Loaded %s boundary features for %s from %s", len(geometries), source_path.name, self.path)
+        return BoundaryIndex.from_geometries(dataset["properties"], geometries, simplify_tolerance, tiers)
 
 
 class BoundaryRepository:
-    """Lazy loader that caches the boundary index in memory."""
+    """Process-wide cache of boundary indexes, one per dataset file.
+
+    Every consumer (``WahlkreisLocator`` included) goes through this class, so
+    each GeoJSON file is parsed and indexed at most once per process. When a
+    compiled ``BoundaryArtifact`` exists at
+    ``settings.CONSTITUENCY_BOUNDARIES_ARTIFACT_PATH``, datasets are read
+    from it instead of from GeoJSON.
+    """
+
+    _indexes: Dict[str, BoundaryIndex] = {}
+    _artifact: Optional[BoundaryArtifact] = None
+    _artifact_checked = False
+    _lock = threading.Lock()
+
+    @classmethod
+    def _get_artifact(cls) -> Optional[BoundaryArtifact]:
+        if cls._artifact_checked:
+            return cls._artifact
+
+        from django.conf import settings
+
+        cls._artifact_checked = True
+        artifact_path = getattr(settings, "CONSTITUENCY_BOUNDARIES_ARTIFACT_PATH", None)
+        if artifact_path and Path(artifact_path).exists():
+            try:
+                cls._artifact = BoundaryArtifact(Path(artifact_path))
+            except (OSError, ValueError) as exc:
+                logger.warning("Ignoring boundary artifact %s: %s", artifact_path, exc)
+        return cls._artifact
+
+    @staticmethod
+    def _simplify_tolerance() -> float:
+        from django.conf import settings
 
-    _index: Optional[BoundaryIndex] = None
+        return getattr(settings, "BOUNDARY_SIMPLIFY_TOLERANCE", DEFAULT_SIMPLIFY_TOLERANCE)
+
+    @staticmethod
+    def _key(boundary_path: Path) -> str:
+        return str(Path(boundary_path).resolve())
+
+    @classmethod
+    def configure(cls, boundary_path: Path, source_crs: Optional[str] = None) -> BoundaryIndex:
+        index = BoundaryIndex.from_geojson(
+            Path(boundary_path),
+            source_crs=source_crs,
+            simplify_tolerance=cls._simplify_tolerance(),
+        )
+        cls._indexes[cls._key(boundary_path)] = index
+        return index
 
     @classmethod
-    def configure(cls, boundary_path: Path) -> None:
-        cls._index = BoundaryIndex.from_geojson(boundary_path)
+    def has_dataset(cls, boundary_path: Path) -> bool:
+        """Return True if the dataset is available as a file or in the compiled artifact."""
+        if Path(boundary_path).exists():
+            return True
+        artifact = cls._get_artifact()
+        return artifact is not None and Path(boundary_path).name in artifact
+
+    @classmethod
+    def _load(cls, boundary_path: Path, source_crs: Optional[str]) -> Optional[BoundaryIndex]:
+        artifact = cls._get_artifact()
+        if artifact is not None:
+            index = artifact.load_index(boundary_path, cls._simplify_tolerance())
+            if index is not None:
+                cls._indexes[cls._key(boundary_path)] = index
+                return index
+
+        if not Path(boundary_path).exists():
+            logger.warning("Boundary dataset %s not found", boundary_path)
+            return None
+        return cls.configure(boundary_path, source_crs=source_crs)
 
     @classmethod
-    def get_index(cls, boundary_path: Optional[Path]) -> Optional[BoundaryIndex]:
+    def get_index(
+        cls,
+        boundary_path: Optional[Path],
+        source_crs: Optional[str] = None,
+    ) -> Optional[BoundaryIndex]:
+        """Return the cached index for a dataset, loading it on first use.
+
+        ``source_crs`` names the CRS of the file's coordinates; the index is
+        reprojected to WGS84 once at load time.
+        """
         if boundary_path is None:
             logger.debug("No boundary dataset configured")
             return None
 
-        if cls._index is None:
-            if not boundary_path.exists():
-                logger.warning("Boundary dataset %s not found", boundary_path)
-                return None
-            cls.configure(boundary_path)
+        key = cls._key(boundary_path)
+        index = cls._indexes.get(key)
+        if index is not None:
+            return index
 
-        return cls._index
+        with cls._lock:
+            # Another thread may have finished loading while we waited
+            index = cls._indexes.get(key)
+            if index is not None:
+                return index
+
+            return cls._load(Path(boundary_path), source_crs)
+
+    @classmethod
+    def clear(cls) -> None:
+        """Drop all cached indexes and the artifact handle (mainly for tests and data reloads)."""
+        with cls._lock:
+            cls._indexes = {}
+            cls._artifact = None
+            cls._artifact_checked = False
@@ -0,0 +1,166 @@
+# ABOUTME: Benchmark replaying a recorded address corpus through WahlkreisResolver with a stubbed geocoder.
+# ABOUTME: Reports p50/p95/p99 latency per pipeline stage from the instrumentation spans.
+
+import csv
+import math
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from letters.constants import normalize_address
+from letters.services.geocoding import AddressGeocoder, WahlkreisLocator
+from letters.services.geocoding_backends import GeocoderBackend, format_address
+from letters.services.instrumentation import SpanRecorder
+from letters.services.wahlkreis import WahlkreisResolver
+
+# Report order; stages not listed here follow alphabetically
+STAGES = (
+    'resolve',
+    'resolve.postal_code',
+    'geocode.cache',
+    'geocode.rate_limit',
+    'geocode.http',
+    'geocode.store',
+    'locator.load',
+    'locator.locate',
+    'resolve.constituencies',
+)
+
+
+class ReplayGeocoderBackend(GeocoderBackend):
+    """Answer lookups from the corpus' recorded coordinates after a simulated network delay."""
+
+    name = 'replay'
+
+    def __init__(self, coordinates, latency, cacheable):
+        super().__init__()
+        self.coordinates = coordinates
+        self.latency = latency
+        self.cacheable = cacheable
+
+    def lookup(self, address, country):
+        if self.latency:
+            time.sleep(self.latency)
+        return self.coordinates.get(normalize_address(address))
+
+
+class Command(BaseCommand):
+    help = (
+        'Replay a recorded address corpus through WahlkreisResolver with a stubbed geocoder '
+        'and report p50/p95/p99 latency for each stage (postal code table, geocode cache, '
+        'rate limit, HTTP, boundary load, point-in-polygon, constituency lookup)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'corpus',
+            type=str,
+            help='CSV with an address column or street/postal_code/city columns, plus the '
+                 'recorded latitude/longitude (rows without coordinates replay as "not found")'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=1,
+            help='Replay the corpus this many times (default: 1)'
+        )
+        parser.add_argument(
+            '--latency',
+            type=float,
+            default=0.0,
+            help='Simulated geocoder response time in milliseconds (default: 0)'
+        )
+        parser.add_argument(
+            '--cache',
+            action='store_true',
+            help='Let the geocoder read and write the geocode cache tiers, including the '
+                 'GeocodeCache table of the configured database (default: off)'
+        )
+        parser.add_argument(
+            '--geojson',
+            type=str,
+            help='Federal GeoJSON file (default: settings.CONSTITUENCY_BOUNDARIES_PATH)'
+        )
+
+    def handle(self, *args, **options):
+        rows = self._read_corpus(options['corpus'])
+        if not rows:
+            raise CommandError('No addresses in the corpus')
+
+        coordinates = {
+            normalize_address(row['address']): row['coordinates']
+            for row in rows if row['coordinates']
+        }
+        backend = ReplayGeocoderBackend(coordinates, options['latency'] / 1000, options['cache'])
+
+        resolver = WahlkreisResolver()
+        resolver._geocoder = AddressGeocoder(backend=backend)
+        if options['geojson']:
+            try:
+                resolver._wahlkreis_locator = WahlkreisLocator(options['geojson'])
+            except FileNotFoundError as exc:
+                raise CommandError(str(exc))
+
+        self.stdout.write(f'Addresses: {len(rows)} x {options["repeat"]}')
+
+        located = 0
+        start = time.perf_counter()
+        with SpanRecorder() as recorder:
+            for _ in range(options['repeat']):
+                for row in rows:
+                    if row['parts']:
+                        result = resolver.resolve_structured(*row['parts'])
+                    else:
+                        result = resolver.resolve(row['address'])
+                    if result['federal_wahlkreis_number']:
+                        located += 1
+        elapsed = time.perf_counter() - start
+
+        total = len(rows) * options['repeat']
+        self.stdout.write(self.style.SUCCESS('\n=== Resolver latency (ms) ==='))
+        self.stdout.write(f'{"Stage":<24} {"Count":>7} {"p50":>9} {"p95":>9} {"p99":>9} {"Total":>10}')
+        ordered = [name for name in STAGES if name in recorder.durations]
+        ordered += sorted(name for name in recorder.durations if name not in STAGES)
+        for name in ordered:
+            durations = sorted(recorder.durations[name])
+            self.stdout.write(
+                f'{name:<24} {len(durations):>7} '
+                f'{self._percentile(durations, 0.50) * 1000:>9.3f} '
+                f'{self._percentile(durations, 0.95) * 1000:>9.3f} '
+                f'{self._percentile(durations, 0.99) * 1000:>9.3f} '
+                f'{sum(durations) * 1000:>10.1f}'
+            )
+
+        self.stdout.write('')
+        self.stdout.write(f'Located:    {located} / {total}')
+        self.stdout.write(f'Throughput: {total / elapsed:.0f} addresses/s ({elapsed:.2f}s total)')
+
+    @staticmethod
+    def _percentile(sorted_values, fraction):
+        """Nearest-rank percentile of an already sorted list."""
+        rank = max(1, math.ceil(fraction * len(sorted_values)))
+        return sorted_values[rank - 1]
+
+    @staticmethod
+    def _read_corpus(path):
+        corpus_path = Path(path)
+        if not corpus_path.exists():
+            raise CommandError(f'Corpus file not found at {corpus_path}')
+
+        rows = []
+        with corpus_path.open(newline='', encoding='utf-8') as csv_file:
+            for row in csv.DictReader(csv_file):
+                parts = None
+                address = (row.get('address') or '').strip()
+                if not address:
+                    parts = tuple((row.get(key) or '').strip() for key in ('street', 'postal_code', 'city'))
+                    address = format_address(*parts)
+                if not address:
+                    continue
+
+                coordinates = None
+                if row.get('latitude') and row.get('longitude'):
+                    coordinates = (float(row['latitude']), float(row['longitude']))
+                rows.append({'address': address, 'parts': parts, 'coordinates': coordinates})
+        return rows
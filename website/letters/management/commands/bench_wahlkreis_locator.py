@@ -0,0 +1,205 @@
+# ABOUTME: Microbenchmark comparing the indexed WahlkreisLocator with a plain linear polygon scan.
+# ABOUTME: Uses random points or real address coordinates; reports timings and hit rates per lookup tier.
+
+import csv
+import json
+import random
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from shapely.geometry import Point, shape
+
+from letters.geo import BoundaryIndex
+from letters.services.geocoding import WahlkreisLocator
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark federal Wahlkreis point-in-polygon lookups: linear scan over '
+        'unprepared geometries versus the STRtree index used by WahlkreisLocator, '
+        'with and without the simplified inner/outer geometry tiers'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--points',
+            type=int,
+            default=5000,
+            help='Number of random points to look up (default: 5000)'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed for reproducible point samples'
+        )
+        parser.add_argument(
+            '--geojson',
+            type=str,
+            help='Federal GeoJSON file (default: settings.CONSTITUENCY_BOUNDARIES_PATH)'
+        )
+        parser.add_argument(
+            '--addresses',
+            type=str,
+            help='CSV of geocoded addresses (latitude, longitude columns) to use instead of '
+                 'random points; real addresses cluster in towns and near borders'
+        )
+
+    def handle(self, *args, **options):
+        geojson_path = Path(options['geojson'] or settings.CONSTITUENCY_BOUNDARIES_PATH)
+        if not geojson_path.exists():
+            raise CommandError(f'GeoJSON file not found at {geojson_path}')
+
+        # Baseline: the original representation, unprepared shapely geometries
+        with open(geojson_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        linear = [
+            (feature.get('properties', {}).get('WKR_NR'), shape(feature['geometry']))
+            for feature in data.get('features', [])
+        ]
+        if not linear:
+            raise CommandError(f'No features in {geojson_path}')
+
+        locator = WahlkreisLocator(geojson_path)
+
+        minx = min(geometry.bounds[0] for _, geometry in linear)
+        miny = min(geometry.bounds[1] for _, geometry in linear)
+        maxx = max(geometry.bounds[2] for _, geometry in linear)
+        maxy = max(geometry.bounds[3] for _, geometry in linear)
+
+        if options['addresses']:
+            points = self._read_addresses(options['addresses'])
+        else:
+            rng = random.Random(options['seed'])
+            points = [
+                (rng.uniform(miny, maxy), rng.uniform(minx, maxx))
+                for _ in range(options['points'])
+            ]
+        if not points:
+            raise CommandError('No points to look up')
+
+        self.stdout.write(f'Features: {len(linear)}')
+        self.stdout.write(f'Points:   {len(points)}')
+
+        start = time.perf_counter()
+        linear_results = []
+        for latitude, longitude in points:
+            point = Point(longitude, latitude)
+            match = None
+            for wkr_nr, geometry in linear:
+                if geometry.contains(point):
+                    match = wkr_nr
+                    break
+            linear_results.append(match)
+        linear_seconds = time.perf_counter() - start
+
+        # Same index without simplified tiers: every candidate gets the exact test
+        exact_index = BoundaryIndex.from_geometries(
+            [feature.properties for feature in locator.constituencies],
+            [feature.geometry for feature in locator.constituencies],
+            simplify_tolerance=0,
+        )
+        start = time.perf_counter()
+        exact_results = []
+        for latitude, longitude in points:
+            feature = exact_index.find(Point(longitude, latitude))
+            exact_results.append(feature.properties.get('WKR_NR') if feature else None)
+        exact_seconds = time.perf_counter() - start
+
+        indexes = {'federal': locator.constituencies, **locator.state_constituencies}
+        for index in indexes.values():
+            index.reset_tier_stats()
+
+        start = time.perf_counter()
+        indexed_results = []
+        for latitude, longitude in points:
+            federal = locator._locate_exact(latitude, longitude)['federal']
+            indexed_results.append(federal['wkr_nr'] if federal else None)
+        indexed_seconds = time.perf_counter() - start
+        tier_stats = {name: dict(index.tier_stats) for name, index in indexes.items()}
+
+        # Grid cell cache: flag boundary cells up front, then the first pass
+        # fills interior cells and the second hits them
+        WahlkreisLocator.clear_cell_cache()
+        start = time.perf_counter()
+        locator._cell_grid()
+        grid_seconds = time.perf_counter() - start
+        cell_timings = []
+        for _ in range(2):
+            start = time.perf_counter()
+            cell_results = []
+            for latitude, longitude in points:
+                federal = locator._locate_detailed(latitude, longitude)['federal']
+                cell_results.append(federal['wkr_nr'] if federal else None)
+            cell_timings.append(time.perf_counter() - start)
+        cell_stats = WahlkreisLocator.cell_cache_stats()
+
+        start = time.perf_counter()
+        batch_results = [
+            result['federal']['wkr_nr'] if result else None
+            for result in locator.locate_many(points)
+        ]
+        batch_seconds = time.perf_counter() - start
+
+        mismatches = sum(1 for a, b in zip(linear_results, indexed_results) if a != b)
+        mismatches += sum(1 for a, b in zip(linear_results, exact_results) if a != b)
+        mismatches += sum(1 for a, b in zip(linear_results, batch_results) if a != b)
+        mismatches += sum(1 for a, b in zip(linear_results, cell_results) if a != b)
+        hits = sum(1 for result in indexed_results if result is not None)
+
+        self.stdout.write(self.style.SUCCESS('\n=== Results ==='))
+        self.stdout.write(f'Points inside a Wahlkreis: {hits}')
+        self.stdout.write(
+            f'Linear scan:   {linear_seconds:.3f}s total, '
+            f'{linear_seconds / len(points) * 1e6:.1f} µs/lookup'
+        )
+        self.stdout.write(
+            f'Exact only:    {exact_seconds:.3f}s total, '
+            f'{exact_seconds / len(points) * 1e6:.1f} µs/lookup (STRtree, no simplified tiers)'
+        )
+        self.stdout.write(
+            f'STRtree index: {indexed_seconds:.3f}s total, '
+            f'{indexed_seconds / len(points) * 1e6:.1f} µs/lookup '
+            f'(federal + state, simplified tiers at {locator.constituencies.simplify_tolerance}°)'
+        )
+        self.stdout.write(
+            f'locate_many:   {batch_seconds:.3f}s total, '
+            f'{batch_seconds / len(points) * 1e6:.1f} µs/lookup'
+        )
+        self.stdout.write(
+            f'Cell cache:    {grid_seconds:.3f}s to flag boundary cells, '
+            f'{cell_timings[0]:.3f}s cold, {cell_timings[1]:.3f}s warm, '
+            f'{cell_timings[1] / len(points) * 1e6:.1f} µs/lookup warm '
+            f'({cell_stats["boundary"]} boundary-cell fallbacks)'
+        )
+        if indexed_seconds > 0:
+            self.stdout.write(f'Speedup:       {linear_seconds / indexed_seconds:.1f}x')
+
+        self.stdout.write('\nCandidate tests decided by tier (inner accept / outer reject / exact):')
+        for name, stats in tier_stats.items():
+            total = sum(stats.values())
+            if not total:
+                continue
+            self.stdout.write(
+                f'  {name:<8} {stats["inner"] / total:6.1%} / {stats["outer"] / total:6.1%} / '
+                f'{stats["exact"] / total:6.1%}  ({total} tests)'
+            )
+
+        if mismatches:
+            self.stdout.write(self.style.ERROR(f'Mismatching results: {mismatches}'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Results identical for all points'))
+
+    @staticmethod
+    def _read_addresses(path):
+        addresses_path = Path(path)
+        if not addresses_path.exists():
+            raise CommandError(f'Addresses file not found at {addresses_path}')
+        with addresses_path.open(newline='', encoding='utf-8') as csv_file:
+            return [
+                (float(row['latitude']), float(row['longitude']))
+                for row in csv.DictReader(csv_file)
+                if row.get('latitude') and row.get('longitude')
+            ]
@@ -0,0 +1,186 @@
+# ABOUTME: Management command reporting integrity and load cost of every Wahlkreis boundary file.
+# ABOUTME: Optionally writes repaired (and simplified) WGS84 copies so startup skips the repair.
+
+import json
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import shapely
+from django.core.management.base import BaseCommand, CommandError
+from shapely.geometry import mapping, shape
+
+from letters.geo import BoundaryIndex
+from letters.services.geocoding import WahlkreisLocator
+
+# Declares WGS84 lon/lat so BoundaryIndex never reprojects the written files
+CRS84 = {'type': 'name', 'properties': {'name': 'urn:ogc:def:crs:OGC:1.3:CRS84'}}
+
+# Overlaps and gaps smaller than this share of the dataset's area are noise from shared edges
+AREA_EPSILON = 1e-9
+
+
+class Command(BaseCommand):
+    help = (
+        'Report vertex counts, invalid geometries, gaps and overlaps between districts, '
+        'parse time and memory footprint for the federal and state boundary files. '
+        'With --write-repaired, write valid WGS84 copies that load without repair.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--geojson',
+            type=str,
+            help='Federal GeoJSON file (default: settings.CONSTITUENCY_BOUNDARIES_PATH); '
+                 'state files are read from the same directory'
+        )
+        parser.add_argument(
+            '--write-repaired',
+            metavar='DIR',
+            type=str,
+            help='Write repaired copies of every file, reprojected to WGS84, into DIR'
+        )
+        parser.add_argument(
+            '--simplify',
+            type=float,
+            default=0.0,
+            help='Simplify written geometries with this tolerance in degrees '
+                 '(topology-preserving per district; small slivers between neighbours can appear)'
+        )
+
+    def handle(self, *args, **options):
+        datasets = {
+            path: source_crs
+            for path, source_crs in WahlkreisLocator.boundary_datasets(options['geojson']).items()
+            if path.exists()
+        }
+        if not datasets:
+            raise CommandError('No boundary GeoJSON files found')
+
+        output_dir = Path(options['write_repaired']) if options['write_repaired'] else None
+        if output_dir is not None:
+            output_dir.mkdir(parents=True, exist_ok=True)
+
+        problems = 0
+        for path, source_crs in datasets.items():
+            problems += self._report(path, source_crs, output_dir, options['simplify'])
+
+        self.stdout.write('')
+        if problems:
+            self.stdout.write(self.style.WARNING(f'{problems} files have invalid geometries, gaps or overlaps'))
+        else:
+            self.stdout.write(self.style.SUCCESS('All boundary files are clean'))
+
+    def _report(self, path, source_crs, output_dir, tolerance):
+        self.stdout.write(self.style.SUCCESS(f'\n=== {path.name} ==='))
+
+        # Raw parse, as BoundaryIndex does it, to see the geometries before any repair
+        start = time.perf_counter()
+        with path.open('r', encoding='utf-8') as geojson_file:
+            data = json.load(geojson_file)
+        features = [feature for feature in data.get('features', []) if feature.get('geometry')]
+        geometries = [shape(feature['geometry']) for feature in features]
+        parse_seconds = time.perf_counter() - start
+
+        vertices = shapely.get_num_coordinates(geometries)
+        invalid = [
+            (position, shapely.is_valid_reason(geometry))
+            for position, geometry in enumerate(geometries)
+            if not geometry.is_valid
+        ]
+
+        # What every process pays at startup without the compiled artifact
+        start = time.perf_counter()
+        index = BoundaryIndex.from_geojson(path, source_crs=source_crs)
+        load_seconds = time.perf_counter() - start
+
+        # Second load for memory only; tracemalloc would skew the timing above
+        tracemalloc.start()
+        BoundaryIndex.from_geojson(path, source_crs=source_crs)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        wgs84 = [feature.geometry for feature in index]
+        geometry_bytes = sum(len(blob) for blob in shapely.to_wkb(wgs84))
+        overlaps, overlap_share = self._overlaps(wgs84)
+        gaps, gap_share = self._gaps(wgs84)
+
+        self.stdout.write(f'Features:        {len(features)}')
+        if len(features):
+            largest = int(vertices.argmax())
+            self.stdout.write(
+                f'Vertices:        {int(vertices.sum())} total, {int(vertices.max())} max '
+                f'({self._label(features[largest])}), {vertices.mean():.0f} mean'
+            )
+        self.stdout.write(f'Invalid:         {len(invalid)}')
+        for position, reason in invalid[:10]:
+            self.stdout.write(self.style.WARNING(f'  {self._label(features[position])}: {reason}'))
+        self.stdout.write(f'Overlaps:        {overlaps} pairs, {overlap_share:.4%} of area')
+        self.stdout.write(f'Gaps:            {gaps} holes, {gap_share:.4%} of area')
+        self.stdout.write(f'Parse time:      {parse_seconds:.2f}s (JSON + shape)')
+        self.stdout.write(f'Load time:       {load_seconds:.2f}s (BoundaryIndex: reproject, repair, tiers, index)')
+        self.stdout.write(
+            f'Memory:          {peak_bytes / 1e6:.1f} MB Python peak while loading, '
+            f'{geometry_bytes / 1e6:.1f} MB of geometry (WKB)'
+        )
+
+        if output_dir is not None:
+            written = self._write(output_dir / path.name, features, wgs84, tolerance)
+            self.stdout.write(
+                f'Wrote:           {output_dir / path.name} '
+                f'({int(shapely.get_num_coordinates(written).sum())} vertices)'
+            )
+
+        return int(bool(invalid or overlaps or gaps))
+
+    @staticmethod
+    def _label(feature):
+        wkr_nr, wkr_name = WahlkreisLocator._normalize_properties(feature.get('properties') or {})
+        return f'{wkr_nr} {wkr_name}'.strip()
+
+    @staticmethod
+    def _overlaps(geometries):
+        """Count neighbouring districts that share area, not just an edge."""
+        if not geometries:
+            return 0, 0.0
+        geometries = np.asarray(geometries, dtype=object)
+        total_area = shapely.union_all(geometries).area
+        left, right = shapely.STRtree(geometries).query(geometries, predicate='intersects')
+        pairs = left < right
+        areas = shapely.area(shapely.intersection(geometries[left[pairs]], geometries[right[pairs]]))
+        significant = [area for area in areas.tolist() if area > AREA_EPSILON * total_area]
+        return len(significant), (sum(significant) / total_area if total_area else 0.0)
+
+    @staticmethod
+    def _gaps(geometries):
+        """Count holes in the union of all districts: land enclosed by districts but covered by none."""
+        if not geometries:
+            return 0, 0.0
+        union = shapely.union_all(geometries)
+        total_area = union.area
+        holes = [
+            shapely.Polygon(ring)
+            for polygon in shapely.get_parts(union)
+            for ring in polygon.interiors
+        ]
+        significant = [hole.area for hole in holes if hole.area > AREA_EPSILON * total_area]
+        return len(significant), (sum(significant) / total_area if total_area else 0.0)
+
+    @staticmethod
+    def _write(output_path, features, geometries, tolerance):
+        if tolerance:
+            geometries = list(shapely.make_valid(shapely.simplify(geometries, tolerance, preserve_topology=True)))
+        output_path.write_text(json.dumps({
+            'type': 'FeatureCollection',
+            'crs': CRS84,
+            'features': [
+                {
+                    'type': 'Feature',
+                    'properties': feature.get('properties') or {},
+                    'geometry': mapping(geometry),
+                }
+                for feature, geometry in zip(features, geometries)
+            ],
+        }, ensure_ascii=False), encoding='utf-8')
+        return geometries
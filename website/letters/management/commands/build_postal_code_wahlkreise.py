@@ -0,0 +1,112 @@
+# ABOUTME: Management command to precompute the PostalCodeWahlkreis lookup table.
+# ABOUTME: Intersects postal code areas and/or sampled postal code points with the Wahlkreis boundaries.
+
+import csv
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from letters.services.geocoding import WahlkreisLocator
+from letters.services.postal_codes import PostalCodeWahlkreisBuilder
+
+
+class Command(BaseCommand):
+    help = (
+        'Build the PostalCodeWahlkreis table so WahlkreisResolver can answer unambiguous '
+        'postal codes without geocoding. Postal codes from --areas take precedence; '
+        '--points fills in postal codes missing from the areas file.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--areas',
+            type=str,
+            help='GeoJSON of postal code polygons (property plz/postcode/postal_code)'
+        )
+        parser.add_argument(
+            '--points',
+            type=str,
+            help='CSV of sampled points with postal_code, latitude, longitude columns'
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=0.01,
+            help='Share of a postal code allowed outside its Wahlkreis before it counts '
+                 'as ambiguous (default: 0.01)'
+        )
+        parser.add_argument(
+            '--min-samples',
+            type=int,
+            default=3,
+            help='Sample points a postal code from --points needs before it can count '
+                 'as unambiguous (default: 3)'
+        )
+        parser.add_argument(
+            '--geojson',
+            type=str,
+            help='Federal GeoJSON file (default: settings.CONSTITUENCY_BOUNDARIES_PATH)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Compute mappings without writing them'
+        )
+
+    def handle(self, *args, **options):
+        if not options['areas'] and not options['points']:
+            raise CommandError('Provide --areas and/or --points')
+
+        try:
+            locator = WahlkreisLocator(options['geojson'])
+        except FileNotFoundError as exc:
+            raise CommandError(str(exc))
+        builder = PostalCodeWahlkreisBuilder(
+            locator,
+            tolerance=options['tolerance'],
+            min_samples=options['min_samples'],
+        )
+
+        start = time.perf_counter()
+        mappings = {}
+
+        if options['points']:
+            points_path = Path(options['points'])
+            if not points_path.exists():
+                raise CommandError(f'Points file not found at {points_path}')
+            with points_path.open(newline='', encoding='utf-8') as csv_file:
+                rows = [
+                    (row['postal_code'].strip().zfill(5), float(row['latitude']), float(row['longitude']))
+                    for row in csv.DictReader(csv_file)
+                    if row.get('postal_code') and row.get('latitude') and row.get('longitude')
+                ]
+            self.stdout.write(f'Locating {len(rows)} sample points...')
+            for mapping in builder.build_from_points(rows):
+                mappings[mapping.postal_code] = mapping
+
+        if options['areas']:
+            areas_path = Path(options['areas'])
+            if not areas_path.exists():
+                raise CommandError(f'Areas file not found at {areas_path}')
+            areas = builder.load_areas(areas_path)
+            self.stdout.write(f'Intersecting {len(areas)} postal code areas...')
+            for mapping in builder.build_from_areas(areas):
+                mappings[mapping.postal_code] = mapping
+
+        mappings = sorted(mappings.values(), key=lambda mapping: mapping.postal_code)
+        ambiguous = sum(1 for mapping in mappings if mapping.is_ambiguous)
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(self.style.SUCCESS('\n=== Postal Code Wahlkreise ==='))
+        self.stdout.write(f'Postal codes: {len(mappings)}')
+        self.stdout.write(f'Unambiguous:  {len(mappings) - ambiguous}')
+        self.stdout.write(f'Ambiguous:    {ambiguous}')
+        self.stdout.write(f'Time:         {elapsed:.1f}s')
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('Dry run: table not updated'))
+            return
+
+        builder.replace_table(mappings)
+        self.stdout.write(self.style.SUCCESS(f'✓ Stored {len(mappings)} postal code mappings'))
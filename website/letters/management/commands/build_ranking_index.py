@@ -0,0 +1,38 @@
+# ABOUTME: Management command to rebuild the BM25 ranking index over topics and committees.
+# ABOUTME: Writes the artifact workers load and reports its size and load time.
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from letters.services.ranking import RankingIndex
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the BM25 ranking index over TopicArea and Committee texts and write it to '
+        'settings.RANKING_INDEX_PATH. load_topic_taxonomy and sync_representatives do this '
+        'automatically; run it after bulk edits that bypass model signals.'
+    )
+
+    def handle(self, *args, **options):
+        path = RankingIndex.artifact_path()
+        if path is None:
+            raise CommandError('RANKING_INDEX_PATH is not set')
+
+        start = time.perf_counter()
+        indexes = RankingIndex.rebuild()
+        elapsed = time.perf_counter() - start
+
+        for kind, index in indexes.items():
+            self.stdout.write(f'  {kind}: {len(index)} documents, {len(index.postings)} terms')
+        self.stdout.write(f'Built in {elapsed * 1000:.0f} ms')
+
+        if not path.exists():
+            raise CommandError(f'Could not write {path}')
+        start = time.perf_counter()
+        RankingIndex.read_artifact(path)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(f'Artifact: {path.stat().st_size / 1e3:.0f} kB, loads in {elapsed * 1000:.1f} ms')
+
+        self.stdout.write(self.style.SUCCESS(f'✓ Wrote {path}'))
@@ -0,0 +1,69 @@
+# ABOUTME: Management command to compile all Wahlkreis GeoJSON files into one binary artifact.
+# ABOUTME: Workers memory-map the artifact at startup instead of parsing GeoJSON.
+
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from letters.geo import DEFAULT_SIMPLIFY_TOLERANCE, BoundaryArtifact, BoundaryRepository
+from letters.services.geocoding import WahlkreisLocator
+
+
+class Command(BaseCommand):
+    help = (
+        'Compile the federal and state Wahlkreis GeoJSON files into a WKB artifact '
+        '(reprojected to WGS84, invalid geometries repaired). BoundaryRepository '
+        'loads it when present. Re-run after updating any boundary file.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--geojson',
+            type=str,
+            help='Federal GeoJSON file (default: settings.CONSTITUENCY_BOUNDARIES_PATH); '
+                 'state files are read from the same directory'
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            help='Artifact path (default: settings.CONSTITUENCY_BOUNDARIES_ARTIFACT_PATH)'
+        )
+
+    def handle(self, *args, **options):
+        output_path = options['output'] or settings.CONSTITUENCY_BOUNDARIES_ARTIFACT_PATH
+        if not output_path:
+            raise CommandError('No output path given and CONSTITUENCY_BOUNDARIES_ARTIFACT_PATH is not set')
+        output_path = Path(output_path)
+
+        datasets = {
+            path: source_crs
+            for path, source_crs in WahlkreisLocator.boundary_datasets(options['geojson']).items()
+            if path.exists()
+        }
+        if not datasets:
+            raise CommandError('No boundary GeoJSON files found')
+
+        self.stdout.write(f'Compiling {len(datasets)} boundary files...')
+        start = time.perf_counter()
+        counts = BoundaryArtifact.compile(
+            datasets,
+            output_path,
+            simplify_tolerance=getattr(settings, 'BOUNDARY_SIMPLIFY_TOLERANCE', DEFAULT_SIMPLIFY_TOLERANCE),
+        )
+        elapsed = time.perf_counter() - start
+
+        for name, count in counts.items():
+            self.stdout.write(f'  {name}: {count} features')
+
+        source_size = sum(path.stat().st_size for path in datasets)
+        self.stdout.write(
+            f'GeoJSON: {source_size / 1e6:.1f} MB -> artifact: {output_path.stat().st_size / 1e6:.1f} MB '
+            f'({elapsed:.1f}s)'
+        )
+
+        # Make this process pick up the new artifact as well
+        BoundaryRepository.clear()
+
+        self.stdout.write(self.style.SUCCESS(f'✓ Wrote {output_path}'))
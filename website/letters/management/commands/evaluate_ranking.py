@@ -0,0 +1,102 @@
+# ABOUTME: Management command scoring the BM25 topic/committee ranking against a labelled query set.
+# ABOUTME: Reports precision at k and mean reciprocal rank, and lists the queries that missed.
+
+import csv
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from letters.models import Committee, TopicArea
+from letters.services.ranking import RankingIndex
+from letters.services.text_analysis import get_analyzer
+
+
+class Command(BaseCommand):
+    help = (
+        'Evaluate the ranking behind topic suggestions against a labelled query set and report '
+        'P@k (share of the top k results that are relevant) and MRR (mean of 1 / rank of the '
+        'first relevant result)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'queries',
+            type=str,
+            help='CSV with a query column and an expected column listing the relevant topic (or '
+                 'committee) names or slugs, separated by "|"'
+        )
+        parser.add_argument(
+            '--k',
+            type=int,
+            default=3,
+            help='Cut-off rank for precision (default: 3, the number of topics suggested)'
+        )
+        parser.add_argument(
+            '--kind',
+            choices=['topic', 'committee'],
+            default='topic',
+            help='Rank topics or committees (default: topic)'
+        )
+
+    def handle(self, *args, **options):
+        k = options['k']
+        if k < 1:
+            raise CommandError('--k must be at least 1')
+        rows = self._read_queries(options['queries'])
+        if not rows:
+            raise CommandError('No labelled queries in the file')
+
+        if options['kind'] == 'topic':
+            documents = TopicArea.objects.all()
+            labels = {doc.id: {doc.name.lower(), doc.slug.lower()} for doc in documents}
+        else:
+            documents = Committee.objects.all()
+            labels = {doc.id: {doc.name.lower()} for doc in documents}
+        names = {doc.id: doc.name for doc in documents}
+
+        start = time.perf_counter()
+        RankingIndex.clear()
+        RankingIndex.score(options['kind'], [])
+        self.stdout.write(f'Index ready in {(time.perf_counter() - start) * 1000:.1f} ms')
+
+        analyzer = get_analyzer()
+        precision_sum = 0.0
+        reciprocal_rank_sum = 0.0
+        misses = []
+        for query, expected in rows:
+            scores = RankingIndex.score(options['kind'], analyzer.tokenize(query))
+            ranked = sorted(scores, key=lambda doc_id: (-scores[doc_id], names.get(doc_id, '')))
+            relevant = [doc_id for doc_id in ranked if labels.get(doc_id, set()) & expected]
+
+            precision_sum += sum(1 for doc_id in ranked[:k] if doc_id in relevant) / k
+            if relevant:
+                reciprocal_rank_sum += 1 / (ranked.index(relevant[0]) + 1)
+            if not relevant or ranked.index(relevant[0]) >= k:
+                misses.append((query, [names.get(doc_id, doc_id) for doc_id in ranked[:k]]))
+
+        total = len(rows)
+        self.stdout.write(self.style.SUCCESS(f'\n=== Ranking quality ({options["kind"]}, {total} queries) ==='))
+        self.stdout.write(f'P@{k}:  {precision_sum / total:.3f}')
+        self.stdout.write(f'MRR:  {reciprocal_rank_sum / total:.3f}')
+        self.stdout.write(f'Relevant result in top {k}: {total - len(misses)} / {total}')
+
+        if misses:
+            self.stdout.write(f'\nQueries without a relevant result in the top {k}:')
+            for query, top in misses:
+                self.stdout.write(f'  "{query}" → {", ".join(str(name) for name in top) or "(nothing)"}')
+
+    @staticmethod
+    def _read_queries(path):
+        queries_path = Path(path)
+        if not queries_path.exists():
+            raise CommandError(f'Query file not found at {queries_path}')
+
+        rows = []
+        with queries_path.open(newline='', encoding='utf-8') as csv_file:
+            for row in csv.DictReader(csv_file):
+                query = (row.get('query') or '').strip()
+                expected = {label.strip().lower() for label in (row.get('expected') or '').split('|') if label.strip()}
+                if query and expected:
+                    rows.append((query, expected))
+        return rows
@@ -0,0 +1,65 @@
+# ABOUTME: Long-running worker that drains the GeocodeJob queue at the geocoder backend's rate limit.
+# ABOUTME: Run one instance per deployment alongside the web process.
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from letters.services.geocoding_backends import GEOCODER_BACKENDS, get_geocoder_backend
+from letters.services.geocoding_queue import GeocodeQueue
+
+
+class Command(BaseCommand):
+    help = (
+        'Process queued geocoding jobs. Identical pending addresses are geocoded '
+        "once; requests are spaced by the geocoder backend's rate limit."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Drain the current queue and exit instead of polling forever'
+        )
+        parser.add_argument(
+            '--max-jobs',
+            type=int,
+            help='Exit after processing this many jobs'
+        )
+        parser.add_argument(
+            '--backend',
+            choices=sorted(GEOCODER_BACKENDS),
+            help='Geocoder backend to use (default: settings.GEOCODER_BACKEND)'
+        )
+        parser.add_argument(
+            '--idle-sleep',
+            type=float,
+            default=1.0,
+            help='Seconds to wait before polling an empty queue again (default: 1.0)'
+        )
+
+    def handle(self, *args, **options):
+        max_jobs = options['max_jobs']
+        geocoder = GeocodeQueue.worker_geocoder(get_geocoder_backend(options['backend']))
+        processed = 0
+
+        try:
+            while max_jobs is None or processed < max_jobs:
+                job = GeocodeQueue.process_next(geocoder)
+                if job is None:
+                    if options['once']:
+                        break
+                    time.sleep(options['idle_sleep'])
+                    continue
+
+                processed += 1
+                if job.status == 'DONE':
+                    self.stdout.write(f'✓ {job.address} -> {job.latitude:.5f}, {job.longitude:.5f}')
+                elif job.status == 'FAILED':
+                    self.stdout.write(self.style.WARNING(f'✗ {job.address}: {job.error_message}'))
+                else:
+                    self.stdout.write(self.style.WARNING(f'↻ {job.address}: retrying ({job.attempts} attempts)'))
+        except KeyboardInterrupt:
+            self.stdout.write('Interrupted')
+
+        self.stdout.write(self.style.SUCCESS(f'Processed {processed} geocode jobs'))
@@ -7,6 +7,9 @@ from django.core.management.base import BaseCommand
 from django.utils.text import slugify
 
 from letters.models import TopicArea
+from letters.services.ranking import RankingIndex
+from letters.services.suggestion_cache import SuggestionCache
+from letters.services.versioning import bump_data_version
 
 
 class Command(BaseCommand):
@@ -737,6 +740,11 @@ class Command(BaseCommand):
                 )
             )
 
+        # Write the ranking index artifact and reload it in every worker sharing the default cache;
+        # memoized title suggestions may name old topics
+        RankingIndex.rebuild()
+        bump_data_version(SuggestionCache.VERSION_KEY)
+
         self.stdout.write(
             self.style.SUCCESS(f"\nErfolgreich {created_count} Themenbereiche geladen")
         )
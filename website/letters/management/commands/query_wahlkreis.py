@@ -1,27 +1,49 @@
-# ABOUTME: Query management command to find constituency by address.
+# ABOUTME: Query management command to find constituency by address or postal code.
 # ABOUTME: Interactive tool for testing address-based constituency matching.
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from letters.services.wahlkreis import WahlkreisResolver
 
 
 class Command(BaseCommand):
-    help = 'Find constituency (Wahlkreis) by address'
+    help = 'Find constituency (Wahlkreis) by address or postal code'
 
     def add_arguments(self, parser):
         parser.add_argument(
             'address',
             type=str,
+            nargs='?',
             help='Full address string (e.g., "Unter den Linden 1, 10117 Berlin")'
         )
+        parser.add_argument(
+            '--postal-code',
+            type=str,
+            help='Resolve a postal code alone via the PostalCodeWahlkreis table '
+                 '(geocodes only ambiguous or unknown postal codes)'
+        )
 
     def handle(self, *args, **options):
         address = options['address']
+        postal_code = options['postal_code']
+        if not address and not postal_code:
+            raise CommandError('Provide an address or --postal-code')
 
         try:
             # Use WahlkreisResolver to get full resolution
             resolver = WahlkreisResolver()
-            result = resolver.resolve(address=address)
+            if postal_code and not address:
+                result = resolver.resolve_postal_code(postal_code)
+                if result['postal_code_ambiguous']:
+                    self.stdout.write(self.style.WARNING(
+                        f'Postal code {postal_code} spans several Wahlkreise; '
+                        'result is for its geocoded centre'
+                    ))
+                elif result['postal_code_ambiguous'] is None:
+                    self.stdout.write(self.style.WARNING(
+                        f'Postal code {postal_code} not in lookup table; geocoding it'
+                    ))
+            else:
+                result = resolver.resolve(address=address)
 
             if not result['federal_wahlkreis_number']:
                 self.stdout.write(self.style.ERROR('Error: Could not resolve address to Wahlkreis'))
@@ -47,8 +69,8 @@ class Command(BaseCommand):
                     self.stdout.write(f"  Name:       {c.name}")
                     self.stdout.write(f"  Parliament: {c.parliament_term.parliament.name}")
                     self.stdout.write(f"  Term:       {c.parliament_term.name}")
-                    if c.wahlkreis_id:
-                        self.stdout.write(f"  WK ID:      {c.wahlkreis_id}")
+                    if c.list_id:
+                        self.stdout.write(f"  WK ID:      {c.list_id}")
 
                     # Show number of active representatives
                     rep_count = c.representatives.filter(is_active=True).count()
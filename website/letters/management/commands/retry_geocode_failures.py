@@ -0,0 +1,77 @@
+# ABOUTME: Management command that re-geocodes failed GeocodeCache entries whose retry time has passed.
+# ABOUTME: Enqueues them for geocode_worker, or processes them inline with --inline.
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from letters.models import GeocodeCache
+from letters.services.geocoding_backends import format_address
+from letters.services.geocoding_queue import GeocodeQueue
+
+
+class Command(BaseCommand):
+    help = (
+        'Re-geocode failed lookups whose retry_after has expired. By default the '
+        'addresses are added to the geocoding queue for geocode_worker; use '
+        '--inline to process them in this process instead.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--kind',
+            choices=[kind for kind, _ in GeocodeCache.FAILURE_KIND_CHOICES],
+            help='Only retry failures of this kind (default: all)'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help='Maximum number of failures to retry'
+        )
+        parser.add_argument(
+            '--inline',
+            action='store_true',
+            help='Geocode the addresses now instead of leaving them to geocode_worker'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many failures are due for a retry'
+        )
+
+    def handle(self, *args, **options):
+        failures = GeocodeCache.objects.filter(
+            success=False,
+            retry_after__lte=timezone.now(),
+        ).order_by('retry_after')
+        if options['kind']:
+            failures = failures.filter(failure_kind=options['kind'])
+        if options['limit']:
+            failures = failures[:options['limit']]
+
+        failures = list(failures)
+        self.stdout.write(f'{len(failures)} failed lookups due for a retry')
+        if options['dry_run'] or not failures:
+            return
+
+        enqueued = 0
+        for entry in failures:
+            # Free-form lookups keep the whole address in `city`, structured ones
+            # store the parts; both are keyed by the joined form
+            address = format_address(entry.street, entry.postal_code, entry.city)
+            job = GeocodeQueue.enqueue(address, entry.country)
+            if not job.is_finished:
+                enqueued += 1
+
+        self.stdout.write(f'Enqueued {enqueued} geocode jobs')
+
+        if options['inline']:
+            processed = GeocodeQueue.drain()
+            recovered = GeocodeCache.objects.filter(
+                pk__in=[entry.pk for entry in failures],
+                success=True,
+            ).count()
+            self.stdout.write(self.style.SUCCESS(
+                f'Processed {processed} jobs, {recovered} addresses now resolve'
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS('Run geocode_worker to process the queue'))
@@ -11,6 +11,8 @@ from django.utils import timezone
 
 from letters.models import Parliament, ParliamentTerm, Constituency
 from letters.services.abgeordnetenwatch_api_client import AbgeordnetenwatchAPI
+from letters.services.constituency_directory import ConstituencyDirectory
+from letters.services.versioning import bump_data_version
 
 
 class Command(BaseCommand):
@@ -33,6 +35,7 @@ class Command(BaseCommand):
         # Step 1: Sync from API
         self.stdout.write(self.style.SUCCESS("Step 1: Syncing constituencies from Abgeordnetenwatch API..."))
         self._handle_api_sync()
+        bump_data_version(ConstituencyDirectory.VERSION_KEY)
 
         # Step 2: Validate GeoJSON matches
         self.stdout.write(self.style.SUCCESS("\nStep 2: Validating GeoJSON matches..."))
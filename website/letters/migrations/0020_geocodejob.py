@@ -0,0 +1,39 @@
+# Generated by Django 5.2.6 on 2026-10-16 20:14
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('letters', '0019_rename_wahlkreis_id_to_list_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeocodeJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.UUIDField(default=uuid.uuid4, editable=False, help_text='Opaque handle callers use to poll the job', unique=True)),
+                ('address_hash', models.CharField(db_index=True, help_text='Same key as GeocodeCache.address_hash; identical pending addresses share one job', max_length=64)),
+                ('address', models.CharField(max_length=255)),
+                ('country', models.CharField(default='DE', max_length=2)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('DONE', 'Done'), ('FAILED', 'Failed')], default='PENDING', max_length=10)),
+                ('latitude', models.FloatField(blank=True, null=True)),
+                ('longitude', models.FloatField(blank=True, null=True)),
+                ('error_message', models.TextField(blank=True)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Geocode Job',
+                'verbose_name_plural': 'Geocode Jobs',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='letters_geo_status_dcc322_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 5.2.6 on 2026-10-16 21:02
+
+import hashlib
+import re
+import unicodedata
+from collections import defaultdict
+
+from django.db import migrations
+
+# Frozen copy of letters.constants.normalize_address as of this migration, so
+# later changes to the live normalizer don't change what this migration writes
+UMLAUT_FOLDING = str.maketrans({'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'ß': 'ss'})
+STREET_SUFFIX_RE = re.compile(r'str(?:asse|\.)(?=\W|$)')
+NON_ALPHANUMERIC_RE = re.compile(r'[^0-9a-z]+')
+
+
+def _normalize_address(address):
+    if not address:
+        return ''
+    value = unicodedata.normalize('NFKC', address).lower().translate(UMLAUT_FOLDING)
+    value = STREET_SUFFIX_RE.sub('str', value)
+    value = unicodedata.normalize('NFKD', value)
+    value = ''.join(char for char in value if not unicodedata.combining(char))
+    return NON_ALPHANUMERIC_RE.sub(' ', value).strip()
+
+
+def _cache_key(address, country):
+    normalized = f"{_normalize_address(address)}|{(country or 'DE').upper()}"
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def _cached_address(entry):
+    """AddressGeocoder stores the full address in `city`; older rows may be split."""
+    if entry.street or entry.postal_code:
+        return f"{entry.street}, {entry.postal_code} {entry.city}"
+    return entry.city
+
+
+def rehash_geocode_cache(apps, schema_editor):
+    """Recompute address hashes with the normalized address and merge rows that now collide."""
+    GeocodeCache = apps.get_model('letters', 'GeocodeCache')
+    GeocodeJob = apps.get_model('letters', 'GeocodeJob')
+
+    groups = defaultdict(list)
+    for entry in GeocodeCache.objects.all().iterator():
+        groups[_cache_key(_cached_address(entry), entry.country)].append(entry)
+
+    survivors = {}
+    duplicate_ids = []
+    for address_hash, entries in groups.items():
+        # Keep successful lookups over failures, then the most recent one
+        entries.sort(key=lambda entry: (entry.success, entry.updated_at), reverse=True)
+        keeper, *duplicates = entries
+        duplicate_ids.extend(entry.pk for entry in duplicates)
+        survivors[address_hash] = keeper
+
+    GeocodeCache.objects.filter(pk__in=duplicate_ids).delete()
+
+    # Two passes so a new hash never collides with a not-yet-updated old one
+    for entry in survivors.values():
+        entry.address_hash = f'rehash-{entry.pk}'
+    GeocodeCache.objects.bulk_update(survivors.values(), ['address_hash'], batch_size=500)
+    for address_hash, entry in survivors.items():
+        entry.address_hash = address_hash
+    GeocodeCache.objects.bulk_update(survivors.values(), ['address_hash'], batch_size=500)
+
+    jobs = list(GeocodeJob.objects.all())
+    for job in jobs:
+        job.address_hash = _cache_key(job.address, job.country)
+    GeocodeJob.objects.bulk_update(jobs, ['address_hash'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('letters', '0020_geocodejob'),
+    ]
+
+    operations = [
+        migrations.RunPython(rehash_geocode_cache, migrations.RunPython.noop),
+    ]
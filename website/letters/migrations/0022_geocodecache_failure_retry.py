@@ -0,0 +1,54 @@
+# Generated by Django 5.2.6 on 2026-10-16 20:23
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models import F
+from django.utils import timezone
+
+
+def classify_existing_failures(apps, schema_editor):
+    """Classify stored failures: API errors become retryable now, misses after 30 days."""
+    GeocodeCache = apps.get_model('letters', 'GeocodeCache')
+    failures = GeocodeCache.objects.filter(success=False)
+    failures.filter(error_message='Address not found').update(
+        failure_kind='NOT_FOUND',
+        failure_count=1,
+        retry_after=F('updated_at') + timedelta(days=30),
+    )
+    failures.exclude(error_message='Address not found').update(
+        failure_kind='TRANSIENT',
+        failure_count=1,
+        retry_after=timezone.now(),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('letters', '0021_rehash_geocode_cache_keys'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='geocodecache',
+            name='failure_count',
+            field=models.PositiveIntegerField(default=0, help_text='Consecutive failed lookups, drives the retry backoff'),
+        ),
+        migrations.AddField(
+            model_name='geocodecache',
+            name='failure_kind',
+            field=models.CharField(blank=True, choices=[('NOT_FOUND', 'Address not found'), ('TRANSIENT', 'Transient error (timeout, 5xx, rate limit)')], help_text='Why the lookup failed; empty for successful lookups', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='geocodecache',
+            name='retry_after',
+            field=models.DateTimeField(blank=True, db_index=True, help_text='Failed lookups are treated as cache misses after this time', null=True),
+        ),
+        migrations.AddField(
+            model_name='geocodejob',
+            name='next_attempt_at',
+            field=models.DateTimeField(blank=True, help_text='Pending jobs requeued after a transient failure are not claimed before this time', null=True),
+        ),
+        migrations.RunPython(classify_existing_failures, migrations.RunPython.noop),
+    ]
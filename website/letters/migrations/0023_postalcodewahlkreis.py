@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-16 20:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('letters', '0022_geocodecache_failure_retry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostalCodeWahlkreis',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('postal_code', models.CharField(max_length=5, unique=True)),
+                ('federal_wkr_nr', models.IntegerField()),
+                ('federal_wkr_name', models.CharField(blank=True, max_length=255)),
+                ('land_name', models.CharField(blank=True, max_length=100)),
+                ('land_code', models.CharField(blank=True, max_length=2)),
+                ('federal_ambiguous', models.BooleanField(default=False, help_text='The postal code spans more than one federal Wahlkreis')),
+                ('state_wkr_nr', models.IntegerField(blank=True, null=True)),
+                ('state_wkr_name', models.CharField(blank=True, max_length=255)),
+                ('state_ambiguous', models.BooleanField(default=False, help_text='The postal code spans more than one state Wahlkreis')),
+                ('coverage', models.FloatField(default=1.0, help_text='Share of the postal code area (or sample points) inside the chosen federal Wahlkreis')),
+                ('source', models.CharField(choices=[('AREAS', 'Areas'), ('POINTS', 'Points')], max_length=10)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Postal Code Wahlkreis',
+                'verbose_name_plural': 'Postal Code Wahlkreise',
+                'ordering': ['postal_code'],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-16 21:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('letters', '0023_postalcodewahlkreis'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RepresentativeExpertise',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('terms', models.JSONField(blank=True, default=dict, help_text='Analyzed term → weight from committee, topic area and focus topic texts')),
+                ('topic_links', models.JSONField(blank=True, default=dict, help_text='TopicArea id → [committee role score, membership id]; the membership id is null for topic areas assigned without a committee')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('representative', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='expertise', to='letters.representative')),
+            ],
+            options={
+                'verbose_name': 'Representative Expertise',
+                'verbose_name_plural': 'Representative Expertise',
+            },
+        ),
+    ]
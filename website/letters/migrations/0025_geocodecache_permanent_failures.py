@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-16 22:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('letters', '0024_representativeexpertise'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='geocodecache',
+            name='failure_kind',
+            field=models.CharField(blank=True, choices=[('NOT_FOUND', 'Address not found'), ('TRANSIENT', 'Transient error (timeout, 5xx, rate limit)'), ('PERMANENT', 'Other error (4xx, malformed response)')], help_text='Why the lookup failed; empty for successful lookups', max_length=10),
+        ),
+    ]
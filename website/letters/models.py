@@ -1,3 +1,4 @@
+import uuid
 from typing import Dict, List, Optional, Set
 
 from django.db import models
@@ -441,6 +442,35 @@ class CommitteeMembership(models.Model):
         return self.end_date is None
 
 
+class RepresentativeExpertise(models.Model):
+    """Precomputed expertise profile of a representative, refreshed at the end of every representative sync."""
+
+    representative = models.OneToOneField(
+        Representative,
+        on_delete=models.CASCADE,
+        related_name='expertise'
+    )
+    terms = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Analyzed term → weight from committee, topic area and focus topic texts"
+    )
+    topic_links = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="TopicArea id → [committee role score, membership id]; the membership id is null "
+                  "for topic areas assigned without a committee"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Representative Expertise"
+        verbose_name_plural = "Representative Expertise"
+
+    def __str__(self):
+        return f"Expertise of {self.representative.full_name}"
+
+
 class Letter(models.Model):
     """Open letters written by users to representatives."""
 
@@ -816,6 +846,29 @@ class GeocodeCache(models.Model):
     )
     error_message = models.TextField(blank=True)
 
+    FAILURE_KIND_CHOICES = [
+        ('NOT_FOUND', 'Address not found'),
+        ('TRANSIENT', 'Transient error (timeout, 5xx, rate limit)'),
+        ('PERMANENT', 'Other error (4xx, malformed response)'),
+    ]
+
+    failure_kind = models.CharField(
+        max_length=10,
+        choices=FAILURE_KIND_CHOICES,
+        blank=True,
+        help_text="Why the lookup failed; empty for successful lookups"
+    )
+    failure_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Consecutive failed lookups, drives the retry backoff"
+    )
+    retry_after = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text="Failed lookups are treated as cache misses after this time"
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -828,3 +881,128 @@ class GeocodeCache(models.Model):
         if self.latitude and self.longitude:
             return f"{self.city} ({self.latitude}, {self.longitude})"
         return f"{self.city} (failed)"
+
+    @property
+    def is_retryable(self) -> bool:
+        """True for failed lookups whose negative-cache entry has expired."""
+        return (
+            not self.success
+            and self.retry_after is not None
+            and self.retry_after <= timezone.now()
+        )
+
+
+class GeocodeJob(models.Model):
+    """Queued address geocoding request, drained by the geocode_worker command."""
+
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    ]
+
+    token = models.UUIDField(
+        default=uuid.uuid4,
+        unique=True,
+        editable=False,
+        help_text="Opaque handle callers use to poll the job"
+    )
+    address_hash = models.CharField(
+        max_length=64,
+        db_index=True,
+        help_text="Same key as GeocodeCache.address_hash; identical pending addresses share one job"
+    )
+    address = models.CharField(max_length=255)
+    country = models.CharField(max_length=2, default='DE')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    error_message = models.TextField(blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Pending jobs requeued after a transient failure are not claimed before this time"
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Geocode Job"
+        verbose_name_plural = "Geocode Jobs"
+        ordering = ['created_at']
+        indexes = [models.Index(fields=['status', 'created_at'])]
+
+    def __str__(self):
+        return f"{self.address} ({self.status})"
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in {'DONE', 'FAILED'}
+
+
+class PostalCodeWahlkreis(models.Model):
+    """Precomputed postal code → Wahlkreis mapping, built by build_postal_code_wahlkreise."""
+
+    postal_code = models.CharField(max_length=5, unique=True)
+
+    federal_wkr_nr = models.IntegerField()
+    federal_wkr_name = models.CharField(max_length=255, blank=True)
+    land_name = models.CharField(max_length=100, blank=True)
+    land_code = models.CharField(max_length=2, blank=True)
+    federal_ambiguous = models.BooleanField(
+        default=False,
+        help_text="The postal code spans more than one federal Wahlkreis"
+    )
+
+    state_wkr_nr = models.IntegerField(null=True, blank=True)
+    state_wkr_name = models.CharField(max_length=255, blank=True)
+    state_ambiguous = models.BooleanField(
+        default=False,
+        help_text="The postal code spans more than one state Wahlkreis"
+    )
+
+    coverage = models.FloatField(
+        default=1.0,
+        help_text="Share of the postal code area (or sample points) inside the chosen federal Wahlkreis"
+    )
+    source = models.CharField(max_length=10, choices=[('AREAS', 'Areas'), ('POINTS', 'Points')])
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Postal Code Wahlkreis"
+        verbose_name_plural = "Postal Code Wahlkreise"
+        ordering = ['postal_code']
+
+    def __str__(self):
+        flag = ' (ambiguous)' if self.is_ambiguous else ''
+        return f"{self.postal_code} → WK {self.federal_wkr_nr}{flag}"
+
+    @property
+    def is_ambiguous(self) -> bool:
+        return self.federal_ambiguous or self.state_ambiguous
+
+    def as_locate_result(self) -> Dict[str, Optional[Dict]]:
+        """Return the mapping in WahlkreisLocator.locate() format."""
+        state = None
+        if self.state_wkr_nr is not None:
+            state = {
+                'wkr_nr': self.state_wkr_nr,
+                'wkr_name': self.state_wkr_name,
+                'land_name': self.land_name,
+                'land_code': self.land_code,
+            }
+        return {
+            'federal': {
+                'wkr_nr': self.federal_wkr_nr,
+                'wkr_name': self.federal_wkr_name,
+                'land_name': self.land_name,
+                'land_code': self.land_code,
+            },
+            'state': state,
+        }
@@ -3,6 +3,7 @@
 
 from .abgeordnetenwatch_api_client import AbgeordnetenwatchAPI
 from .geocoding import AddressGeocoder, WahlkreisLocator
+from .geocoding_queue import GeocodeQueue
 from .constituency import (
     LocationContext,
     ConstituencySuggestionService,
@@ -16,6 +17,7 @@ __all__ = [
     'AbgeordnetenwatchAPI',
     'AddressGeocoder',
     'WahlkreisLocator',
+    'GeocodeQueue',
     'LocationContext',
     'ConstituencySuggestionService',
     'RepresentativeSyncService',
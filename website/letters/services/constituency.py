@@ -2,7 +2,6 @@
 # ABOUTME: Combines geocoding, Wahlkreis mapping, and PLZ fallback for robust constituency resolution.
 
 import logging
-import re
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Set, Tuple
 
@@ -10,8 +9,12 @@ from django.db.models import Q
 from django.utils.translation import gettext as _
 
 from ..constants import normalize_german_state
-from ..models import Constituency, Parliament, ParliamentTerm, Representative, Tag, TopicArea
+from ..models import CommitteeMembership, Constituency, Parliament, ParliamentTerm, Representative, Tag, TopicArea
+from .expertise import ExpertiseIndex
 from .geocoding import AddressGeocoder, WahlkreisLocator
+from .ranking import RankingIndex
+from .tag_index import TagIndex
+from .text_analysis import get_analyzer
 from .wahlkreis import WahlkreisResolver
 
 logger = logging.getLogger('letters.services')
@@ -62,21 +65,11 @@ class LocationContext:
 class ConstituencySuggestionService:
     """Provide lightweight representative/tag suggestions based on title and location."""
 
-    KEYWORD_PATTERN = re.compile(r"[\wÄÖÜäöüß-]+", re.UNICODE)
     MIN_TOKEN_LENGTH = 3
     MAX_TOPICS = 3
     MAX_REPRESENTATIVES = 5
     MAX_TAGS = 5
 
-    STOPWORDS = {
-        'und', 'der', 'die', 'das', 'den', 'dem', 'des', 'ein', 'eine', 'einer', 'einem',
-        'für', 'mit', 'von', 'auf', 'bei', 'aus', 'zur', 'zum', 'vom', 'beim', 'ans',
-        'ist', 'sind', 'war', 'waren', 'wird', 'werden', 'hat', 'haben', 'kann', 'können',
-        'soll', 'sollen', 'muss', 'müssen', 'darf', 'dürfen', 'will', 'wollen',
-        'ich', 'du', 'er', 'sie', 'es', 'wir', 'ihr', 'man', 'wie', 'was', 'wer', 'aber',
-        'auch', 'nur', 'noch', 'mehr', 'sehr', 'als', 'bis', 'oder', 'doch', 'denn',
-    }
-
     @classmethod
     def suggest_from_concern(
         cls,
@@ -126,14 +119,7 @@ class ConstituencySuggestionService:
     # ------------------------------------------------------------------
     @classmethod
     def _extract_tokens(cls, text: str) -> List[str]:
-        if not text:
-            return []
-        tokens = []
-        for raw_token in cls.KEYWORD_PATTERN.findall(text.lower()):
-            token = raw_token.strip('-_')
-            if len(token) >= cls.MIN_TOKEN_LENGTH and token not in cls.STOPWORDS:
-                tokens.append(token)
-        return tokens
+        return get_analyzer().tokenize(text)
 
     @classmethod
     def _resolve_location(cls, user_location: Dict[str, str]) -> LocationContext:
@@ -167,10 +153,17 @@ class ConstituencySuggestionService:
         if not constituencies and street and postal_code and city:
             from .wahlkreis import WahlkreisResolver
             resolver = WahlkreisResolver()
+            result = resolver.resolve_structured(street, postal_code, city, country=country)
+            constituencies = result['constituencies']
 
-            # Build full address string
-            address = f"{street}, {postal_code} {city}"
-            result = resolver.resolve(address=address, country=country)
+        # Postal code alone: only the precomputed table, never a geocoding call
+        elif not constituencies and postal_code and country == 'DE':
+            from .wahlkreis import WahlkreisResolver
+            result = WahlkreisResolver().resolve_postal_code(
+                postal_code,
+                country=country,
+                geocode_ambiguous=False
+            )
             constituencies = result['constituencies']
 
         # Determine state from various sources
@@ -199,36 +192,7 @@ class ConstituencySuggestionService:
     def _match_topics(cls, tokens: List[str]) -> List[TopicArea]:
         if not tokens:
             return []
-
-        topic_query = Q()
-        for token in tokens:
-            topic_query |= Q(name__icontains=token) | Q(keywords__icontains=token)
-
-        if not topic_query:
-            return []
-
-        topics = list(TopicArea.objects.filter(topic_query).distinct())
-        if not topics:
-            return []
-
-        scores: List[Tuple[int, TopicArea]] = []
-        for topic in topics:
-            haystack = ' '.join(
-                filter(None, [topic.name, topic.description, topic.keywords])
-            ).lower()
-            # Use word boundary matching to avoid substring false positives
-            score = 0
-            for token in tokens:
-                # Match token as whole word (surrounded by word boundaries)
-                pattern = r'\b' + re.escape(token) + r'\b'
-                matches = re.findall(pattern, haystack)
-                score += len(matches)
-            scores.append((score, topic))
-
-        ranked = [topic for score, topic in sorted(scores, key=lambda item: (-item[0], item[1].name)) if score > 0]
-        if not ranked:
-            ranked = sorted(topics, key=lambda item: item.name)
-        return ranked[: cls.MAX_TOPICS]
+        return RankingIndex.search_topics(tokens, limit=cls.MAX_TOPICS)
 
     @classmethod
     def _determine_relevant_parliament_ids(
@@ -301,13 +265,22 @@ class ConstituencySuggestionService:
 
     @classmethod
     def _topic_terms(cls, topics: List[TopicArea]) -> Set[str]:
+        """Analyzed terms of the topics' names and keywords (stems, see GermanAnalyzer)."""
+        analyzer = get_analyzer()
         terms: Set[str] = set()
         for topic in topics:
-            terms.update(cls._extract_tokens(topic.name))
+            terms.update(analyzer.terms(topic.name))
             if topic.keywords:
-                terms.update(cls._extract_tokens(topic.keywords))
+                terms.update(analyzer.terms(topic.keywords))
         return terms
 
+    @classmethod
+    def _search_terms(cls, tokens: List[str], matched_topics: List[TopicArea]) -> Set[str]:
+        """Stems and synonyms of the query plus the matched topics' terms, for matching normalized text."""
+        search_terms = get_analyzer().search_terms(tokens)
+        search_terms.update(cls._topic_terms(matched_topics))
+        return {term for term in search_terms if len(term) >= cls.MIN_TOKEN_LENGTH}
+
     @classmethod
     def _split_representatives(
         cls,
@@ -348,27 +321,43 @@ class ConstituencySuggestionService:
         Direct means: represents a specific geographic area (constituency or state),
         not a general list representative.
         """
+        rep_constituencies = list(representative.constituencies.all())
+        rep_states = {
+            normalize_german_state((c.metadata or {}).get('state'))
+            for c in rep_constituencies
+            if (c.metadata or {}).get('state')
+        }
+        return cls._is_direct_mandate(
+            representative.election_mode,
+            {c.id for c in rep_constituencies},
+            rep_states,
+            location,
+            constituency_ids,
+        )
+
+    @staticmethod
+    def _is_direct_mandate(
+        election_mode: str,
+        rep_constituency_ids: Set[int],
+        rep_states: Set[str],
+        location: LocationContext,
+        constituency_ids: Set[int],
+    ) -> bool:
+        """``_is_direct_representative`` on plain values, for ranking without model instances."""
         # Federal-wide list representatives represent everyone, not direct
-        if representative.election_mode == 'FEDERAL_LIST':
+        if election_mode == 'FEDERAL_LIST':
             return False
 
         # EU representatives represent all EU citizens, not direct
-        if representative.election_mode == 'EU_LIST':
+        if election_mode == 'EU_LIST':
             return False
 
         # Representatives explicitly linked to one of the user's constituencies qualify
-        rep_constituencies = list(representative.constituencies.all())
-        rep_constituency_ids = {c.id for c in rep_constituencies}
         if constituency_ids & rep_constituency_ids:
             return True
 
         # Only list mandates can fall back to the overall state alignment
-        if location.state and representative.election_mode in {'STATE_LIST', 'STATE_REGIONAL_LIST'}:
-            rep_states = {
-                normalize_german_state((c.metadata or {}).get('state'))
-                for c in rep_constituencies
-                if (c.metadata or {}).get('state')
-            }
+        if location.state and election_mode in {'STATE_LIST', 'STATE_REGIONAL_LIST'}:
             if location.state in rep_states:
                 return True
 
@@ -471,69 +460,67 @@ class ConstituencySuggestionService:
     ) -> List[Representative]:
         """
         Get expert representatives based on topic expertise.
-        Finds representatives who have the matched TopicAreas assigned OR
-        serve on committees with those topic areas.
+
+        Scores the precomputed expertise profile of every active
+        representative (see ExpertiseIndex): representatives linked to a
+        matched TopicArea through a committee or a topic assignment rank by
+        their best committee role, then by the BM25 relevance of that
+        committee to the letter (see RankingIndex), then by how well their
+        committee, topic and focus terms match it. Representatives without
+        a topic link but with matching terms follow.
         """
         if not matched_topics:
             return []
 
-        # Find representatives via topic_areas OR committee memberships
-        topic_query = Q(topic_areas__in=matched_topics)
-        committee_query = Q(committee_memberships__committee__topic_areas__in=matched_topics)
+        matched_topic_ids = {t.id for t in matched_topics}
+        query_terms = ExpertiseIndex.query_terms(tokens, matched_topics)
+        committee_relevance = RankingIndex.score_committees(tokens)
 
-        reps = Representative.objects.filter(
-            is_active=True
-        ).filter(
-            topic_query | committee_query
-        ).exclude(
-            id__in=exclude_ids
-        ).select_related(
+        scored = []
+        for profile in ExpertiseIndex.profiles().values():
+            if profile.representative_id in exclude_ids:
+                continue
+            if parliament_ids and profile.parliament_id not in parliament_ids:
+                continue
+            link = profile.best_link(matched_topic_ids)
+            term_score = profile.score(query_terms)
+            if link is None and not term_score:
+                continue
+            relevance = committee_relevance.get(ExpertiseIndex.committee_id(link[1]), 0.0) if link else 0.0
+            scored.append((link, relevance, term_score, profile))
+
+        # Sort by committee role (higher first, linked before unlinked), then committee relevance,
+        # then term match, then by name
+        scored.sort(key=lambda item: (-(item[0][0] if item[0] else -1), -item[1], -item[2], item[3].sort_name))
+        scored = scored[:limit]
+
+        representatives = Representative.objects.select_related(
             'parliament', 'parliament_term'
         ).prefetch_related(
             'constituencies',
             'topic_areas',
-            'committee_memberships__committee__topic_areas'
-        ).distinct()
+        ).in_bulk([profile.representative_id for _, _, _, profile in scored])
+        memberships = CommitteeMembership.objects.select_related('committee').in_bulk(
+            [link[1] for link, _, _, _ in scored if link and link[1]]
+        )
 
-        if parliament_ids:
-            reps = reps.filter(parliament_id__in=parliament_ids)
-
-        # Enrich with metadata and score for sorting
-        scored_reps = []
-        for rep in reps:
-            # Find a relevant committee
-            matched_topic_ids = {t.id for t in matched_topics}
-            relevant_committees = []
-            best_score = 0
-
-            for membership in rep.committee_memberships.all():
-                committee_topic_ids = set(membership.committee.topic_areas.values_list('id', flat=True))
-                if committee_topic_ids & matched_topic_ids:
-                    relevant_committees.append(membership)
-                    # Score based on role
-                    role_scores = {
-                        'chair': 3,
-                        'deputy_chair': 2,
-                        'foreperson': 2,
-                        'member': 1,
-                        'alternate_member': 0,
-                    }
-                    score = role_scores.get(membership.role, 0)
-                    best_score = max(best_score, score)
-
-            rep.relevant_committees = relevant_committees[:1]
-            rep.committee_score = best_score
+        expert_reps = []
+        for link, _relevance, term_score, profile in scored:
+            rep = representatives.get(profile.representative_id)
+            if rep is None:
+                continue
+            membership = memberships.get(link[1]) if link and link[1] else None
+            rep.relevant_committees = [membership] if membership else []
+            rep.committee_score = link[0] if link else 0
+            rep.keyword_score = term_score
 
             # Set suggested constituency
             rep_constituencies = list(rep.constituencies.all())
             rep.suggested_constituency = rep_constituencies[0] if rep_constituencies else None
 
-            scored_reps.append(rep)
-
-        # Sort by committee score (higher first), then by name
-        scored_reps.sort(key=lambda r: (-r.committee_score, r.last_name, r.first_name))
+            expert_reps.append(rep)
 
-        return scored_reps[:limit]
+        return expert_reps
 
     @classmethod
     def _rank_representatives(
@@ -544,14 +531,18 @@ class ConstituencySuggestionService:
         limit: int,
         primary_topic: Optional[TopicArea] = None,
     ) -> List[Representative]:
-        base_qs = Representative.objects.filter(is_active=True).select_related(
-            'parliament', 'parliament_term'
-        ).prefetch_related(
-            'constituencies',
-            'topic_areas',
-            'committee_memberships__committee',
-            'committee_memberships__committee__topic_areas'
-        )
+        """
+        Rank representatives by geographic relevance plus expertise score.
+
+        Candidates are the active representatives tied to the user's
+        constituencies or state; without any, every active representative
+        (of the inferred parliament level). Scoring runs over ids, light
+        constituency rows and the in-memory expertise profiles, so only the
+        top ``limit`` representatives are loaded as model instances.
+        """
+        profiles = ExpertiseIndex.profiles()
+        query_terms = ExpertiseIndex.query_terms(tokens, matched_topics)
+        constituency_ids = {constituency.id for constituency in location.constituencies}
 
         location_filter = Q()
         if location.has_constituencies:
@@ -559,142 +550,100 @@ class ConstituencySuggestionService:
         if location.state:
             location_filter |= Q(constituencies__metadata__state__iexact=location.state) | Q(parliament__region__iexact=location.state)
 
+        # {representative id: (geo score, sort name)}
+        candidates: Dict[int, Tuple[int, Tuple[str, str]]] = {}
         if location_filter:
-            base_qs = base_qs.filter(location_filter).distinct()
-
-        candidates = list(base_qs[:50])
+            rows = Representative.objects.filter(is_active=True).filter(location_filter).values_list(
+                'id', 'election_mode', 'last_name', 'first_name'
+            ).distinct()
+            modes = {rep_id: (mode, (last_name, first_name)) for rep_id, mode, last_name, first_name in rows}
+
+            rep_constituencies: Dict[int, Set[int]] = {rep_id: set() for rep_id in modes}
+            rep_states: Dict[int, Set[str]] = {rep_id: set() for rep_id in modes}
+            links = Representative.constituencies.through.objects.filter(
+                representative_id__in=modes
+            ).values_list('representative_id', 'constituency_id', 'constituency__metadata')
+            for rep_id, constituency_id, metadata in links:
+                rep_constituencies[rep_id].add(constituency_id)
+                state = normalize_german_state((metadata or {}).get('state'))
+                if state:
+                    rep_states[rep_id].add(state)
+
+            for rep_id, (mode, sort_name) in modes.items():
+                geo_score = 0
+                if cls._is_direct_mandate(mode, rep_constituencies[rep_id], rep_states[rep_id], location, constituency_ids):
+                    if constituency_ids & rep_constituencies[rep_id]:
+                        geo_score = 20  # Exact constituency match
+                    elif location.state and location.state in rep_states[rep_id]:
+                        geo_score = 10  # State match
+                candidates[rep_id] = (geo_score, sort_name)
 
         if not candidates:
-            fallback_qs = Representative.objects.filter(is_active=True)
+            parliament_ids = None
             inferred_level = cls._infer_level(primary_topic, location, tokens)
             if inferred_level:
-                fallback_qs = fallback_qs.filter(parliament__level__iexact=inferred_level)
-            fallback_qs = fallback_qs.select_related('parliament', 'parliament_term').prefetch_related(
-                'constituencies',
-                'topic_areas',
-                'committee_memberships__committee',
-                'committee_memberships__committee__topic_areas'
-            )
-            candidates = list(fallback_qs[:50])
+                parliament_ids = set(
+                    Parliament.objects.filter(level__iexact=inferred_level).values_list('id', flat=True)
+                )
+            candidates = {
+                profile.representative_id: (0, profile.sort_name)
+                for profile in profiles.values()
+                if parliament_ids is None or profile.parliament_id in parliament_ids
+            }
 
         if not candidates:
             return []
 
-        search_terms = set(tokens)
-        search_terms.update(cls._topic_terms(matched_topics))
-        search_terms = {term for term in search_terms if len(term) >= cls.MIN_TOKEN_LENGTH}
+        # Subject expertise score from the precomputed profile: committee terms
+        # weigh most, then topic areas, then focus topics
+        scored: List[Tuple[int, float, Tuple[str, str], int]] = []
+        for rep_id, (geo_score, sort_name) in candidates.items():
+            profile = profiles.get(rep_id)
+            expertise_score = profile.score(query_terms) if profile else 0
+            scored.append((geo_score, expertise_score, sort_name, rep_id))
 
-        constituency_ids = {constituency.id for constituency in location.constituencies}
-        scored: List[Tuple[int, Representative]] = []
-
-        for representative in candidates:
-            rep_constituencies = list(representative.constituencies.all())
-            rep_states = {
-                normalize_german_state((constituency.metadata or {}).get('state'))
-                for constituency in rep_constituencies
-                if (constituency.metadata or {}).get('state')
-            }
+        # Total score combines geography and expertise
+        scored.sort(key=lambda item: (-(item[0] + item[1]), item[2]))
+        scored = scored[:limit]
 
-            matched_constituency = None
-            if constituency_ids:
-                for constituency in rep_constituencies:
-                    if constituency.id in constituency_ids:
-                        matched_constituency = constituency
-                        break
-            if not matched_constituency and location.state:
-                for constituency in rep_constituencies:
-                    metadata_state = normalize_german_state((constituency.metadata or {}).get('state'))
-                    if metadata_state and metadata_state == location.state:
-                        matched_constituency = constituency
-                        break
-            if not matched_constituency and rep_constituencies:
-                matched_constituency = rep_constituencies[0]
-            representative.suggested_constituency = matched_constituency
-
-            is_direct = cls._is_direct_representative(representative, location, constituency_ids)
-
-            # Calculate geographic relevance score (for direct representatives)
-            geo_score = 0
-            if is_direct:
-                if constituency_ids and any(c.id in constituency_ids for c in rep_constituencies):
-                    geo_score += 20  # Exact constituency match
-                elif location.state and location.state in rep_states:
-                    geo_score += 10  # State match
-
-            # Calculate subject expertise score (for all representatives)
-            expertise_score = 0
-
-            # Committee expertise (primary indicator)
-            committee_keywords = []
-            for membership in representative.committee_memberships.all():
-                if membership.committee.keywords:
-                    committee_keywords.extend(membership.committee.get_keywords_list())
-            committee_blob = ' '.join(committee_keywords).lower()
-
-            for term in search_terms:
-                if term and term in committee_blob:
-                    expertise_score += 5
-
-            # Focus areas (secondary indicator)
-            focus_blob = ' '.join(filter(None, [representative.party, representative.focus_areas or ''])).lower()
-            for term in search_terms:
-                if term and term in focus_blob:
-                    expertise_score += 2
-
-            # Total score combines geography and expertise
-            score = geo_score + expertise_score
+        representatives = Representative.objects.select_related(
+            'parliament', 'parliament_term'
+        ).prefetch_related('constituencies').in_bulk([rep_id for _, _, _, rep_id in scored])
 
+        ranked = []
+        for geo_score, expertise_score, _sort_name, rep_id in scored:
+            representative = representatives.get(rep_id)
+            if representative is None:
+                continue
+            representative.suggested_constituency = cls._suggested_constituency(
+                list(representative.constituencies.all()), location, constituency_ids
+            )
             # Store separate scores for potential display/sorting
             representative.geo_score = geo_score
             representative.expertise_score = expertise_score
+            ranked.append(representative)
+        return ranked
 
-            scored.append((score, representative))
-
-        scored.sort(key=lambda item: (-item[0], item[1].last_name, item[1].first_name))
-
-        ranked = [rep for score, rep in scored if score > 0][:limit]
-        if len(ranked) < limit:
-            supplemental = [rep for score, rep in scored if rep not in ranked][: limit - len(ranked)]
-            ranked.extend(supplemental)
-        return ranked[:limit]
+    @staticmethod
+    def _suggested_constituency(
+        rep_constituencies: List[Constituency],
+        location: LocationContext,
+        constituency_ids: Set[int],
+    ) -> Optional[Constituency]:
+        """The user's own constituency among the representative's, else one in the user's state, else the first."""
+        for constituency in rep_constituencies:
+            if constituency.id in constituency_ids:
+                return constituency
+        if location.state:
+            for constituency in rep_constituencies:
+                metadata_state = normalize_german_state((constituency.metadata or {}).get('state'))
+                if metadata_state and metadata_state == location.state:
+                    return constituency
+        return rep_constituencies[0] if rep_constituencies else None
 
     @classmethod
     def _match_tags(cls, tokens: List[str], matched_topics: List[TopicArea]) -> List[Tag]:
-        search_terms = set(tokens)
-        search_terms.update(cls._topic_terms(matched_topics))
-        if not search_terms:
-            return []
-
-        tag_query = Q()
-        for term in search_terms:
-            tag_query |= Q(name__icontains=term) | Q(slug__icontains=term)
-
-        if not tag_query:
-            return []
-
-        candidates = list(Tag.objects.filter(tag_query).distinct())
-        if not candidates:
-            return []
-
-        scored: List[Tuple[int, Tag]] = []
-        for tag in candidates:
-            name_lower = tag.name.lower()
-            slug_lower = tag.slug.lower()
-            score = 0
-            for term in search_terms:
-                if term in name_lower:
-                    score += 2
-                elif term in slug_lower:
-                    score += 1
-            scored.append((score, tag))
-
-        scored.sort(key=lambda item: (-item[0], item[1].name))
-        ranked = [tag for score, tag in scored if score > 0][: cls.MAX_TAGS]
-        if len(ranked) < cls.MAX_TAGS:
-            ranked.extend(
-                [tag for score, tag in scored if tag not in ranked][: cls.MAX_TAGS - len(ranked)]
-            )
-        return ranked
+        return TagIndex.match(cls._search_terms(tokens, matched_topics), limit=cls.MAX_TAGS)
 
     @classmethod
     def _infer_level(
@@ -0,0 +1,63 @@
+# ABOUTME: Process-level directory of Constituency rows keyed by (scope, list_id) and by state.
+# ABOUTME: Lets WahlkreisResolver map Wahlkreis numbers to constituencies without database queries.
+
+import logging
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from ..constants import normalize_german_state
+from ..models import Constituency
+from .versioning import VersionedSnapshot
+
+logger = logging.getLogger('letters.services')
+
+
+class ConstituencyDirectory(VersionedSnapshot):
+    """
+    In-memory snapshot of all constituencies, loaded with a single query.
+
+    The snapshot is rebuilt when the 'constituencies' data version changes
+    (bumped by Constituency/Parliament signals and the sync commands) or
+    after CONSTITUENCY_DIRECTORY_TTL seconds.
+    """
+
+    VERSION_KEY = 'constituencies'
+    TTL_SETTING = 'CONSTITUENCY_DIRECTORY_TTL'
+
+    _by_list_id: Dict[Tuple[str, str], List[Constituency]] = {}
+    _state_lists: Dict[str, List[Constituency]] = {}
+
+    @classmethod
+    def build(cls) -> None:
+        by_list_id: Dict[Tuple[str, str], List[Constituency]] = defaultdict(list)
+        state_lists: Dict[str, List[Constituency]] = defaultdict(list)
+
+        constituencies = Constituency.objects.select_related('parliament_term__parliament')
+        for constituency in constituencies:
+            if constituency.list_id:
+                by_list_id[(constituency.scope, constituency.list_id)].append(constituency)
+            if constituency.scope == 'FEDERAL_STATE_LIST':
+                state = normalize_german_state((constituency.metadata or {}).get('state'))
+                if state:
+                    state_lists[state].append(constituency)
+
+        cls._by_list_id = dict(by_list_id)
+        cls._state_lists = dict(state_lists)
+        logger.debug("Built constituency directory (%s list ids)", len(by_list_id))
+
+    @classmethod
+    def by_list_id(cls, scope: str, list_id: str) -> List[Constituency]:
+        """Return constituencies with the given scope and list_id."""
+        cls._ensure_current()
+        return list(cls._by_list_id.get((scope, list_id), ()))
+
+    @classmethod
+    def federal_state_lists(cls, state: str) -> List[Constituency]:
+        """Return the Bundestag state list constituencies for a German state."""
+        cls._ensure_current()
+        return list(cls._state_lists.get(normalize_german_state(state), ()))
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._by_list_id = {}
+        cls._state_lists = {}
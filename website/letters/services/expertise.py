@@ -0,0 +1,264 @@
+# ABOUTME: Precomputed representative expertise profiles: weighted term vectors and topic links per representative.
+# ABOUTME: Built into the RepresentativeExpertise table after syncs and scored in memory by ExpertiseIndex.
+
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.db import transaction
+
+from ..models import CommitteeMembership, Representative, RepresentativeExpertise, TopicArea
+from .text_analysis import get_analyzer
+from .versioning import VersionedSnapshot, bump_data_version
+
+logger = logging.getLogger('letters.services')
+
+# Committee role → strength of a representative's link to the committee's topics
+ROLE_SCORES = {
+    'chair': 3,
+    'deputy_chair': 2,
+    'foreperson': 2,
+    'member': 1,
+    'alternate_member': 0,
+}
+
+# (role score, membership id or None)
+TopicLink = Tuple[int, Optional[int]]
+
+
+@dataclass
+class ExpertiseProfile:
+    representative_id: int
+    parliament_id: int
+    sort_name: Tuple[str, str]
+    terms: Dict[str, float]
+    topic_links: Dict[int, TopicLink]
+
+    def score(self, query_terms: Dict[str, float]) -> float:
+        """Dot product of the profile's term weights with ``{term: query weight}``."""
+        terms = self.terms
+        return sum(terms[term] * weight for term, weight in query_terms.items() if term in terms)
+
+    def best_link(self, topic_ids: Set[int]) -> Optional[TopicLink]:
+        """The strongest link to any of the topics, preferring committee links on equal role scores."""
+        links = [self.topic_links[topic_id] for topic_id in topic_ids if topic_id in self.topic_links]
+        if not links:
+            return None
+        return max(links, key=lambda link: (link[0], link[1] is not None))
+
+
+class ExpertiseProfileBuilder:
+    """
+    Compute expertise profiles from committees, topic areas and focus topics.
+
+    A profile's term vector holds the analyzed terms of the representative's
+    committee names and keywords (COMMITTEE_WEIGHT), assigned topic area
+    names and keywords (TOPIC_AREA_WEIGHT) and focus topics (FOCUS_WEIGHT).
+    A term gets each source's weight once, however many committees mention
+    it. Compound terms also index their parts found elsewhere in the
+    profiles. Topic links record, per TopicArea, the best committee role
+    linking the representative to it.
+    """
+
+    COMMITTEE_WEIGHT = 5.0
+    TOPIC_AREA_WEIGHT = 3.0
+    FOCUS_WEIGHT = 2.0
+
+    PREFETCH = ('topic_areas', 'committee_memberships__committee__topic_areas')
+
+    @classmethod
+    def _source_terms(cls, representative: Representative) -> List[Tuple[Set[str], float]]:
+        analyzer = get_analyzer()
+        committee_terms: Set[str] = set()
+        for membership in representative.committee_memberships.all():
+            committee_terms.update(analyzer.terms(membership.committee.name))
+            for keyword in membership.committee.get_keywords_list():
+                committee_terms.update(analyzer.terms(keyword))
+
+        topic_terms: Set[str] = set()
+        for topic in representative.topic_areas.all():
+            topic_terms.update(analyzer.terms(topic.name))
+            topic_terms.update(analyzer.terms(topic.keywords))
+
+        focus_terms: Set[str] = set()
+        for focus_area in representative.get_focus_areas_list():
+            focus_terms.update(analyzer.terms(focus_area))
+
+        return [
+            (committee_terms, cls.COMMITTEE_WEIGHT),
+            (topic_terms, cls.TOPIC_AREA_WEIGHT),
+            (focus_terms, cls.FOCUS_WEIGHT),
+        ]
+
+    @staticmethod
+    def _topic_links(representative: Representative) -> Dict[int, TopicLink]:
+        links: Dict[int, TopicLink] = {}
+        for membership in representative.committee_memberships.all():
+            score = ROLE_SCORES.get(membership.role, 0)
+            for topic in membership.committee.topic_areas.all():
+                if topic.id not in links or score > links[topic.id][0]:
+                    links[topic.id] = (score, membership.id)
+        for topic in representative.topic_areas.all():
+            links.setdefault(topic.id, (0, None))
+        return links
+
+    @classmethod
+    def build(
+        cls,
+        representatives: Iterable[Representative],
+        vocabulary: Optional[Set[str]] = None,
+    ) -> Dict[int, Tuple[Dict[str, float], Dict[int, TopicLink]]]:
+        """
+        Return ``{representative_id: (terms, topic_links)}``.
+
+        Compounds are split against ``vocabulary`` plus all whole terms of
+        the given representatives.
+        """
+        analyzer = get_analyzer()
+        sources = {
+            representative.id: (cls._source_terms(representative), cls._topic_links(representative))
+            for representative in representatives
+        }
+        known_terms = set(vocabulary or ())
+        for source_terms, _ in sources.values():
+            for terms, _ in source_terms:
+                known_terms.update(terms)
+
+        profiles = {}
+        for representative_id, (source_terms, topic_links) in sources.items():
+            weights: Dict[str, float] = Counter()
+            for terms, weight in source_terms:
+                expanded = set(terms)
+                for term in terms:
+                    expanded.update(analyzer.split_compound(term, known_terms))
+                for term in expanded:
+                    weights[term] += weight
+            profiles[representative_id] = (dict(weights), topic_links)
+        return profiles
+
+    @classmethod
+    def refresh(cls) -> int:
+        """Rebuild the RepresentativeExpertise table for all active representatives."""
+        representatives = Representative.objects.filter(is_active=True).prefetch_related(*cls.PREFETCH)
+        profiles = cls.build(representatives)
+
+        with transaction.atomic():
+            RepresentativeExpertise.objects.all().delete()
+            RepresentativeExpertise.objects.bulk_create(
+                [
+                    RepresentativeExpertise(
+                        representative_id=representative_id,
+                        terms=terms,
+                        topic_links={str(topic_id): list(link) for topic_id, link in topic_links.items()},
+                    )
+                    for representative_id, (terms, topic_links) in profiles.items()
+                ],
+                batch_size=500,
+            )
+        transaction.on_commit(lambda: bump_data_version(ExpertiseIndex.VERSION_KEY))
+
+        logger.info("Refreshed expertise profiles for %d representatives", len(profiles))
+        return len(profiles)
+
+
+class ExpertiseIndex(VersionedSnapshot):
+    """
+    Process-level copy of the expertise profiles of all active representatives.
+
+    Loaded with one query from RepresentativeExpertise; active
+    representatives without a stored profile (added since the last sync)
+    get one computed in memory. Reloaded when the 'expertise' data version
+    changes (bumped by ExpertiseProfileBuilder.refresh) or after
+    EXPERTISE_INDEX_TTL seconds.
+    """
+
+    VERSION_KEY = 'expertise'
+    TTL_SETTING = 'EXPERTISE_INDEX_TTL'
+
+    # Matched topics' terms broaden the query but count less than the letter's own words
+    TOPIC_TERM_WEIGHT = 0.5
+
+    _profiles: Dict[int, ExpertiseProfile] = {}
+    _vocabulary: Set[str] = set()
+    # Membership id → committee id, for the memberships in topic links
+    _committees: Dict[int, int] = {}
+
+    @classmethod
+    def build(cls) -> None:
+        profiles: Dict[int, ExpertiseProfile] = {}
+        rows = RepresentativeExpertise.objects.filter(representative__is_active=True).values_list(
+            'representative_id', 'representative__parliament_id',
+            'representative__last_name', 'representative__first_name',
+            'terms', 'topic_links',
+        )
+        for representative_id, parliament_id, last_name, first_name, terms, topic_links in rows:
+            profiles[representative_id] = ExpertiseProfile(
+                representative_id=representative_id,
+                parliament_id=parliament_id,
+                sort_name=(last_name, first_name),
+                terms=terms,
+                topic_links={int(topic_id): (link[0], link[1]) for topic_id, link in topic_links.items()},
+            )
+        vocabulary = {term for profile in profiles.values() for term in profile.terms}
+
+        missing = list(
+            Representative.objects.filter(is_active=True, expertise__isnull=True)
+            .prefetch_related(*ExpertiseProfileBuilder.PREFETCH)
+        )
+        if missing:
+            logger.info("Computing expertise profiles for %d representatives without a stored one", len(missing))
+            built = ExpertiseProfileBuilder.build(missing, vocabulary)
+            for representative in missing:
+                terms, topic_links = built[representative.id]
+                profiles[representative.id] = ExpertiseProfile(
+                    representative_id=representative.id,
+                    parliament_id=representative.parliament_id,
+                    sort_name=(representative.last_name, representative.first_name),
+                    terms=terms,
+                    topic_links=topic_links,
+                )
+                vocabulary.update(terms)
+
+        membership_ids = {
+            link[1] for profile in profiles.values() for link in profile.topic_links.values() if link[1]
+        }
+        committees = dict(
+            CommitteeMembership.objects.filter(id__in=membership_ids).values_list('id', 'committee_id')
+        )
+
+        cls._profiles = profiles
+        cls._vocabulary = vocabulary
+        cls._committees = committees
+        logger.debug("Built expertise index (%s representatives)", len(profiles))
+
+    @classmethod
+    def profiles(cls) -> Dict[int, ExpertiseProfile]:
+        cls._ensure_current()
+        return cls._profiles
+
+    @classmethod
+    def committee_id(cls, membership_id: Optional[int]) -> Optional[int]:
+        """The committee of a membership in a topic link, or None for assignment-only links."""
+        cls._ensure_current()
+        return cls._committees.get(membership_id) if membership_id else None
+
+    @classmethod
+    def query_terms(cls, tokens: Iterable[str], topics: Iterable[TopicArea] = ()) -> Dict[str, float]:
+        """Query vector: the tokens' analyzed terms (see GermanAnalyzer.query_terms) plus the topics' terms."""
+        cls._ensure_current()
+        analyzer = get_analyzer()
+        query: Dict[str, float] = Counter()
+        for token in tokens:
+            for term in analyzer.query_terms(token, cls._vocabulary):
+                query[term] += 1.0
+        for topic in topics:
+            for term in set(analyzer.terms(topic.name)) | set(analyzer.terms(topic.keywords)):
+                query[term] += cls.TOPIC_TERM_WEIGHT
+        return dict(query)
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._profiles = {}
+        cls._vocabulary = set()
+        cls._committees = {}
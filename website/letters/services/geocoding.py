@@ -1,38 +1,55 @@
 # ABOUTME: Geocoding services for converting addresses to coordinates and Wahlkreise.
-# ABOUTME: Uses OSM Nominatim for geocoding and GeoJSON boundary data for constituency mapping.
+# ABOUTME: Uses a configurable geocoder backend (OSM Nominatim by default) and GeoJSON boundary data.
 
 import hashlib
-import json
 import logging
-import time
+import math
+import threading
+import weakref
+from datetime import timedelta
 from pathlib import Path
 from typing import Optional, Tuple
 
-import requests
+import numpy as np
+import shapely
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.utils import timezone
 
+from ..constants import normalize_address
+from ..geo import BoundaryRepository, cell_key
 from ..models import GeocodeCache
+from .geocoding_backends import (
+    LOOKUP_ERRORS,
+    GeocoderBackend,
+    format_address,
+    get_geocoder_backend,
+    is_transient_error,
+)
+from .geocoding_cache import GeocodeResultCache, LRUCache
+from .instrumentation import span
+from .rate_limiting import RateLimitExceeded
 
 logger = logging.getLogger('letters.services')
 
 
 class AddressGeocoder:
     """
-    Geocode German addresses using OpenStreetMap Nominatim API.
+    Geocode German addresses through a pluggable geocoder backend.
 
     Features:
-    - Caches results using GeocodeCache model
-    - Rate limits to 1 request/second for public API compliance
+    - Caches results in an in-process LRU, an optional shared Django cache
+      and the GeocodeCache model (see GeocodeResultCache)
+    - Backend chosen by settings.GEOCODER_BACKEND: public Nominatim
+      (rate limited to 1 request/second), a self-hosted Nominatim, or an
+      offline local gazetteer
     - Handles errors gracefully
-    - Caches both successful and failed lookups to avoid repeated failures
+    - Caches failed lookups too; transient errors are retried with
+      exponential backoff, "not found" results after a long delay
     """
 
-    NOMINATIM_ENDPOINT = 'https://nominatim.openstreetmap.org/search'
-    USER_AGENT = 'WriteThem.eu/0.1 (civic engagement platform)'
-    RATE_LIMIT_SECONDS = 1.0
-
-    def __init__(self):
-        self._last_request_time = 0
+    def __init__(self, backend: Optional[GeocoderBackend] = None):
+        self.backend = backend or get_geocoder_backend()
 
     def geocode(
         self,
@@ -57,40 +74,172 @@ class AddressGeocoder:
         if not address:
             return None, None, False, 'Address is required'
 
+        return self._geocode(
+            address, country,
+            lambda: self.backend.lookup(address, country)
+        )
+
+    def geocode_structured(
+        self,
+        street: str,
+        postal_code: str,
+        city: str,
+        country: str = 'DE'
+    ) -> Tuple[Optional[float], Optional[float], bool, Optional[str]]:
+        """
+        Geocode an address given as separate street, postal code and city.
+
+        Backends that support it (Nominatim) match each part against the
+        corresponding field, which finds more addresses on the first try
+        than a free-form query. The cache key is built from the parts joined
+        as "Street 1, 12345 City", so a structured lookup and the same
+        address typed as one string share a GeocodeCache entry.
+
+        Returns:
+            Same tuple as geocode()
+        """
+        street = (street or '').strip()
+        postal_code = (postal_code or '').strip()
+        city = (city or '').strip()
+        country = (country or 'DE').upper()
+
+        address = format_address(street, postal_code, city)
+        if not address:
+            return None, None, False, 'Address is required'
+
+        return self._geocode(
+            address, country,
+            lambda: self.backend.lookup_structured(street, postal_code, city, country),
+            parts=(street, postal_code, city)
+        )
+
+    def _geocode(
+        self,
+        address: str,
+        country: str,
+        lookup,
+        parts: Optional[Tuple[str, str, str]] = None
+    ) -> Tuple[Optional[float], Optional[float], bool, Optional[str]]:
+        """Serve a lookup from the cache or run it through the backend and cache the outcome."""
         address_hash = self._generate_cache_key(address, country)
 
-        cached = self._get_from_cache(address_hash)
+        with span('geocode.cache'):
+            cached = self._get_from_cache(address_hash)
         if cached is not None:
             return cached
 
         try:
-            self._apply_rate_limit()
-            result = self._query_nominatim(address, country)
-
-            if result:
-                lat, lon = result
-                self._store_in_cache(
-                    address_hash, address, country,
-                    lat, lon, success=True, error_message=None
-                )
-                return lat, lon, True, None
-            else:
-                error_msg = 'Address not found'
-                self._store_in_cache(
-                    address_hash, address, country,
-                    None, None, success=False, error_message=error_msg
-                )
-                return None, None, False, error_msg
+            with span('geocode.rate_limit'):
+                self._apply_rate_limit()
+            with span('geocode.http', backend=self.backend.name):
+                coordinates = lookup()
+        except RateLimitExceeded as e:
+            return self._rate_limited(address, e)
+        except LOOKUP_ERRORS as e:
+            with span('geocode.store'):
+                return self._record_failure(address_hash, address, country, e, parts)
+        with span('geocode.store'):
+            return self._record_result(address_hash, address, country, coordinates, parts)
+
+    async def geocode_structured_async(
+        self,
+        street: str,
+        postal_code: str,
+        city: str,
+        country: str = 'DE'
+    ) -> Tuple[Optional[float], Optional[float], bool, Optional[str]]:
+        """
+        Async geocode_structured() for async views.
 
-        except Exception as e:
-            error_msg = f'Geocoding API error: {str(e)}'
-            logger.warning('Geocoding failed for %s: %s', address, error_msg)
+        The backend request and the rate-limit wait don't block the event
+        loop; cache lookups and writes run through sync_to_async.
+        """
+        street = (street or '').strip()
+        postal_code = (postal_code or '').strip()
+        city = (city or '').strip()
+        country = (country or 'DE').upper()
 
+        address = format_address(street, postal_code, city)
+        if not address:
+            return None, None, False, 'Address is required'
+
+        parts = (street, postal_code, city)
+        address_hash = self._generate_cache_key(address, country)
+
+        with span('geocode.cache'):
+            cached = await sync_to_async(self._get_from_cache)(address_hash)
+        if cached is not None:
+            return cached
+
+        try:
+            with span('geocode.rate_limit'):
+                await self.backend.wait_async()
+            with span('geocode.http', backend=self.backend.name):
+                coordinates = await self.backend.lookup_structured_async(street, postal_code, city, country)
+        except RateLimitExceeded as e:
+            return self._rate_limited(address, e)
+        except LOOKUP_ERRORS as e:
+            with span('geocode.store'):
+                return await sync_to_async(self._record_failure)(address_hash, address, country, e, parts)
+        with span('geocode.store'):
+            return await sync_to_async(self._record_result)(address_hash, address, country, coordinates, parts)
+
+    def _record_result(
+        self,
+        address_hash: str,
+        address: str,
+        country: str,
+        coordinates: Optional[Tuple[float, float]],
+        parts: Optional[Tuple[str, str, str]]
+    ) -> Tuple[Optional[float], Optional[float], bool, Optional[str]]:
+        """Cache a backend answer (coordinates or "not found") and return it as a geocode() tuple."""
+        if coordinates:
+            lat, lon = coordinates
             self._store_in_cache(
                 address_hash, address, country,
-                None, None, success=False, error_message=error_msg
+                lat, lon, success=True, error_message=None,
+                parts=parts
             )
-            return None, None, False, error_msg
+            return lat, lon, True, None
+
+        error_msg = 'Address not found'
+        self._store_in_cache(
+            address_hash, address, country,
+            None, None, success=False, error_message=error_msg,
+            failure_kind='NOT_FOUND', parts=parts
+        )
+        return None, None, False, error_msg
+
+    def _record_failure(
+        self,
+        address_hash: str,
+        address: str,
+        country: str,
+        error: Exception,
+        parts: Optional[Tuple[str, str, str]]
+    ) -> Tuple[Optional[float], Optional[float], bool, Optional[str]]:
+        """Cache a backend error and return it as a geocode() tuple."""
+        error_msg = f'Geocoding API error: {str(error)}'
+        logger.warning('Geocoding failed for %s: %s', address, error_msg)
+
+        # Timeouts, 5xx and rate limiting are cached only until the backoff
+        # expires; 4xx responses and malformed payloads would fail again
+        failure_kind = 'TRANSIENT' if is_transient_error(error) else 'PERMANENT'
+        self._store_in_cache(
+            address_hash, address, country,
+            None, None, success=False, error_message=error_msg,
+            failure_kind=failure_kind, parts=parts
+        )
+        return None, None, False, error_msg
+
+    @staticmethod
+    def _rate_limited(
+        address: str,
+        error: RateLimitExceeded
+    ) -> Tuple[Optional[float], Optional[float], bool, Optional[str]]:
+        """Report a lookup skipped by the rate limiter; nothing was sent, so nothing is cached."""
+        logger.warning('Geocoding skipped for %s: %s', address, error)
+        return None, None, False, f'Geocoding busy: {error}'
 
     def _generate_cache_key(
         self,
@@ -98,22 +247,17 @@ class AddressGeocoder:
         country: str
     ) -> str:
         """Generate SHA256 hash of normalized address for cache lookup."""
-        normalized = f"{address}|{country}"
+        normalized = f"{normalize_address(address)}|{country.upper()}"
         return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
 
     def _get_from_cache(
         self,
         address_hash: str
     ) -> Optional[Tuple[Optional[float], Optional[float], bool, Optional[str]]]:
-        """Check cache for existing geocoding result."""
-        try:
-            cache_entry = GeocodeCache.objects.get(address_hash=address_hash)
-            if cache_entry.success:
-                return cache_entry.latitude, cache_entry.longitude, True, None
-            else:
-                return None, None, False, cache_entry.error_message
-        except GeocodeCache.DoesNotExist:
+        """Check the cache tiers for an existing geocoding result."""
+        if not self.backend.cacheable:
             return None
+        return GeocodeResultCache.get(address_hash)
 
     def _store_in_cache(
         self,
@@ -123,88 +267,72 @@ class AddressGeocoder:
         latitude: Optional[float],
         longitude: Optional[float],
         success: bool,
-        error_message: Optional[str]
+        error_message: Optional[str],
+        failure_kind: str = '',
+        parts: Optional[Tuple[str, str, str]] = None
     ) -> None:
-        """Store geocoding result in cache."""
-        GeocodeCache.objects.update_or_create(
-            address_hash=address_hash,
+        """Store geocoding result in cache, scheduling a retry for failures."""
+        if not self.backend.cacheable:
+            return
+
+        failure_count = 0
+        retry_after = None
+        if not success:
+            previous = GeocodeCache.objects.filter(
+                address_hash=address_hash,
+                success=False,
+            ).values_list('failure_count', flat=True).first()
+            failure_count = (previous or 0) + 1
+            retry_after = timezone.now() + self._retry_delay(failure_kind, failure_count)
+
+        # Free-form lookups keep the whole address in `city`
+        street, postal_code, city = parts or ('', '', address)
+        GeocodeResultCache.set(
+            address_hash,
+            (latitude, longitude, success, None if success else error_message),
             defaults={
-                'street': '',
-                'postal_code': '',
-                'city': address,
+                'street': street,
+                'postal_code': postal_code,
+                'city': city,
                 'country': country,
                 'latitude': latitude,
                 'longitude': longitude,
                 'success': success,
                 'error_message': error_message or '',
+                'failure_kind': '' if success else failure_kind,
+                'failure_count': failure_count,
+                'retry_after': retry_after,
             }
         )
 
-    def _apply_rate_limit(self) -> None:
-        """Ensure we don't exceed 1 request per second."""
-        current_time = time.time()
-        time_since_last = current_time - self._last_request_time
-
-        if time_since_last < self.RATE_LIMIT_SECONDS:
-            sleep_time = self.RATE_LIMIT_SECONDS - time_since_last
-            time.sleep(sleep_time)
-
-        self._last_request_time = time.time()
-
-    def _query_nominatim(
-        self,
-        address: str,
-        country: str
-    ) -> Optional[Tuple[float, float]]:
+    @staticmethod
+    def _retry_delay(failure_kind: str, failure_count: int) -> timedelta:
         """
-        Query Nominatim API for address coordinates.
-
-        Returns:
-            (latitude, longitude) on success, None if not found
+        How long a failed lookup stays cached.
 
-        Raises:
-            requests.RequestException on API errors
+        Transient errors back off exponentially from GEOCODE_RETRY_BASE_SECONDS
+        up to GEOCODE_RETRY_MAX_SECONDS; "not found" results are kept for
+        GEOCODE_NOT_FOUND_RETRY_SECONDS because OSM data changes slowly, and
+        other errors for GEOCODE_PERMANENT_RETRY_SECONDS.
         """
-        params = {
-            'q': address,
-            'format': 'json',
-            'addressdetails': 1,
-            'limit': 1,
-            'countrycodes': country.lower(),
-        }
+        if failure_kind == 'NOT_FOUND':
+            return timedelta(seconds=getattr(settings, 'GEOCODE_NOT_FOUND_RETRY_SECONDS', 30 * 24 * 60 * 60))
+        if failure_kind == 'PERMANENT':
+            return timedelta(seconds=getattr(settings, 'GEOCODE_PERMANENT_RETRY_SECONDS', 7 * 24 * 60 * 60))
 
-        headers = {
-            'User-Agent': self.USER_AGENT
-        }
-
-        response = requests.get(
-            self.NOMINATIM_ENDPOINT,
-            params=params,
-            headers=headers,
-            timeout=10
-        )
-        response.raise_for_status()
-
-        results = response.json()
-
-        if results and len(results) > 0:
-            result = results[0]
-            lat = float(result['lat'])
-            lon = float(result['lon'])
-            return lat, lon
+        base = getattr(settings, 'GEOCODE_RETRY_BASE_SECONDS', 60)
+        maximum = getattr(settings, 'GEOCODE_RETRY_MAX_SECONDS', 24 * 60 * 60)
+        return timedelta(seconds=min(base * 2 ** (failure_count - 1), maximum))
 
-        return None
+    def _apply_rate_limit(self) -> None:
+        """Wait as long as the backend's rate limit requires."""
+        self.backend.wait()
 
 
 class WahlkreisLocator:
     """Locate which Wahlkreis (constituency) a coordinate falls within using Shapely."""
 
-    # Class-level cache for parsed constituencies
-    _cached_constituencies = None
-    _cached_state_constituencies = None
-    _cached_path = None
-
-    # CRS mapping for state GeoJSON files
+    # CRS mapping for state GeoJSON files, used to reproject them to WGS84 at load time
     # Most states use UTM zones, Bayern uses DHDN Gauss-Kruger
     STATE_CRS = {
         'BE': 'EPSG:25833',  # UTM Zone 33N (Berlin is on zone boundary, uses 33N)
@@ -218,78 +346,76 @@ class WahlkreisLocator:
         'TH': 'EPSG:25833',  # UTM Zone 33N
     }
 
-    def __init__(self, geojson_path=None):
-        """
-        Load and parse GeoJSON constituencies for federal and available states.
+    STATE_CODES = ['BW', 'BY', 'BE', 'HB', 'NI', 'NW', 'ST', 'SH', 'TH']
 
-        Args:
-            geojson_path: Path to the federal GeoJSON file. If None, uses settings.CONSTITUENCY_BOUNDARIES_PATH
+    # Set once warm_up() has loaded every boundary dataset
+    _warm_up_finished = False
+
+    # Grid of locate results, one per federal index (see _locate_detailed):
+    # (cell size, sorted boundary cell keys, LRUCache of interior cell results)
+    _cell_grids = weakref.WeakKeyDictionary()
+    _cell_stats = {'hits': 0, 'boundary': 0, 'misses': 0}
+    _cell_lock = threading.Lock()
+
+    @classmethod
+    def warm_up(cls, geojson_path=None):
+        """Load and index all federal and state boundaries and flag their boundary cells."""
+        cls(geojson_path)._cell_grid()
+        cls._warm_up_finished = True
+
+    @classmethod
+    def is_warm(cls):
+        """Return True once warm_up() has finished in this process."""
+        return cls._warm_up_finished
+
+    @classmethod
+    def boundary_datasets(cls, geojson_path=None):
         """
-        from shapely.geometry import shape
+        Return {path: source_crs} for the federal file and every state file next to it.
 
+        State files are listed whether or not they exist; callers filter as needed.
+        """
         if geojson_path is None:
             geojson_path = settings.CONSTITUENCY_BOUNDARIES_PATH
 
         geojson_path = Path(geojson_path)
-        data_dir = geojson_path.parent
+        datasets = {geojson_path: None}
+        for state_code in cls.STATE_CODES:
+            state_file = geojson_path.parent / f'wahlkreise_{state_code.lower()}.geojson'
+            datasets[state_file] = cls.STATE_CRS.get(state_code)
+        return datasets
 
-        # Use cached constituencies if available and path matches
-        if (WahlkreisLocator._cached_constituencies is not None and
-            WahlkreisLocator._cached_path == str(geojson_path)):
-            self.constituencies = WahlkreisLocator._cached_constituencies
-            self.state_constituencies = WahlkreisLocator._cached_state_constituencies
-            return
+    def __init__(self, geojson_path=None):
+        """
+        Attach to the shared boundary indexes for federal and available state files.
 
-        # Load federal constituencies
-        self.constituencies = []
-        with open(geojson_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        Parsing and indexing happen in BoundaryRepository, which caches each
+        file once per process; constructing a locator is cheap after the first time.
 
-        # Parse federal features
-        for feature in data.get('features', []):
-            properties = feature.get('properties', {})
-            wkr_nr = properties.get('WKR_NR')
-            wkr_name = properties.get('WKR_NAME', '')
-            land_name = properties.get('LAND_NAME', '')
+        Args:
+            geojson_path: Path to the federal GeoJSON file. If None, uses settings.CONSTITUENCY_BOUNDARIES_PATH
+        """
+        if geojson_path is None:
+            geojson_path = settings.CONSTITUENCY_BOUNDARIES_PATH
 
-            # Parse geometry using Shapely
-            geometry = shape(feature['geometry'])
+        geojson_path = Path(geojson_path)
+        data_dir = geojson_path.parent
 
-            # Store as tuple: (wkr_nr, wkr_name, land_name, geometry)
-            self.constituencies.append((wkr_nr, wkr_name, land_name, geometry))
+        # Federal BoundaryIndex (features in WGS84)
+        self.constituencies = BoundaryRepository.get_index(geojson_path)
+        if self.constituencies is None:
+            raise FileNotFoundError(f'Boundary dataset {geojson_path} not found')
 
-        # Load available state files
+        # State BoundaryIndex per state code, for the files that are available.
+        # Each file is reprojected from its native CRS to WGS84 when loaded.
         self.state_constituencies = {}
-
-        state_codes = ['BW', 'BY', 'BE', 'HB', 'NI', 'NW', 'ST', 'SH', 'TH']
-        for state_code in state_codes:
+        for state_code in self.STATE_CODES:
             state_file = data_dir / f'wahlkreise_{state_code.lower()}.geojson'
-
-            if state_file.exists():
-                state_data = []
-                with open(state_file, 'r', encoding='utf-8') as f:
-                    state_geojson = json.load(f)
-
-                for feature in state_geojson.get('features', []):
-                    properties = feature.get('properties', {})
-
-                    # Normalize properties to handle different field names
-                    wkr_nr, wkr_name = WahlkreisLocator._normalize_properties(properties)
-
-                    land_code = properties.get('LAND_CODE', state_code)
-                    land_name = properties.get('LAND_NAME', '')
-
-                    geometry = shape(feature['geometry'])
-
-                    # Store: (wkr_nr, wkr_name, land_code, land_name, geometry)
-                    state_data.append((wkr_nr, wkr_name, land_code, land_name, geometry))
-
-                self.state_constituencies[state_code] = state_data
-
-        # Cache the parsed constituencies
-        WahlkreisLocator._cached_constituencies = self.constituencies
-        WahlkreisLocator._cached_state_constituencies = self.state_constituencies
-        WahlkreisLocator._cached_path = str(geojson_path)
+            if BoundaryRepository.has_dataset(state_file):
+                self.state_constituencies[state_code] = BoundaryRepository.get_index(
+                    state_file,
+                    source_crs=self.STATE_CRS.get(state_code),
+                )
 
     def _land_name_to_code(self, land_name: str) -> str:
         """Map German state names to ISO codes."""
@@ -377,10 +503,82 @@ class WahlkreisLocator:
 
         return wkr_nr, wkr_name or ''
 
+    def _federal_result(self, feature):
+        properties = feature.properties
+        land_name = properties.get('LAND_NAME', '')
+        # Extract land_code from federal data (may need to map from land_name)
+        return {
+            'wkr_nr': properties.get('WKR_NR'),
+            'wkr_name': properties.get('WKR_NAME', ''),
+            'land_name': land_name,
+            'land_code': self._land_name_to_code(land_name)
+        }
+
+    def _state_result(self, feature, land_code):
+        properties = feature.properties
+        # Normalize properties to handle different field names
+        wkr_nr, wkr_name = self._normalize_properties(properties)
+        return {
+            'wkr_nr': wkr_nr,
+            'wkr_name': wkr_name,
+            'land_name': properties.get('LAND_NAME', ''),
+            'land_code': properties.get('LAND_CODE', land_code)
+        }
+
+    @classmethod
+    def cell_cache_stats(cls):
+        """Return grid cache counters: interior-cell hits, boundary-cell fallbacks and misses."""
+        with cls._cell_lock:
+            return dict(cls._cell_stats)
+
+    @classmethod
+    def clear_cell_cache(cls):
+        with cls._cell_lock:
+            cls._cell_grids = weakref.WeakKeyDictionary()
+            cls._cell_stats = {'hits': 0, 'boundary': 0, 'misses': 0}
+
+    @classmethod
+    def _count_cell(cls, outcome):
+        with cls._cell_lock:
+            cls._cell_stats[outcome] += 1
+
+    def _cell_grid(self):
+        """
+        Return (cell_size, boundary_cells, cache) for this locator's indexes.
+
+        The boundary cells, those crossed by a federal or state boundary, are
+        computed on the first lookup (or by warm_up()) once per federal index
+        and cell size, so later lookups only test membership. Returns None
+        when WAHLKREIS_CELL_SIZE_DEGREES is 0.
+        """
+        cell_size = getattr(settings, 'WAHLKREIS_CELL_SIZE_DEGREES', 0.0005)
+        if not cell_size:
+            return None
+
+        grid = self._cell_grids.get(self.constituencies)
+        if grid is None or grid[0] != cell_size:
+            with self._cell_lock:
+                grid = self._cell_grids.get(self.constituencies)
+                if grid is None or grid[0] != cell_size:
+                    indexes = [self.constituencies, *self.state_constituencies.values()]
+                    flagged = np.unique(np.concatenate([index.boundary_cells(cell_size) for index in indexes]))
+                    cache = LRUCache(getattr(settings, 'WAHLKREIS_CELL_CACHE_SIZE', 100_000))
+                    grid = (cell_size, flagged, cache)
+                    self._cell_grids[self.constituencies] = grid
+        return grid
+
     def _locate_detailed(self, latitude, longitude):
         """
         Find both federal and state constituencies for given coordinates.
 
+        Results are cached per grid cell of WAHLKREIS_CELL_SIZE_DEGREES
+        (about 50 m). Cells crossed by a federal or state boundary are flagged
+        when the first lookup builds the grid and always use exact
+        point-in-polygon tests.
+        Every other cell lies wholly inside one federal and one state polygon,
+        or outside all of them, so the exact result of its first lookup is
+        cached for the whole cell and later lookups are a dict hit.
+
         Args:
             latitude: WGS84 latitude
             longitude: WGS84 longitude
@@ -395,25 +593,45 @@ class WahlkreisLocator:
             }
             or None if not found.
         """
+        grid = self._cell_grid()
+        if grid is None:
+            return self._locate_exact(latitude, longitude)
+
+        cell_size, flagged, cache = grid
+        cell = cell_key(math.floor(latitude / cell_size), math.floor(longitude / cell_size))
+        position = np.searchsorted(flagged, cell)
+        if position < len(flagged) and flagged[position] == cell:
+            self._count_cell('boundary')
+            return self._locate_exact(latitude, longitude)
+
+        cached = cache.get(cell)
+        if cached is None:
+            self._count_cell('misses')
+            cached = self._locate_exact(latitude, longitude)
+            cache.set(cell, cached, math.inf)
+        else:
+            self._count_cell('hits')
+
+        # Copies, so callers can't modify the shared cached result
+        return {
+            level: dict(result) if result else None
+            for level, result in cached.items()
+        }
+
+    def _locate_exact(self, latitude, longitude):
+        """
+        Find both federal and state constituencies with exact point-in-polygon tests.
+
+        Returns the same structure as _locate_detailed.
+        """
         from shapely.geometry import Point
-        from pyproj import Transformer
 
-        # Federal constituencies use WGS84 (no transformation needed)
+        # All boundaries are stored in WGS84, so one point serves both levels
         point = Point(longitude, latitude)
 
         # Find federal constituency
-        federal_result = None
-        for wkr_nr, wkr_name, land_name, geometry in self.constituencies:
-            if geometry.contains(point):
-                # Extract land_code from federal data (may need to map from land_name)
-                land_code = self._land_name_to_code(land_name)
-                federal_result = {
-                    'wkr_nr': wkr_nr,
-                    'wkr_name': wkr_name,
-                    'land_name': land_name,
-                    'land_code': land_code
-                }
-                break
+        feature = self.constituencies.find(point)
+        federal_result = self._federal_result(feature) if feature else None
 
         # Find state constituency if federal found
         state_result = None
@@ -421,29 +639,9 @@ class WahlkreisLocator:
             land_code = federal_result['land_code']
 
             if land_code in self.state_constituencies:
-                # Get the CRS for this state
-                state_crs = self.STATE_CRS.get(land_code, 'EPSG:4326')
-
-                # Transform coordinates if needed
-                if state_crs != 'EPSG:4326':
-                    # Transform from WGS84 to state CRS
-                    transformer = Transformer.from_crs('EPSG:4326', state_crs, always_xy=True)
-                    x, y = transformer.transform(longitude, latitude)
-                    state_point = Point(x, y)
-                else:
-                    # No transformation needed for WGS84
-                    state_point = point
-
-                # Check state constituencies with transformed coordinates
-                for wkr_nr, wkr_name, state_land_code, land_name, geometry in self.state_constituencies[land_code]:
-                    if geometry.contains(state_point):
-                        state_result = {
-                            'wkr_nr': wkr_nr,
-                            'wkr_name': wkr_name,
-                            'land_name': land_name,
-                            'land_code': state_land_code
-                        }
-                        break
+                feature = self.state_constituencies[land_code].find(point)
+                if feature:
+                    state_result = self._state_result(feature, land_code)
 
         return {
             'federal': federal_result,
@@ -474,3 +672,52 @@ class WahlkreisLocator:
             return result
 
         return None
+
+    def locate_many(self, coords):
+        """
+        Find federal and state constituencies for many coordinates at once.
+
+        Points are tested with vectorized STRtree queries and shapely predicates:
+        one pass over the federal index, then one pass per state for the points
+        that landed in that state. Boundaries are stored in WGS84, so no
+        per-state reprojection of the input is needed.
+
+        Args:
+            coords: Sequence of (latitude, longitude) pairs, or an (N, 2) array
+
+        Returns:
+            List aligned with the input order; each entry is what locate()
+            returns for that point (a dict with 'federal' and 'state', or None).
+        """
+        coords = np.asarray(coords, dtype=float).reshape(-1, 2)
+        points = shapely.points(coords[:, 1], coords[:, 0])
+
+        federal_positions = self.constituencies.find_many(points).tolist()
+
+        # Land code per point ('' outside Germany), computed once per matched district
+        land_codes = {
+            position: self._federal_result(self.constituencies[position])['land_code']
+            for position in set(federal_positions) - {-1}
+        }
+        point_land_codes = np.array([land_codes.get(position, '') for position in federal_positions])
+
+        state_results = [None] * len(points)
+        for state_code, index in self.state_constituencies.items():
+            in_state = np.flatnonzero(point_land_codes == state_code)
+            if not len(in_state):
+                continue
+            state_positions = index.find_many(points[in_state])
+            for point_index, state_position in zip(in_state.tolist(), state_positions.tolist()):
+                if state_position != -1:
+                    state_results[point_index] = self._state_result(index[state_position], state_code)
+
+        located = []
+        for point_index, position in enumerate(federal_positions):
+            if position == -1:
+                located.append(None)
+                continue
+            located.append({
+                'federal': self._federal_result(self.constituencies[position]),
+                'state': state_results[point_index],
+            })
+        return located
@@ -0,0 +1,401 @@
+# ABOUTME: Interchangeable geocoder backends used by AddressGeocoder.
+# ABOUTME: Public Nominatim (rate limited), self-hosted Nominatim, and an offline PLZ/street gazetteer.
+
+import asyncio
+import csv
+import logging
+import re
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import AsyncGenerator, Dict, Optional, Tuple
+
+import httpx
+import requests
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from .rate_limiting import SharedRateLimiter
+
+logger = logging.getLogger('letters.services')
+
+Coordinates = Tuple[float, float]
+
+# One httpx.AsyncClient per event loop, so async lookups reuse pooled connections.
+# Under ASGI that is one client per process; a client can't move between loops, and
+# async_to_sync runs each call on a fresh loop. Each client is closed when its loop
+# shuts down (see _client_lifetime), and entries of closed loops are then dropped.
+_async_clients: Dict[asyncio.AbstractEventLoop, Tuple[httpx.AsyncClient, AsyncGenerator]] = {}
+_async_clients_lock = threading.Lock()
+
+# What a backend lookup may raise: transport and HTTP errors (requests'
+# exceptions are OSErrors), unreadable payloads and a missing or broken gazetteer file
+LOOKUP_ERRORS = (OSError, httpx.HTTPError, ValueError, KeyError, TypeError, csv.Error)
+# Errors worth retrying soon; HTTP errors count when the status is 5xx or 429
+TRANSIENT_LOOKUP_ERRORS = (
+    TimeoutError,
+    ConnectionError,
+    requests.Timeout,
+    requests.ConnectionError,
+    httpx.TimeoutException,
+    httpx.NetworkError,
+)
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Whether a lookup error is a timeout, connection failure, 5xx or rate-limit response."""
+    if isinstance(error, TRANSIENT_LOOKUP_ERRORS):
+        return True
+    response = getattr(error, 'response', None)
+    status_code = getattr(response, 'status_code', None)
+    return status_code is not None and (status_code >= 500 or status_code == 429)
+
+
+async def _client_lifetime(client: httpx.AsyncClient) -> AsyncGenerator[None, None]:
+    """
+    Close the client when its event loop shuts down.
+
+    The loop finalizes its pending async generators before closing
+    (asyncio.run, and so uvicorn and async_to_sync, call shutdown_asyncgens),
+    which runs the finally block while the client's connections can still
+    be closed on the loop that opened them.
+    """
+    try:
+        yield
+    finally:
+        await client.aclose()
+
+
+async def get_async_client() -> httpx.AsyncClient:
+    """Return the shared AsyncClient for the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _async_clients_lock:
+        for stale in [other for other in _async_clients if other.is_closed()]:
+            del _async_clients[stale]
+        client, replaced_lifetime = _async_clients.get(loop, (None, None))
+        if client is not None and not client.is_closed:
+            return client
+        client = httpx.AsyncClient()
+        lifetime = _client_lifetime(client)
+        # The entry keeps the generator alive; the loop only holds it weakly
+        _async_clients[loop] = (client, lifetime)
+    if replaced_lifetime is not None:
+        await replaced_lifetime.aclose()
+    await lifetime.__anext__()
+    return client
+
+
+class GeocoderBackend:
+    """
+    Base class for geocoder backends.
+
+    Subclasses implement ``lookup`` and return ``(latitude, longitude)`` or
+    None when the address is unknown; transport errors are raised.
+    ``rate_limit_seconds`` is the minimum spacing between two lookups made
+    through any instance of the backend, in any thread or worker process.
+    """
+
+    name = 'base'
+    rate_limit_seconds = 0.0
+    # Whether AddressGeocoder should persist results in GeocodeCache
+    cacheable = True
+
+    def __init__(self):
+        # Web requests fail fast instead of queueing behind a long backlog;
+        # geocode_worker sets this to None and waits as long as it takes
+        self.max_wait = getattr(settings, 'GEOCODER_RATE_LIMIT_MAX_WAIT', 10.0)
+
+    @property
+    def rate_limiter(self) -> Optional[SharedRateLimiter]:
+        """The limiter shared by every instance of this backend on the host, or None if unlimited."""
+        if self.rate_limit_seconds <= 0:
+            return None
+        return SharedRateLimiter(
+            self.name,
+            self.rate_limit_seconds,
+            burst=getattr(settings, 'GEOCODER_RATE_LIMIT_BURST', 1),
+        )
+
+    def wait(self) -> None:
+        """
+        Sleep until the next lookup is allowed by the rate limit.
+
+        Raises:
+            RateLimitExceeded if that is more than ``max_wait`` seconds away
+        """
+        limiter = self.rate_limiter
+        if limiter is not None:
+            limiter.acquire(self.max_wait)
+
+    async def wait_async(self) -> None:
+        """Like ``wait``, but sleeps without blocking the event loop."""
+        limiter = self.rate_limiter
+        if limiter is not None:
+            await limiter.acquire_async(self.max_wait)
+
+    def lookup(self, address: str, country: str) -> Optional[Coordinates]:
+        raise NotImplementedError
+
+    def lookup_structured(
+        self,
+        street: str,
+        postal_code: str,
+        city: str,
+        country: str
+    ) -> Optional[Coordinates]:
+        """Look up an address given as separate parts; defaults to a free-form lookup."""
+        return self.lookup(format_address(street, postal_code, city), country)
+
+    async def lookup_structured_async(
+        self,
+        street: str,
+        postal_code: str,
+        city: str,
+        country: str
+    ) -> Optional[Coordinates]:
+        """Async ``lookup_structured``; defaults to running it in a worker thread."""
+        return await asyncio.to_thread(self.lookup_structured, street, postal_code, city, country)
+
+
+class NominatimBackend(GeocoderBackend):
+    """Public OpenStreetMap Nominatim API, limited to 1 request/second by its usage policy."""
+
+    name = 'nominatim'
+    ENDPOINT = 'https://nominatim.openstreetmap.org/search'
+    USER_AGENT = 'WriteThem.eu/0.1 (civic engagement platform)'
+    rate_limit_seconds = 1.0
+    timeout = 10
+
+    def __init__(self, endpoint: Optional[str] = None):
+        super().__init__()
+        self.endpoint = endpoint or self.ENDPOINT
+
+    def lookup(self, address: str, country: str) -> Optional[Coordinates]:
+        """
+        Query Nominatim for address coordinates.
+
+        Raises:
+            requests.RequestException on API errors
+        """
+        return self._search({'q': address}, country)
+
+    def lookup_structured(
+        self,
+        street: str,
+        postal_code: str,
+        city: str,
+        country: str
+    ) -> Optional[Coordinates]:
+        """
+        Query Nominatim's structured search, which matches each part against
+        the corresponding OSM field instead of parsing a free-form string.
+
+        Raises:
+            requests.RequestException on API errors
+        """
+        return self._search(self._structured_query(street, postal_code, city), country)
+
+    async def lookup_structured_async(
+        self,
+        street: str,
+        postal_code: str,
+        city: str,
+        country: str
+    ) -> Optional[Coordinates]:
+        """
+        Structured search with an async HTTP client, so waiting on Nominatim
+        does not hold a thread.
+
+        Raises:
+            httpx.HTTPError on API errors
+        """
+        client = await get_async_client()
+        response = await client.get(
+            self.endpoint,
+            params=self._params(self._structured_query(street, postal_code, city), country),
+            headers={'User-Agent': self.USER_AGENT},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return self._first_result(response.json())
+
+    @staticmethod
+    def _structured_query(street: str, postal_code: str, city: str) -> Dict[str, str]:
+        return {
+            key: value
+            for key, value in (('street', street), ('postalcode', postal_code), ('city', city))
+            if value
+        }
+
+    @staticmethod
+    def _params(query: Dict[str, str], country: str) -> Dict[str, object]:
+        return {
+            **query,
+            'format': 'json',
+            'addressdetails': 1,
+            'limit': 1,
+            'countrycodes': country.lower(),
+        }
+
+    @staticmethod
+    def _first_result(results) -> Optional[Coordinates]:
+        if results and len(results) > 0:
+            result = results[0]
+            return float(result['lat']), float(result['lon'])
+
+        return None
+
+    def _search(self, query: Dict[str, str], country: str) -> Optional[Coordinates]:
+        headers = {
+            'User-Agent': self.USER_AGENT
+        }
+
+        response = requests.get(
+            self.endpoint,
+            params=self._params(query, country),
+            headers=headers,
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+
+        return self._first_result(response.json())
+
+
+class SelfHostedNominatimBackend(NominatimBackend):
+    """Our own Nominatim instance: same API, no usage-policy rate limit."""
+
+    name = 'nominatim-self-hosted'
+    rate_limit_seconds = 0.0
+
+    def __init__(self, endpoint: Optional[str] = None):
+        endpoint = endpoint or getattr(settings, 'GEOCODER_NOMINATIM_URL', None)
+        if not endpoint:
+            raise ImproperlyConfigured(
+                'GEOCODER_NOMINATIM_URL must be set to use the self-hosted Nominatim backend'
+            )
+        super().__init__(endpoint)
+
+
+POSTAL_CODE_RE = re.compile(r'\b(\d{5})\b')
+HOUSE_NUMBER_RE = re.compile(r'\s+\d+\s*[a-zA-Z]?(\s*[-/]\s*\d+\s*[a-zA-Z]?)?$')
+
+
+def format_address(street: str, postal_code: str, city: str) -> str:
+    """Join address parts as "Street 1, 12345 City", skipping empty parts."""
+    locality = ' '.join(part for part in (postal_code, city) if part)
+    return ', '.join(part for part in (street, locality) if part)
+
+
+def _normalize_street(street: str) -> str:
+    street = ' '.join((street or '').casefold().split())
+    street = HOUSE_NUMBER_RE.sub('', street)
+    street = re.sub(r'str\.?$', 'straße', street)
+    return street.replace('strasse', 'straße')
+
+
+@lru_cache(maxsize=4)
+def _load_gazetteer(path: str, mtime_ns: int) -> Dict[Tuple[str, str], Coordinates]:
+    """Parse a gazetteer CSV once per file version (``mtime_ns`` is part of the cache key)."""
+    entries: Dict[Tuple[str, str], Coordinates] = {}
+    with open(path, newline='', encoding='utf-8') as csv_file:
+        for row in csv.DictReader(csv_file):
+            postal_code = (row.get('postal_code') or '').strip()
+            if not postal_code:
+                continue
+            try:
+                coordinates = (float(row['latitude']), float(row['longitude']))
+            except (KeyError, TypeError, ValueError):
+                continue
+            entries[(postal_code, _normalize_street(row.get('street', '')))] = coordinates
+
+    logger.info('Loaded %s gazetteer entries from %s', len(entries), path)
+    return entries
+
+
+class LocalGazetteerBackend(GeocoderBackend):
+    """
+    Offline lookup of street and postal-code centroids from a local CSV file.
+
+    The CSV needs ``postal_code``, ``latitude`` and ``longitude`` columns and
+    an optional ``street`` column. Rows with a street give street centroids
+    within a postal code, rows without one give the postal code centroid.
+    A lookup tries the street first and falls back to the postal code. Such
+    files can be exported from an OSM extract or taken from a PLZ centroid
+    list.
+
+    Lookups are in-memory dictionary hits, so results are not written to
+    GeocodeCache. This also keeps offline misses out of the cache that the
+    Nominatim backends share.
+    """
+
+    name = 'local'
+    cacheable = False
+
+    def __init__(self, path: Optional[str] = None):
+        super().__init__()
+        path = path or getattr(settings, 'GEOCODER_GAZETTEER_PATH', None)
+        if not path:
+            raise ImproperlyConfigured(
+                'GEOCODER_GAZETTEER_PATH must be set to use the local gazetteer backend'
+            )
+        self.path = Path(path)
+
+    @property
+    def entries(self) -> Dict[Tuple[str, str], Coordinates]:
+        if not self.path.exists():
+            raise FileNotFoundError(f'Gazetteer file not found at {self.path}')
+        return _load_gazetteer(str(self.path), self.path.stat().st_mtime_ns)
+
+    def lookup(self, address: str, country: str) -> Optional[Coordinates]:
+        if country.upper() != 'DE':
+            return None
+
+        match = POSTAL_CODE_RE.search(address)
+        if not match:
+            return None
+        postal_code = match.group(1)
+
+        # "Street 1, 12345 City": the street is the part before the postal code's segment
+        street = ''
+        before = address[:match.start()].rstrip(' ,')
+        if before:
+            street = before.split(',')[0]
+
+        return self._find(postal_code, street)
+
+    def lookup_structured(
+        self,
+        street: str,
+        postal_code: str,
+        city: str,
+        country: str
+    ) -> Optional[Coordinates]:
+        if country.upper() != 'DE' or not postal_code:
+            return None
+        return self._find(postal_code, street)
+
+    def _find(self, postal_code: str, street: str) -> Optional[Coordinates]:
+        street = _normalize_street(street) if street else ''
+        entries = self.entries
+        if street and (postal_code, street) in entries:
+            return entries[(postal_code, street)]
+        return entries.get((postal_code, ''))
+
+
+GEOCODER_BACKENDS = {
+    NominatimBackend.name: NominatimBackend,
+    SelfHostedNominatimBackend.name: SelfHostedNominatimBackend,
+    LocalGazetteerBackend.name: LocalGazetteerBackend,
+}
+
+
+def get_geocoder_backend(name: Optional[str] = None) -> GeocoderBackend:
+    """Instantiate the backend named by ``name`` or ``settings.GEOCODER_BACKEND``."""
+    name = name or getattr(settings, 'GEOCODER_BACKEND', NominatimBackend.name)
+    try:
+        backend_class = GEOCODER_BACKENDS[name]
+    except KeyError:
+        raise ImproperlyConfigured(
+            f"Unknown GEOCODER_BACKEND '{name}'; choose one of {', '.join(GEOCODER_BACKENDS)}"
+        )
+    return backend_class()
@@ -0,0 +1,196 @@
+# ABOUTME: Tiered cache for geocoding results: in-process LRU, optional Django cache, then GeocodeCache.
+# ABOUTME: Keeps repeat lookups off the database and shares results across workers when configured.
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+from ..models import GeocodeCache
+
+logger = logging.getLogger('letters.services')
+
+GeocodeResult = Tuple[Optional[float], Optional[float], bool, Optional[str]]
+
+
+class LRUCache:
+    """Thread-safe, size-bounded LRU mapping whose entries expire after a per-entry TTL."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[str, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        if self.maxsize <= 0 or ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class GeocodeResultCache:
+    """
+    Look up geocoding results tier by tier, promoting hits to faster tiers.
+
+    Tiers, fastest first:
+    - ``memory``: per-process LRU (GEOCODE_MEMORY_CACHE_SIZE entries)
+    - ``shared``: Django cache alias named by GEOCODE_SHARED_CACHE_ALIAS,
+      skipped when unset
+    - ``database``: the GeocodeCache table, the source of truth
+
+    Failed lookups expire from the memory and shared tiers after
+    GEOCODE_NEGATIVE_CACHE_TTL, sooner than successful ones
+    (GEOCODE_CACHE_TTL), and never outlive their GeocodeCache.retry_after.
+    A database row whose retry_after has passed counts as a miss.
+    """
+
+    TIERS = ('memory', 'shared', 'database')
+    # Shared entries are (result, retry_after) pairs
+    KEY_PREFIX = 'geocode:v2:'
+
+    _memory: Optional[LRUCache] = None
+    _stats: Dict[str, Dict[str, int]] = {tier: {'hits': 0, 'misses': 0} for tier in TIERS}
+    _lock = threading.Lock()
+
+    @classmethod
+    def _memory_tier(cls) -> LRUCache:
+        if cls._memory is None:
+            with cls._lock:
+                if cls._memory is None:
+                    cls._memory = LRUCache(getattr(settings, 'GEOCODE_MEMORY_CACHE_SIZE', 2048))
+        return cls._memory
+
+    @staticmethod
+    def _shared_tier():
+        alias = getattr(settings, 'GEOCODE_SHARED_CACHE_ALIAS', None)
+        return caches[alias] if alias else None
+
+    @staticmethod
+    def _ttl(result: GeocodeResult, retry_after: Optional[datetime] = None) -> int:
+        if result[2]:
+            return getattr(settings, 'GEOCODE_CACHE_TTL', 24 * 60 * 60)
+        ttl = getattr(settings, 'GEOCODE_NEGATIVE_CACHE_TTL', 5 * 60)
+        if retry_after is not None:
+            # Never keep a failure in a fast tier past its scheduled retry
+            ttl = min(ttl, int((retry_after - timezone.now()).total_seconds()))
+        return ttl
+
+    @classmethod
+    def _count(cls, tier: str, hit: bool) -> None:
+        with cls._lock:
+            cls._stats[tier]['hits' if hit else 'misses'] += 1
+
+    @classmethod
+    def get(cls, address_hash: str) -> Optional[GeocodeResult]:
+        """Return the cached result for an address hash, or None on a miss in every tier."""
+        result = cls._memory_tier().get(address_hash)
+        cls._count('memory', result is not None)
+        if result is not None:
+            return result
+
+        shared = cls._shared_tier()
+        if shared is not None:
+            entry = shared.get(cls.KEY_PREFIX + address_hash)
+            ttl = cls._ttl(tuple(entry[0]), entry[1]) if entry is not None else 0
+            cls._count('shared', ttl > 0)
+            if ttl > 0:
+                result = tuple(entry[0])
+                cls._memory_tier().set(address_hash, result, ttl)
+                return result
+
+        try:
+            entry = GeocodeCache.objects.get(address_hash=address_hash)
+        except GeocodeCache.DoesNotExist:
+            cls._count('database', False)
+            return None
+
+        if entry.is_retryable:
+            # Expired negative entry: report a miss so the caller geocodes again
+            cls._count('database', False)
+            return None
+
+        cls._count('database', True)
+        if entry.success:
+            result = (entry.latitude, entry.longitude, True, None)
+        else:
+            result = (None, None, False, entry.error_message)
+        cls._promote(address_hash, result, entry.retry_after)
+        return result
+
+    @classmethod
+    def set(cls, address_hash: str, result: GeocodeResult, defaults: Dict[str, Any]) -> None:
+        """Persist a result in GeocodeCache and populate the faster tiers."""
+        GeocodeCache.objects.update_or_create(address_hash=address_hash, defaults=defaults)
+        cls._promote(address_hash, result, defaults.get('retry_after'))
+
+    @classmethod
+    def _promote(cls, address_hash: str, result: GeocodeResult, retry_after: Optional[datetime] = None) -> None:
+        ttl = cls._ttl(result, retry_after)
+        if ttl <= 0:
+            return
+        cls._memory_tier().set(address_hash, result, ttl)
+        shared = cls._shared_tier()
+        if shared is not None:
+            shared.set(cls.KEY_PREFIX + address_hash, (result, retry_after), ttl)
+
+    @classmethod
+    def invalidate(cls, address_hash: str) -> None:
+        """Drop an address from the memory and shared tiers (e.g. after a direct DB edit)."""
+        cls._memory_tier().delete(address_hash)
+        shared = cls._shared_tier()
+        if shared is not None:
+            shared.delete(cls.KEY_PREFIX + address_hash)
+
+    @classmethod
+    def stats(cls) -> Dict[str, Dict[str, Any]]:
+        """Return hit/miss counters and hit rate per tier."""
+        with cls._lock:
+            stats = {tier: dict(counters) for tier, counters in cls._stats.items()}
+        report = {}
+        for tier, counters in stats.items():
+            total = counters['hits'] + counters['misses']
+            report[tier] = {
+                **counters,
+                'hit_rate': counters['hits'] / total if total else 0.0,
+            }
+        report['memory']['size'] = len(cls._memory_tier())
+        return report
+
+    @classmethod
+    def clear(cls) -> None:
+        """Empty the in-process tier and reset counters (mainly for tests)."""
+        with cls._lock:
+            cls._memory = None
+            cls._stats = {tier: {'hits': 0, 'misses': 0} for tier in cls.TIERS}
@@ -0,0 +1,222 @@
+# ABOUTME: Database-backed geocoding queue so web requests never block on Nominatim rate limits.
+# ABOUTME: Requests enqueue addresses as GeocodeJob rows; the geocode_worker command drains them.
+
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from ..models import GeocodeCache, GeocodeJob
+from .geocoding import AddressGeocoder
+from .geocoding_backends import GeocoderBackend
+
+logger = logging.getLogger('letters.services')
+
+
+class GeocodeQueue:
+    """
+    Enqueue addresses for geocoding and process them in a separate worker.
+
+    Identical addresses (same GeocodeCache key) that are still pending share
+    one job, so a burst of requests for the same address costs a single
+    Nominatim call. Addresses already in GeocodeCache are answered
+    immediately with a finished job, without touching the queue.
+    """
+
+    ACTIVE_STATUSES = ('PENDING', 'RUNNING')
+
+    # A RUNNING job older than this is assumed to belong to a dead worker
+    STALE_AFTER = timedelta(minutes=5)
+    # Transient failures (timeouts, 5xx) are retried until a job has made this many attempts
+    MAX_ATTEMPTS = 3
+    USER_QUOTA_KEY_PREFIX = 'geocode-job-quota:'
+
+    @classmethod
+    def enqueue(cls, address: str, country: str = 'DE') -> GeocodeJob:
+        """Return a job handle for the address, reusing a pending job or cached result."""
+        address = (address or '').strip()
+        country = (country or 'DE').upper()
+        geocoder = AddressGeocoder()
+        address_hash = geocoder._generate_cache_key(address, country)
+
+        existing = GeocodeJob.objects.filter(
+            address_hash=address_hash,
+            status__in=cls.ACTIVE_STATUSES,
+        ).first()
+        if existing is not None:
+            return existing
+
+        job = GeocodeJob(address_hash=address_hash, address=address, country=country)
+
+        cached = geocoder._get_from_cache(address_hash) if address else None
+        if not address or cached is not None:
+            latitude, longitude, success, error = cached or (None, None, False, 'Address is required')
+            cls._finish(job, latitude, longitude, success, error)
+            job.save()
+            return job
+
+        job.save()
+        return job
+
+    @staticmethod
+    def worker_geocoder(backend: Optional[GeocoderBackend] = None) -> AddressGeocoder:
+        """An AddressGeocoder that waits for its rate-limit slot however long the backlog is."""
+        geocoder = AddressGeocoder(backend=backend)
+        geocoder.backend.max_wait = None
+        return geocoder
+
+    @classmethod
+    def allow_user_enqueue(cls, user_id) -> bool:
+        """
+        Count one enqueue against a user's quota; return False once it is used up.
+
+        Each user may enqueue GEOCODE_JOB_USER_LIMIT addresses per
+        GEOCODE_JOB_USER_WINDOW seconds, so a single account cannot fill the
+        queue that shares the Nominatim budget. Counters live in the default
+        Django cache.
+        """
+        cache = caches['default']
+        window = getattr(settings, 'GEOCODE_JOB_USER_WINDOW', 60 * 60)
+        key = f'{cls.USER_QUOTA_KEY_PREFIX}{user_id}'
+        cache.add(key, 0, window)
+        try:
+            count = cache.incr(key)
+        except ValueError:
+            # The window expired between add() and incr(); start a new one
+            cache.set(key, 1, window)
+            count = 1
+        return count <= getattr(settings, 'GEOCODE_JOB_USER_LIMIT', 20)
+
+    @classmethod
+    def get(cls, token) -> Optional[GeocodeJob]:
+        return GeocodeJob.objects.filter(token=token).first()
+
+    @classmethod
+    def claim_next(cls) -> Optional[GeocodeJob]:
+        """
+        Atomically mark the oldest pending job as RUNNING and return it.
+
+        Jobs waiting out a retry backoff (next_attempt_at in the future) are
+        skipped. The conditional UPDATE guarantees that two workers never
+        claim the same job, without relying on SELECT ... FOR UPDATE
+        (unsupported by SQLite).
+        """
+        cls._requeue_stale()
+
+        while True:
+            job = GeocodeJob.objects.filter(
+                Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=timezone.now()),
+                status='PENDING',
+            ).order_by('created_at', 'pk').first()
+            if job is None:
+                return None
+
+            now = timezone.now()
+            claimed = GeocodeJob.objects.filter(pk=job.pk, status='PENDING').update(
+                status='RUNNING',
+                started_at=now,
+                updated_at=now,
+            )
+            if claimed:
+                job.refresh_from_db()
+                return job
+            # Lost the race to another worker; try the next job
+
+    @classmethod
+    def _requeue_stale(cls) -> None:
+        cutoff = timezone.now() - cls.STALE_AFTER
+        requeued = GeocodeJob.objects.filter(
+            status='RUNNING',
+            started_at__lt=cutoff,
+        ).update(status='PENDING', started_at=None)
+        if requeued:
+            logger.warning('Requeued %s stale geocode jobs', requeued)
+
+    @classmethod
+    def process_next(cls, geocoder: Optional[AddressGeocoder] = None) -> Optional[GeocodeJob]:
+        """
+        Geocode one queued job and return it, or None if the queue is empty.
+
+        The geocoder applies the backend's shared rate limit, so any number
+        of workers together drain the queue at the allowed rate. A transient
+        failure puts the job back in the queue until the GeocodeCache entry's
+        retry_after (exponential backoff), up to MAX_ATTEMPTS attempts.
+        """
+        job = cls.claim_next()
+        if job is None:
+            return None
+
+        geocoder = geocoder or cls.worker_geocoder()
+        job.attempts += 1
+
+        latitude, longitude, success, error = geocoder.geocode(job.address, job.country)
+
+        retry_at = None if success else cls._transient_retry_at(job)
+        if retry_at is not None and job.attempts < cls.MAX_ATTEMPTS:
+            logger.info('Geocode job %s failed transiently, retrying at %s', job.token, retry_at)
+            job.status = 'PENDING'
+            job.started_at = None
+            job.next_attempt_at = retry_at
+            job.error_message = error or ''
+            job.save()
+            return job
+
+        with transaction.atomic():
+            cls._finish(job, latitude, longitude, success, error)
+            job.save()
+
+            # Jobs enqueued for the same address while this one was running
+            duplicates = GeocodeJob.objects.filter(
+                address_hash=job.address_hash,
+                status='PENDING',
+            ).exclude(pk=job.pk)
+            for duplicate in duplicates:
+                cls._finish(duplicate, latitude, longitude, success, error)
+                duplicate.save()
+
+        return job
+
+    @staticmethod
+    def _transient_retry_at(job: GeocodeJob) -> Optional[datetime]:
+        """When a failed lookup may be retried, if AddressGeocoder recorded it as transient, else None."""
+        retry_after = list(
+            GeocodeCache.objects.filter(
+                address_hash=job.address_hash,
+                success=False,
+                failure_kind='TRANSIENT',
+            ).values_list('retry_after', flat=True)[:1]
+        )
+        if not retry_after:
+            return None
+        return retry_after[0] or timezone.now()
+
+    @classmethod
+    def drain(cls, geocoder: Optional[AddressGeocoder] = None, max_jobs: Optional[int] = None) -> int:
+        """Process queued jobs until the queue is empty; return how many were processed."""
+        geocoder = geocoder or cls.worker_geocoder()
+        processed = 0
+        while max_jobs is None or processed < max_jobs:
+            if cls.process_next(geocoder) is None:
+                break
+            processed += 1
+        return processed
+
+    @staticmethod
+    def _finish(
+        job: GeocodeJob,
+        latitude: Optional[float],
+        longitude: Optional[float],
+        success: bool,
+        error: Optional[str],
+    ) -> None:
+        job.status = 'DONE' if success else 'FAILED'
+        job.latitude = latitude
+        job.longitude = longitude
+        job.error_message = '' if success else (error or '')
+        job.next_attempt_at = None
+        job.finished_at = timezone.now()
@@ -44,7 +44,7 @@ class IdentityVerificationService:
 
         if street and postal_code and city:
             resolver = WahlkreisResolver()
-            wahlkreis_result = resolver.resolve(street, postal_code, city, country)
+            wahlkreis_result = resolver.resolve_structured(street, postal_code, city, country)
 
             federal_wahlkreis_number = wahlkreis_result['federal_wahlkreis_number']
             state_wahlkreis_number = wahlkreis_result['state_wahlkreis_number']
@@ -0,0 +1,95 @@
+# ABOUTME: Timing spans for the address resolution pipeline, emitted to logging and pluggable metrics sinks.
+# ABOUTME: settings.INSTRUMENTATION_SINK names a global sink; SpanRecorder collects spans for benchmarks and tests.
+
+import logging
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger('letters.services')
+
+# A sink is called as sink(name, seconds, tags) for every finished span
+Sink = Callable[[str, float, Dict[str, object]], None]
+
+_sinks: List[Sink] = []
+
+
+def add_sink(sink: Sink) -> None:
+    """Send every span to ``sink`` in addition to the configured one."""
+    _sinks.append(sink)
+
+
+def remove_sink(sink: Sink) -> None:
+    if sink in _sinks:
+        _sinks.remove(sink)
+
+
+@lru_cache(maxsize=None)
+def _import_sink(path: str) -> Sink:
+    return import_string(path)
+
+
+def _configured_sink() -> Optional[Sink]:
+    path = getattr(settings, 'INSTRUMENTATION_SINK', None)
+    return _import_sink(path) if path else None
+
+
+def record(name: str, seconds: float, tags: Optional[Dict[str, object]] = None) -> None:
+    """Report one finished stage; a failing sink is logged, never raised to the caller."""
+    tags = tags or {}
+    logger.debug('%s took %.2f ms %s', name, seconds * 1000, tags or '')
+
+    sinks = list(_sinks)
+    configured = _configured_sink()
+    if configured is not None:
+        sinks.append(configured)
+    for sink in sinks:
+        try:
+            sink(name, seconds, tags)
+        except Exception:
+            logger.exception('Metrics sink %r failed for span %s', sink, name)
+
+
+@contextmanager
+def span(name: str, **tags):
+    """
+    Time the enclosed block as stage ``name``.
+
+    The span is recorded even when the block raises, so slow failures
+    (timeouts, rate-limit rejections) show up in the timings too.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start, tags)
+
+
+class SpanRecorder:
+    """
+    Sink that keeps every span duration in memory, grouped by name.
+
+    Use as a context manager to attach it for the duration of a block:
+
+        with SpanRecorder() as recorder:
+            WahlkreisResolver().resolve(address)
+        recorder.durations['geocode.http']
+    """
+
+    def __init__(self):
+        self.durations: Dict[str, List[float]] = defaultdict(list)
+
+    def __call__(self, name: str, seconds: float, tags: Dict[str, object]) -> None:
+        self.durations[name].append(seconds)
+
+    def __enter__(self) -> 'SpanRecorder':
+        add_sink(self)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        remove_sink(self)
@@ -0,0 +1,146 @@
+# ABOUTME: Builds the PostalCodeWahlkreis table from postal code areas or sampled postal code points.
+# ABOUTME: Flags postal codes that span several federal or state Wahlkreise as ambiguous.
+
+import logging
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import shapely
+from django.db import transaction
+
+from ..geo import BoundaryIndex
+from ..models import PostalCodeWahlkreis
+from .geocoding import WahlkreisLocator
+
+logger = logging.getLogger('letters.services')
+
+POSTAL_CODE_PROPERTIES = ('plz', 'PLZ', 'postcode', 'postal_code', 'plz5')
+
+
+class PostalCodeWahlkreisBuilder:
+    """
+    Compute postal code → Wahlkreis mappings against the loaded boundaries.
+
+    A postal code maps to the Wahlkreis that holds the largest share of its
+    area (or of its sample points). The mapping is ambiguous when that share
+    is below ``1 - tolerance``, or, for sample points, when fewer than
+    ``min_samples`` points fall inside a Wahlkreis; ambiguous postal codes
+    are still stored so callers know to geocode the full address instead.
+    """
+
+    def __init__(
+        self,
+        locator: Optional[WahlkreisLocator] = None,
+        tolerance: float = 0.01,
+        min_samples: int = 3,
+    ):
+        self.locator = locator or WahlkreisLocator()
+        self.tolerance = tolerance
+        self.min_samples = min_samples
+
+    def _is_ambiguous(self, share: float) -> bool:
+        return share < 1 - self.tolerance
+
+    @staticmethod
+    def _area_shares(index: BoundaryIndex, area) -> List[Tuple[int, float]]:
+        """Return (feature position, share of the area) for features overlapping the area, largest first."""
+        positions = index.tree.query(area, predicate='intersects')
+        if not len(positions) or area.area == 0:
+            return []
+        overlaps = shapely.area(shapely.intersection(index.tree.geometries[positions], area)) / area.area
+        return sorted(zip(positions.tolist(), overlaps.tolist()), key=lambda item: -item[1])
+
+    def build_from_areas(self, areas: Dict[str, object]) -> List[PostalCodeWahlkreis]:
+        """Map postal code polygons ``{postal_code: WGS84 geometry}`` by area overlap."""
+        mappings = []
+        for postal_code, area in areas.items():
+            federal_shares = self._area_shares(self.locator.constituencies, area)
+            if not federal_shares:
+                continue
+            position, share = federal_shares[0]
+            federal = self.locator._federal_result(self.locator.constituencies[position])
+            mapping = self._mapping(postal_code, federal, share, source='AREAS')
+
+            state_index = self.locator.state_constituencies.get(federal['land_code'])
+            if state_index is not None:
+                state_shares = self._area_shares(state_index, area)
+                if state_shares:
+                    state_position, state_share = state_shares[0]
+                    state = self.locator._state_result(state_index[state_position], federal['land_code'])
+                    mapping.state_wkr_nr = state['wkr_nr']
+                    mapping.state_wkr_name = state['wkr_name'] or ''
+                    mapping.state_ambiguous = self._is_ambiguous(state_share)
+            mappings.append(mapping)
+        return mappings
+
+    def build_from_points(self, points: Iterable[Tuple[str, float, float]]) -> List[PostalCodeWahlkreis]:
+        """
+        Map postal codes from sampled ``(postal_code, latitude, longitude)`` points by majority.
+
+        A handful of points says little about the rest of the postal code, so
+        one with fewer than ``min_samples`` located points is always ambiguous.
+        """
+        points = list(points)
+        located = self.locator.locate_many([(latitude, longitude) for _, latitude, longitude in points])
+
+        by_postal_code: Dict[str, List[dict]] = defaultdict(list)
+        for (postal_code, _, _), result in zip(points, located):
+            if result is not None:
+                by_postal_code[postal_code].append(result)
+
+        mappings = []
+        for postal_code, results in by_postal_code.items():
+            undersampled = len(results) < self.min_samples
+            federal_counts = Counter(result['federal']['wkr_nr'] for result in results)
+            wkr_nr, count = federal_counts.most_common(1)[0]
+            federal = next(result['federal'] for result in results if result['federal']['wkr_nr'] == wkr_nr)
+            mapping = self._mapping(postal_code, federal, count / len(results), source='POINTS')
+            mapping.federal_ambiguous = mapping.federal_ambiguous or undersampled
+
+            states = [result['state'] for result in results if result['state']]
+            if states:
+                state_counts = Counter(state['wkr_nr'] for state in states)
+                state_wkr_nr, state_count = state_counts.most_common(1)[0]
+                state = next(state for state in states if state['wkr_nr'] == state_wkr_nr)
+                mapping.state_wkr_nr = state_wkr_nr
+                mapping.state_wkr_name = state['wkr_name'] or ''
+                mapping.state_ambiguous = undersampled or self._is_ambiguous(state_count / len(results))
+            mappings.append(mapping)
+        return mappings
+
+    def _mapping(self, postal_code: str, federal: dict, share: float, source: str) -> PostalCodeWahlkreis:
+        return PostalCodeWahlkreis(
+            postal_code=postal_code,
+            federal_wkr_nr=federal['wkr_nr'],
+            federal_wkr_name=federal['wkr_name'] or '',
+            land_name=federal['land_name'] or '',
+            land_code=federal['land_code'] or '',
+            federal_ambiguous=self._is_ambiguous(share),
+            coverage=share,
+            source=source,
+        )
+
+    @staticmethod
+    def load_areas(path) -> Dict[str, object]:
+        """Read postal code polygons from GeoJSON, merging multi-part postal codes."""
+        index = BoundaryIndex.from_geojson(path, simplify_tolerance=0)
+        parts: Dict[str, list] = defaultdict(list)
+        for feature in index:
+            postal_code = next(
+                (str(feature.properties[key]).zfill(5) for key in POSTAL_CODE_PROPERTIES
+                 if feature.properties.get(key)),
+                None
+            )
+            if postal_code:
+                parts[postal_code].append(feature.geometry)
+        return {
+            postal_code: geometries[0] if len(geometries) == 1 else shapely.union_all(geometries)
+            for postal_code, geometries in parts.items()
+        }
+
+    @staticmethod
+    @transaction.atomic
+    def replace_table(mappings: List[PostalCodeWahlkreis]) -> None:
+        PostalCodeWahlkreis.objects.all().delete()
+        PostalCodeWahlkreis.objects.bulk_create(mappings, batch_size=1000)
+        logger.info('Stored %s postal code mappings', len(mappings))
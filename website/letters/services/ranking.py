@@ -0,0 +1,324 @@
+# ABOUTME: BM25 ranking over TopicArea and Committee texts with precomputed IDF and per-term document weights.
+# ABOUTME: The index is serialized to a JSON artifact on taxonomy and sync loads so workers load it instead of rebuilding.
+
+import json
+import logging
+import math
+import os
+import tempfile
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Count, Max
+
+from ..models import Committee, TopicArea
+from .text_analysis import get_analyzer
+from .versioning import VersionedSnapshot, bump_data_version
+
+logger = logging.getLogger('letters.services')
+
+
+class BM25Index:
+    """
+    Okapi BM25 over one collection of documents with name, keywords and description fields.
+
+    A term's frequency in a document adds up its occurrences weighted by
+    FIELD_WEIGHTS (as in BM25F), so a keyword hit counts twice a description
+    hit. Terms come from the text analyzer, plus the parts of compounds whose
+    parts occur elsewhere in the collection.
+
+    Everything that does not depend on the query is computed at build time:
+    each posting stores the finished BM25 contribution
+
+        idf(t) * tf * (K1 + 1) / (tf + K1 * (1 - B + B * dl / avgdl))
+
+    so scoring a query is a sum of dictionary lookups. IDF uses the
+    non-negative variant ln(1 + (N - df + 0.5) / (df + 0.5)).
+    """
+
+    K1 = 1.2
+    B = 0.75
+    FIELD_WEIGHTS = {'name': 3.0, 'keywords': 2.0, 'description': 1.0}
+    # Fields whose terms the substring fallback may match
+    FALLBACK_FIELDS = ('name', 'keywords')
+
+    def __init__(
+        self,
+        doc_ids: List[int],
+        postings: Dict[str, List[Tuple[int, float]]],
+        fallback_terms: Iterable[str],
+        average_length: float = 0.0,
+    ):
+        self.doc_ids = doc_ids
+        self.postings = postings
+        self.fallback_terms = sorted(fallback_terms)
+        self.average_length = average_length
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    @classmethod
+    def build(cls, documents: Iterable[Tuple[int, Dict[str, str]]]) -> 'BM25Index':
+        """Index ``(id, {field: text})`` pairs."""
+        analyzer = get_analyzer()
+        analyzed = [
+            (doc_id, [(field, analyzer.terms(text or '')) for field, text in fields.items()])
+            for doc_id, fields in documents
+        ]
+
+        # Whole-word terms first, so compounds can be split into parts used elsewhere
+        known_terms = {term for _, fields in analyzed for _, terms in fields for term in terms}
+
+        doc_ids: List[int] = []
+        frequencies: List[Dict[str, float]] = []
+        fallback_terms = set()
+        for doc_id, fields in analyzed:
+            frequency: Dict[str, float] = defaultdict(float)
+            for field, terms in fields:
+                weight = cls.FIELD_WEIGHTS.get(field, 1.0)
+                for term in terms:
+                    for indexed in [term] + analyzer.split_compound(term, known_terms):
+                        frequency[indexed] += weight
+                        if field in cls.FALLBACK_FIELDS:
+                            fallback_terms.add(indexed)
+            doc_ids.append(doc_id)
+            frequencies.append(frequency)
+
+        count = len(doc_ids)
+        lengths = [sum(frequency.values()) for frequency in frequencies]
+        average_length = sum(lengths) / count if count else 0.0
+        document_frequency = Counter(term for frequency in frequencies for term in frequency)
+
+        postings: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+        for position, frequency in enumerate(frequencies):
+            norm = cls.K1 * (1 - cls.B + cls.B * lengths[position] / average_length) if average_length else cls.K1
+            for term, tf in frequency.items():
+                df = document_frequency[term]
+                idf = math.log(1 + (count - df + 0.5) / (df + 0.5))
+                postings[term].append((position, idf * tf * (cls.K1 + 1) / (tf + norm)))
+
+        return cls(doc_ids, dict(postings), fallback_terms, average_length)
+
+    def score(self, query_terms: Dict[str, int]) -> Dict[int, float]:
+        """Return ``{doc_id: score}`` for documents containing any of the ``{term: count}`` query terms."""
+        scores: Dict[int, float] = defaultdict(float)
+        for term, count in query_terms.items():
+            for position, weight in self.postings.get(term, ()):
+                scores[position] += count * weight
+        return {self.doc_ids[position]: score for position, score in scores.items()}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'doc_ids': self.doc_ids,
+            'postings': self.postings,
+            'fallback_terms': self.fallback_terms,
+            'average_length': self.average_length,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'BM25Index':
+        return cls(data['doc_ids'], data['postings'], data['fallback_terms'], data['average_length'])
+
+
+class RankingIndex(VersionedSnapshot):
+    """
+    Process-level BM25 indexes for topics and committees.
+
+    ``rebuild()`` (run by load_topic_taxonomy and after representative syncs)
+    computes both indexes, writes them to settings.RANKING_INDEX_PATH and bumps
+    the 'ranking' data version. Other workers then load that artifact, which
+    takes milliseconds, instead of querying and analyzing every row.
+
+    The artifact records a fingerprint of the TopicArea and Committee tables
+    (row count, highest id, latest update) and the analyzer it was built
+    with. When either no longer matches, e.g. after a topic is edited in the
+    admin, the indexes are rebuilt from the database in memory. The check
+    runs when the data version changes (TopicArea and Committee signals bump
+    it) or after RANKING_INDEX_TTL seconds.
+    """
+
+    VERSION_KEY = 'ranking'
+    TTL_SETTING = 'RANKING_INDEX_TTL'
+    FORMAT = 'writethem-ranking'
+    FORMAT_VERSION = 1
+
+    _indexes: Dict[str, BM25Index] = {}
+    _topics: Dict[int, TopicArea] = {}
+    _fingerprint: Optional[List[Any]] = None
+
+    # ------------------------------------------------------------------
+    # Building and loading
+
+    @staticmethod
+    def fingerprint() -> List[Any]:
+        """Row count, highest id and latest update of the indexed tables, plus the analyzer in use."""
+        parts: List[Any] = [getattr(settings, 'TEXT_ANALYZER', None), getattr(get_analyzer(), 'VERSION', None)]
+        for model in (TopicArea, Committee):
+            stats = model.objects.aggregate(count=Count('id'), max_id=Max('id'), updated=Max('updated_at'))
+            updated = stats['updated'].isoformat() if stats['updated'] else None
+            parts.append([stats['count'], stats['max_id'], updated])
+        return parts
+
+    @staticmethod
+    def build_indexes() -> Dict[str, BM25Index]:
+        return {
+            'topic': BM25Index.build(
+                (topic.id, {'name': topic.name, 'keywords': topic.keywords, 'description': topic.description})
+                for topic in TopicArea.objects.all()
+            ),
+            'committee': BM25Index.build(
+                (committee.id, {
+                    'name': committee.name,
+                    'keywords': committee.keywords,
+                    'description': committee.description,
+                })
+                for committee in Committee.objects.all()
+            ),
+        }
+
+    @staticmethod
+    def artifact_path() -> Optional[Path]:
+        path = getattr(settings, 'RANKING_INDEX_PATH', None)
+        return Path(path) if path else None
+
+    @classmethod
+    def write_artifact(cls, path: Path, indexes: Dict[str, BM25Index], fingerprint: List[Any]) -> None:
+        """Write the artifact atomically, so workers never read a half-written file."""
+        payload = {
+            'format': cls.FORMAT,
+            'version': cls.FORMAT_VERSION,
+            'fingerprint': fingerprint,
+            'indexes': {kind: index.to_dict() for kind, index in indexes.items()},
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'w', encoding='utf-8') as artifact_file:
+                json.dump(payload, artifact_file, separators=(',', ':'))
+            # mkstemp creates the file owner-only; workers may run as another user
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    @classmethod
+    def read_artifact(cls, path: Path) -> Tuple[List[Any], Dict[str, BM25Index]]:
+        with path.open(encoding='utf-8') as artifact_file:
+            payload = json.load(artifact_file)
+        if payload.get('format') != cls.FORMAT or payload.get('version') != cls.FORMAT_VERSION:
+            raise ValueError(f'{path} is not a ranking index artifact of version {cls.FORMAT_VERSION}')
+        indexes = {kind: BM25Index.from_dict(data) for kind, data in payload['indexes'].items()}
+        return payload['fingerprint'], indexes
+
+    @classmethod
+    def _load_artifact(cls, fingerprint: List[Any]) -> Optional[Dict[str, BM25Index]]:
+        path = cls.artifact_path()
+        if path is None or not path.exists():
+            return None
+        try:
+            artifact_fingerprint, indexes = cls.read_artifact(path)
+        except (OSError, ValueError, KeyError) as exc:
+            logger.warning("Ignoring unreadable ranking index %s: %s", path, exc)
+            return None
+        if artifact_fingerprint != fingerprint:
+            logger.info("Ranking index %s is out of date; rebuilding in memory", path)
+            return None
+        return indexes
+
+    @classmethod
+    def rebuild(cls) -> Dict[str, BM25Index]:
+        """Build both indexes from the database, write the artifact and tell other workers to reload."""
+        with cls._lock:
+            fingerprint = cls.fingerprint()
+            indexes = cls.build_indexes()
+            path = cls.artifact_path()
+            if path is not None:
+                try:
+                    cls.write_artifact(path, indexes, fingerprint)
+                except OSError as exc:
+                    logger.warning("Could not write ranking index %s: %s", path, exc)
+            cls._install(indexes, fingerprint)
+            cls._mark_built(bump_data_version(cls.VERSION_KEY))
+        logger.info(
+            "Rebuilt ranking index (%s topics, %s committees)",
+            len(indexes['topic']), len(indexes['committee'])
+        )
+        return indexes
+
+    @classmethod
+    def _install(cls, indexes: Dict[str, BM25Index], fingerprint: List[Any]) -> None:
+        cls._indexes = indexes
+        cls._topics = TopicArea.objects.in_bulk(indexes['topic'].doc_ids)
+        cls._fingerprint = fingerprint
+
+    @classmethod
+    def build(cls) -> None:
+        """Reload only if the tables or analyzer changed: from the artifact if it matches, else in memory."""
+        fingerprint = cls.fingerprint()
+        if fingerprint != cls._fingerprint:
+            indexes = cls._load_artifact(fingerprint)
+            if indexes is None:
+                indexes = cls.build_indexes()
+            cls._install(indexes, fingerprint)
+
+    # ------------------------------------------------------------------
+    # Queries
+
+    @classmethod
+    def _query_terms(cls, tokens: Iterable[str], index: BM25Index) -> Counter:
+        analyzer = get_analyzer()
+        terms: Counter = Counter()
+        for token in tokens:
+            terms.update(analyzer.query_terms(token, index.postings))
+        return terms
+
+    @classmethod
+    def _fallback_terms(cls, tokens: Iterable[str], index: BM25Index) -> Counter:
+        """Indexed name and keyword terms containing a token's stem ("klima" → "klimaschutz")."""
+        analyzer = get_analyzer()
+        terms: Counter = Counter()
+        for token in tokens:
+            stem = analyzer.stem(analyzer.normalize(token))
+            terms.update(term for term in index.fallback_terms if stem in term)
+        return terms
+
+    @classmethod
+    def score(cls, kind: str, tokens: Iterable[str]) -> Dict[int, float]:
+        """BM25 scores ``{id: score}`` of the ``'topic'`` or ``'committee'`` documents matching the tokens."""
+        cls._ensure_current()
+        index = cls._indexes[kind]
+        tokens = list(tokens)
+        scores = index.score(cls._query_terms(tokens, index))
+        if not scores:
+            scores = index.score(cls._fallback_terms(tokens, index))
+        return scores
+
+    @classmethod
+    def search_topics(cls, tokens: Iterable[str], limit: Optional[int] = None) -> List[TopicArea]:
+        """
+        Return topics ranked by BM25 score, best first.
+
+        Each token contributes its stem, its compound parts and their
+        synonyms (see GermanAnalyzer.query_terms). If no token hits an
+        indexed term, name and keyword terms containing a token's stem are
+        scored instead.
+        """
+        scores = cls.score('topic', tokens)
+        topics = sorted(
+            (cls._topics[topic_id] for topic_id in scores if topic_id in cls._topics),
+            key=lambda topic: (-scores[topic.id], topic.name)
+        )
+        return topics[:limit] if limit is not None else topics
+
+    @classmethod
+    def score_committees(cls, tokens: Iterable[str]) -> Dict[int, float]:
+        return cls.score('committee', tokens)
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._indexes = {}
+        cls._topics = {}
+        cls._fingerprint = None
@@ -0,0 +1,81 @@
+# ABOUTME: Rate limiter shared by every thread and worker process on a host, backed by a locked state file.
+# ABOUTME: Used by geocoder backends so the Nominatim limit holds per deployment, not per object.
+
+import asyncio
+import fcntl
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+from django.conf import settings
+
+
+class RateLimitExceeded(Exception):
+    """Raised when the next free request slot is further away than the caller will wait."""
+
+    def __init__(self, name: str, delay: float):
+        self.name = name
+        self.delay = delay
+        super().__init__(f'{name} rate limit reached: next request slot in {delay:.1f}s')
+
+
+class SharedRateLimiter:
+    """
+    Token bucket for requests to one upstream service, shared across processes.
+
+    The bucket is kept in GCRA form: a single "theoretical arrival time"
+    stored in a small file under ``GEOCODER_RATE_LIMIT_DIR`` (the system
+    temp directory by default). Each caller takes an exclusive ``flock`` on
+    the file, reserves the next free slot by advancing the stored time by
+    ``interval`` and releases the lock before sleeping. Slots are therefore
+    handed out in the order callers reach the lock, and nobody sleeps while
+    holding it. ``burst`` lets that many requests through back to back
+    after an idle period; the default of 1 spaces every request.
+
+    A caller that would have to wait longer than ``max_wait`` gets
+    ``RateLimitExceeded`` instead and its slot is not reserved.
+    """
+
+    def __init__(self, name: str, interval: float, burst: int = 1, state_dir: Optional[str] = None):
+        self.name = name
+        self.interval = interval
+        self.burst = max(1, burst)
+        state_dir = state_dir or getattr(settings, 'GEOCODER_RATE_LIMIT_DIR', None) or tempfile.gettempdir()
+        self.path = Path(state_dir) / f'writethem-ratelimit-{name}'
+
+    def reserve(self, max_wait: Optional[float] = None) -> float:
+        """Reserve the next request slot and return how many seconds to wait for it."""
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            # A separate open file description per call, so threads exclude each other too
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            now = time.time()
+            try:
+                arrival = max(float(os.pread(fd, 64, 0)), now)
+            except ValueError:
+                arrival = now
+
+            delay = max(0.0, arrival - (self.burst - 1) * self.interval - now)
+            if max_wait is not None and delay > max_wait:
+                raise RateLimitExceeded(self.name, delay)
+
+            state = repr(arrival + self.interval).encode()
+            os.ftruncate(fd, 0)
+            os.pwrite(fd, state, 0)
+            return delay
+        finally:
+            os.close(fd)
+
+    def acquire(self, max_wait: Optional[float] = None) -> None:
+        """Block until the reserved slot arrives."""
+        delay = self.reserve(max_wait)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, max_wait: Optional[float] = None) -> None:
+        """Like ``acquire``, but neither the flock nor the sleep blocks the event loop."""
+        delay = await asyncio.to_thread(self.reserve, max_wait)
+        if delay > 0:
+            await asyncio.sleep(delay)
@@ -27,6 +27,11 @@ from ..models import (
     TopicArea,
 )
 from .abgeordnetenwatch_api_client import AbgeordnetenwatchAPI
+from .constituency_directory import ConstituencyDirectory
+from .expertise import ExpertiseProfileBuilder
+from .ranking import RankingIndex
+from .suggestion_cache import SuggestionCache
+from .versioning import bump_data_version
 
 logger = logging.getLogger('letters.services')
 
@@ -57,6 +62,7 @@ class RepresentativeSyncService:
             'memberships_created': 0,
             'memberships_updated': 0,
             'photos_downloaded': 0,
+            'expertise_profiles': 0,
         }
         self._politician_cache: Dict[str, Dict[str, Any]] = {}
 
@@ -68,6 +74,10 @@ class RepresentativeSyncService:
         importer._sync(level=level, state=state)
         if dry_run:
             transaction.set_rollback(True)
+        else:
+            transaction.on_commit(lambda: bump_data_version(ConstituencyDirectory.VERSION_KEY))
+            transaction.on_commit(RankingIndex.rebuild)
+            transaction.on_commit(lambda: bump_data_version(SuggestionCache.VERSION_KEY))
         return importer.stats
 
     def _sync(self, level: str = 'all', state: Optional[str] = None) -> None:
@@ -84,6 +94,9 @@ class RepresentativeSyncService:
                 region = normalize_german_state(label)
                 self._sync_parliament(parliament_data, level='STATE', region=region, description=f"Landtag {label}")
 
+        # Committees, topics and focus areas may have changed; precompute expertise for ranking
+        self.stats['expertise_profiles'] = ExpertiseProfileBuilder.refresh()
+
     # --------------------------------------
     def _sync_parliament(self, parliament_data: Dict[str, Any], level: str, region: str, description: str) -> None:
         logger.info("Syncing %s representatives …", description)
@@ -0,0 +1,243 @@
+# ABOUTME: Result cache for title-based suggestions, keyed by normalized token set and user location.
+# ABOUTME: Stores topic, representative and tag ids and rehydrates them with a few in_bulk queries.
+
+import hashlib
+import json
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import get_language
+
+from ..constants import normalize_german_state
+from ..models import CommitteeMembership, Constituency, Representative, Tag, TopicArea
+from .constituency import ConstituencySuggestionService
+from .geocoding_cache import LRUCache
+from .ranking import RankingIndex
+from .versioning import get_data_version
+
+logger = logging.getLogger('letters.services')
+
+
+class SuggestionCache:
+    """
+    Memoize ConstituencySuggestionService.suggest_from_concern for the title analysis endpoint.
+
+    Entries are keyed by the text's sorted tokens (so word order and
+    punctuation don't matter, but repeated words, which BM25 counts, do),
+    the user's constituency
+    ids and address parts, the active language (the explanation is
+    translated) and two data versions: 'suggestions', bumped after
+    sync_representatives and load_topic_taxonomy, and the ranking version,
+    bumped on TopicArea and Committee edits. Older entries are never read
+    again and age out of the LRU.
+
+    Entries hold ids only, never model instances, so they stay small and can
+    live in a shared Django cache (SUGGESTION_SHARED_CACHE_ALIAS) as well as
+    the per-process LRU (SUGGESTION_MEMORY_CACHE_SIZE entries, both kept for
+    SUGGESTION_CACHE_TTL seconds). Representative, tag and committee edits
+    outside a sync show up once entries expire.
+    """
+
+    VERSION_KEY = 'suggestions'
+    KEY_PREFIX = 'suggestions:'
+
+    _memory: Optional[LRUCache] = None
+    _stats: Dict[str, int] = {'hits': 0, 'misses': 0}
+    _lock = threading.Lock()
+
+    @classmethod
+    def _memory_tier(cls) -> LRUCache:
+        if cls._memory is None:
+            with cls._lock:
+                if cls._memory is None:
+                    cls._memory = LRUCache(getattr(settings, 'SUGGESTION_MEMORY_CACHE_SIZE', 1024))
+        return cls._memory
+
+    @staticmethod
+    def _shared_tier():
+        alias = getattr(settings, 'SUGGESTION_SHARED_CACHE_ALIAS', None)
+        return caches[alias] if alias else None
+
+    @staticmethod
+    def _location_key(user_location: Optional[Dict[str, Any]]) -> List[Any]:
+        user_location = user_location or {}
+        constituencies = user_location.get('constituencies') or []
+        if not isinstance(constituencies, (list, tuple, set)):
+            constituencies = [constituencies]
+        constituency_ids = sorted({str(getattr(item, 'id', item)) for item in constituencies})
+        state = user_location.get('state')
+        return [
+            constituency_ids,
+            (normalize_german_state(state) if state else None) or '',
+            (user_location.get('postal_code') or '').strip(),
+            (user_location.get('street') or '').strip().lower(),
+            (user_location.get('city') or '').strip().lower(),
+            (user_location.get('country') or 'DE').upper(),
+        ]
+
+    @classmethod
+    def make_key(cls, tokens: List[str], user_location: Optional[Dict[str, Any]] = None) -> str:
+        """Cache key for a token list and user location under the current data versions."""
+        parts = [
+            sorted(tokens),
+            cls._location_key(user_location),
+            get_language() or '',
+            get_data_version(cls.VERSION_KEY),
+            get_data_version(RankingIndex.VERSION_KEY),
+        ]
+        digest = hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode('utf-8')).hexdigest()
+        return cls.KEY_PREFIX + digest
+
+    @classmethod
+    def suggest(cls, concern_text: str, user_location: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Same result as suggest_from_concern, served from the cache when the key matches."""
+        tokens = ConstituencySuggestionService._extract_tokens(concern_text)
+        key = cls.make_key(tokens, user_location)
+        ttl = getattr(settings, 'SUGGESTION_CACHE_TTL', 10 * 60)
+
+        entry = cls._memory_tier().get(key)
+        shared = cls._shared_tier()
+        if entry is None and shared is not None:
+            entry = shared.get(key)
+            if entry is not None:
+                cls._memory_tier().set(key, entry, ttl)
+
+        if entry is not None:
+            result = cls._rehydrate(entry)
+            if result is not None:
+                cls._count(True)
+                result['keywords'] = tokens
+                return result
+
+        cls._count(False)
+        result = ConstituencySuggestionService.suggest_from_concern(concern_text, user_location=user_location)
+        entry = cls._dehydrate(result)
+        cls._memory_tier().set(key, entry, ttl)
+        if shared is not None:
+            shared.set(key, entry, ttl)
+        return result
+
+    @staticmethod
+    def _dehydrate(result: Dict[str, Any]) -> Dict[str, Any]:
+        def constituency_id(rep):
+            constituency = getattr(rep, 'suggested_constituency', None)
+            return constituency.id if constituency else None
+
+        def membership_id(rep):
+            committees = getattr(rep, 'relevant_committees', None) or []
+            return committees[0].id if committees else None
+
+        return {
+            'suggested_level': result['suggested_level'],
+            'topic_ids': [topic.id for topic in result['matched_topics']],
+            'direct': [[rep.id, constituency_id(rep)] for rep in result['direct_representatives']],
+            'experts': [
+                [
+                    rep.id,
+                    constituency_id(rep),
+                    membership_id(rep),
+                    getattr(rep, 'committee_score', 0),
+                    getattr(rep, 'keyword_score', 0),
+                ]
+                for rep in result['expert_representatives']
+            ],
+            'constituency_ids': [constituency.id for constituency in result['constituencies']],
+            'tag_ids': [tag.id for tag in result['suggested_tags']],
+            'explanation': str(result['explanation']),
+            'parliament_ids': list(result['parliament_ids']),
+        }
+
+    @staticmethod
+    def _rehydrate(entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Rebuild a suggest_from_concern result from ids; None when a referenced row is gone."""
+        rep_ids = [row[0] for row in entry['direct']] + [row[0] for row in entry['experts']]
+        representatives = Representative.objects.select_related(
+            'parliament', 'parliament_term'
+        ).prefetch_related(
+            'constituencies',
+            'topic_areas',
+        ).in_bulk(rep_ids)
+        topics = TopicArea.objects.in_bulk(entry['topic_ids'])
+        tags = Tag.objects.in_bulk(entry['tag_ids'])
+        constituencies = Constituency.objects.select_related(
+            'parliament_term__parliament'
+        ).in_bulk(entry['constituency_ids'])
+        memberships = CommitteeMembership.objects.select_related('committee').in_bulk(
+            [row[2] for row in entry['experts'] if row[2]]
+        )
+
+        if (
+            len(representatives) != len(set(rep_ids))
+            or len(topics) != len(entry['topic_ids'])
+            or len(tags) != len(entry['tag_ids'])
+            or len(constituencies) != len(entry['constituency_ids'])
+        ):
+            return None
+
+        def suggested_constituency(rep, constituency_id):
+            for constituency in rep.constituencies.all():
+                if constituency.id == constituency_id:
+                    return constituency
+            return None
+
+        direct_reps = []
+        for rep_id, constituency_id in entry['direct']:
+            rep = representatives[rep_id]
+            rep.suggested_constituency = suggested_constituency(rep, constituency_id)
+            direct_reps.append(rep)
+
+        expert_reps = []
+        for rep_id, constituency_id, membership_id, committee_score, keyword_score in entry['experts']:
+            rep = representatives[rep_id]
+            membership = memberships.get(membership_id) if membership_id else None
+            rep.relevant_committees = [membership] if membership else []
+            rep.committee_score = committee_score
+            rep.keyword_score = keyword_score
+            rep.suggested_constituency = suggested_constituency(rep, constituency_id)
+            expert_reps.append(rep)
+
+        matched_topics = [topics[topic_id] for topic_id in entry['topic_ids']]
+        result_constituencies = [constituencies[constituency_id] for constituency_id in entry['constituency_ids']]
+        return {
+            'suggested_level': entry['suggested_level'],
+            'primary_topic': matched_topics[0] if matched_topics else None,
+            'matched_topics': matched_topics,
+            'representatives': direct_reps + expert_reps,
+            'direct_representatives': direct_reps,
+            'expert_representatives': expert_reps,
+            'suggested_constituencies': result_constituencies,
+            'constituencies': result_constituencies,
+            'suggested_tags': [tags[tag_id] for tag_id in entry['tag_ids']],
+            'keywords': [],
+            'explanation': entry['explanation'],
+            'parliament_ids': list(entry['parliament_ids']),
+        }
+
+    @classmethod
+    def _count(cls, hit: bool) -> None:
+        cls._stats['hits' if hit else 'misses'] += 1
+        total = cls._stats['hits'] + cls._stats['misses']
+        logger.debug(
+            "Suggestion cache %s (hit rate %.1f%% over %d lookups)",
+            'hit' if hit else 'miss', 100 * cls._stats['hits'] / total, total,
+        )
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        """Return hit/miss counters, hit rate and the number of entries held in this process."""
+        total = cls._stats['hits'] + cls._stats['misses']
+        return {
+            **cls._stats,
+            'hit_rate': cls._stats['hits'] / total if total else 0.0,
+            'size': len(cls._memory_tier()),
+        }
+
+    @classmethod
+    def clear(cls) -> None:
+        """Empty the in-process tier and reset counters (mainly for tests)."""
+        with cls._lock:
+            cls._memory = None
+            cls._stats = {'hits': 0, 'misses': 0}
@@ -0,0 +1,68 @@
+# ABOUTME: Process-level index of Tag names and slugs, normalized once for keyword matching.
+# ABOUTME: Lets ConstituencySuggestionService suggest tags without loading and normalizing every Tag per request.
+
+import logging
+from typing import Iterable, List, Optional, Tuple
+
+from ..models import Tag
+from .text_analysis import get_analyzer
+from .versioning import VersionedSnapshot
+
+logger = logging.getLogger('letters.services')
+
+
+class TagIndex(VersionedSnapshot):
+    """
+    In-memory list of all tags with their analyzer-normalized name and slug.
+
+    Loaded with one query and rebuilt when the 'tags' data version changes
+    (bumped by Tag signals) or after TAG_INDEX_TTL seconds.
+    """
+
+    VERSION_KEY = 'tags'
+    TTL_SETTING = 'TAG_INDEX_TTL'
+
+    # (tag, normalized name, normalized slug), in Tag's default order
+    _entries: List[Tuple[Tag, str, str]] = []
+
+    @classmethod
+    def build(cls) -> None:
+        analyzer = get_analyzer()
+        cls._entries = [
+            (tag, analyzer.normalize(tag.name), analyzer.normalize(tag.slug))
+            for tag in Tag.objects.all()
+        ]
+        logger.debug("Built tag index (%s tags)", len(cls._entries))
+
+    @classmethod
+    def match(cls, terms: Iterable[str], limit: Optional[int] = None) -> List[Tag]:
+        """
+        Return tags whose normalized name or slug contains any of the terms, best first.
+
+        A term found in the name scores 2, one found only in the slug 1.
+        Stems with folded umlauts can't be matched with icontains, hence
+        the substring test against the normalized text.
+        """
+        terms = list(terms)
+        if not terms:
+            return []
+
+        cls._ensure_current()
+        scored: List[Tuple[int, Tag]] = []
+        for tag, name, slug in cls._entries:
+            score = 0
+            for term in terms:
+                if term in name:
+                    score += 2
+                elif term in slug:
+                    score += 1
+            if score:
+                scored.append((score, tag))
+
+        scored.sort(key=lambda item: (-item[0], item[1].name))
+        tags = [tag for _, tag in scored]
+        return tags[:limit] if limit is not None else tags
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._entries = []
@@ -0,0 +1,196 @@
+# ABOUTME: German text analyzer shared by topic, tag, committee and representative matching.
+# ABOUTME: Normalizes umlauts, stems plurals and inflections, splits compounds and expands synonyms.
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Set
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class GermanAnalyzer:
+    """
+    Turn text into comparable terms for keyword matching.
+
+    The pipeline is:
+
+    1. ``tokenize``: lowercase words of at least MIN_TOKEN_LENGTH characters,
+       without STOPWORDS. These raw tokens are what callers show to users.
+    2. ``normalize``: fold umlauts and ß ("Universität" → "universitat").
+    3. ``stem``: light German stemmer after Savoy (as in Lucene's
+       GermanLightStemmer). It strips plural and case endings, so
+       "universitäten", "universität" → "universitat" and "hochschulen",
+       "hochschule" → "hochschul".
+    4. ``split_compound``: split a term into parts found in a vocabulary,
+       allowing the linking elements -s-, -es-, -n-, -en-
+       ("forschungsforderung" → "forschung", "forderung").
+    5. ``synonyms``: stems of SYNONYM_GROUPS members
+       ("universitat" ↔ "hochschul").
+
+    ``terms`` (steps 1-3) is memoized per text, so analysing stored keyword
+    lists costs one pass per process. ``query_terms`` adds steps 4-5 for one
+    query token against an index's vocabulary.
+
+    Replace the analyzer with ``settings.TEXT_ANALYZER``; subclasses can
+    override any step or the word lists. Bump VERSION when a change alters
+    the terms produced, so stored indexes are rebuilt.
+    """
+
+    VERSION = 2
+
+    TOKEN_PATTERN = re.compile(r"[\wÄÖÜäöüß-]+", re.UNICODE)
+    MIN_TOKEN_LENGTH = 3
+    # Shortest stem accepted as a compound part; shorter heads split too eagerly
+    MIN_PART_LENGTH = 4
+    LINKING_ELEMENTS = ('es', 'en', 's', 'n')
+
+    STOPWORDS = {
+        'und', 'der', 'die', 'das', 'den', 'dem', 'des', 'ein', 'eine', 'einer', 'einem',
+        'für', 'mit', 'von', 'auf', 'bei', 'aus', 'zur', 'zum', 'vom', 'beim', 'ans',
+        'ist', 'sind', 'war', 'waren', 'wird', 'werden', 'hat', 'haben', 'kann', 'können',
+        'soll', 'sollen', 'muss', 'müssen', 'darf', 'dürfen', 'will', 'wollen',
+        'ich', 'du', 'er', 'sie', 'es', 'wir', 'ihr', 'man', 'wie', 'was', 'wer', 'aber',
+        'auch', 'nur', 'noch', 'mehr', 'sehr', 'als', 'bis', 'oder', 'doch', 'denn',
+    }
+
+    # Words in one group match each other; English entries cover letters written in English
+    SYNONYM_GROUPS = (
+        ('universität', 'hochschule', 'uni'),
+        ('bahn', 'eisenbahn', 'zug', 'train'),
+        ('öpnv', 'nahverkehr'),
+        ('kita', 'kindertagesstätte', 'kinderbetreuung'),
+        ('wohnung', 'wohnraum', 'wohnen', 'housing'),
+        ('miete', 'mietpreis'),
+        ('rente', 'altersvorsorge', 'pension'),
+        ('klima', 'klimaschutz', 'climate'),
+        ('schule', 'school'),
+        ('datenschutz', 'dsgvo', 'privatsphäre', 'privacy'),
+        ('flüchtling', 'geflüchtete', 'asyl', 'refugee'),
+        ('fahrrad', 'radverkehr'),
+        ('arzt', 'ärztin', 'doctor'),
+    )
+
+    UMLAUTS = str.maketrans({'ä': 'a', 'ö': 'o', 'ü': 'u', 'ß': 'ss'})
+    # Letters after which a final -s or -st is an ending rather than part of the stem
+    S_ENDINGS = set('bdfghklmnt')
+
+    def __init__(self):
+        self.stem = lru_cache(maxsize=50_000)(self._stem)
+        self.terms = lru_cache(maxsize=10_000)(self._terms)
+        self._synonyms: Dict[str, Set[str]] = {}
+        for group in self.SYNONYM_GROUPS:
+            stems = {self.stem(self.normalize(word)) for word in group}
+            for stem in stems:
+                self._synonyms.setdefault(stem, set()).update(stems - {stem})
+
+    def tokenize(self, text: str) -> List[str]:
+        if not text:
+            return []
+        tokens = []
+        for raw_token in self.TOKEN_PATTERN.findall(text.lower()):
+            token = raw_token.strip('-_')
+            if len(token) >= self.MIN_TOKEN_LENGTH and token not in self.STOPWORDS:
+                tokens.append(token)
+        return tokens
+
+    def normalize(self, text: str) -> str:
+        return (text or '').lower().translate(self.UMLAUTS)
+
+    def _stem(self, term: str) -> str:
+        length = len(term)
+
+        # Step 1: plural and case endings
+        if length > 5 and term.endswith('ern'):
+            length -= 3
+        elif length > 4 and term[length - 2:length] in ('em', 'en', 'er', 'es'):
+            length -= 2
+        elif length > 3 and (
+            term[length - 1] == 'e'
+            or (term[length - 1] == 's' and term[length - 2] in self.S_ENDINGS)
+        ):
+            length -= 1
+
+        # Step 2: comparative and superlative endings
+        if length > 5 and term[length - 3:length] == 'est':
+            length -= 3
+        elif length > 4 and (
+            term[length - 2:length] in ('er', 'en')
+            or (term[length - 2:length] == 'st' and term[length - 3] in self.S_ENDINGS)
+        ):
+            length -= 2
+
+        return term[:length]
+
+    def _terms(self, text: str) -> List[str]:
+        """Stems of the words in ``text``; hyphenated words also yield their parts."""
+        terms = []
+        for token in self.tokenize(text):
+            token = self.normalize(token)
+            terms.append(self.stem(token))
+            if '-' in token:
+                terms.extend(self.stem(part) for part in token.split('-') if part)
+        return terms
+
+    def split_compound(self, term: str, vocabulary) -> List[str]:
+        """
+        Split ``term`` into parts that occur in ``vocabulary`` (any container of stems).
+
+        The first part must be known; the remainder is either known, split
+        recursively, or kept as an unknown final part of at least
+        MIN_PART_LENGTH characters. Returns [] when no split is found.
+        """
+        minimum = self.MIN_PART_LENGTH
+        for end in range(len(term) - minimum, minimum - 1, -1):
+            head, tail = term[:end], term[end:]
+            head_stem = self._known_head(head, vocabulary)
+            if head_stem is None:
+                continue
+            if tail in vocabulary:
+                return [head_stem, tail]
+            rest = self.split_compound(tail, vocabulary)
+            return [head_stem] + (rest or [tail])
+        return []
+
+    def _known_head(self, head: str, vocabulary):
+        if head in vocabulary:
+            return head
+        for linking in self.LINKING_ELEMENTS:
+            if head.endswith(linking):
+                stripped = head[:-len(linking)]
+                if len(stripped) >= self.MIN_PART_LENGTH and stripped in vocabulary:
+                    return stripped
+        return None
+
+    def synonyms(self, term: str) -> Set[str]:
+        return self._synonyms.get(term, set())
+
+    def query_terms(self, token: str, vocabulary) -> Set[str]:
+        """A query token's stem, its compound parts unless the stem is known, and synonyms of both."""
+        stem = self.stem(self.normalize(token))
+        terms = {stem}
+        if stem not in vocabulary:
+            terms.update(self.split_compound(stem, vocabulary))
+        for term in list(terms):
+            terms.update(self.synonyms(term))
+        return terms
+
+    def search_terms(self, tokens: Iterable[str]) -> Set[str]:
+        """Stems and synonyms of query tokens, for substring matching against ``normalize``d text."""
+        terms: Set[str] = set()
+        for token in tokens:
+            stem = self.stem(self.normalize(token))
+            terms.add(stem)
+            terms.update(self.synonyms(stem))
+        return {term for term in terms if len(term) >= self.MIN_TOKEN_LENGTH}
+
+
+@lru_cache(maxsize=None)
+def _load_analyzer(path: str) -> GermanAnalyzer:
+    return import_string(path)()
+
+
+def get_analyzer() -> GermanAnalyzer:
+    """The analyzer named by settings.TEXT_ANALYZER (GermanAnalyzer by default), one per process."""
+    path = getattr(settings, 'TEXT_ANALYZER', None) or 'letters.services.text_analysis.GermanAnalyzer'
+    return _load_analyzer(path)
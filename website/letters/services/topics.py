@@ -3,12 +3,13 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 from tqdm import tqdm
 
 from ..models import Committee, TopicArea
 from .constituency import ConstituencySuggestionService
+from .text_analysis import get_analyzer
 
 
 class TopicSuggestionService:
@@ -39,6 +40,23 @@ class CommitteeTopicMappingService:
 
     MIN_KEYWORD_OVERLAP = 1
 
+    @staticmethod
+    def _keyword_overlap(committee_keywords: Iterable[str], topic_keywords: Iterable[str]) -> List[str]:
+        """
+        Committee keywords that match a topic keyword after text analysis.
+
+        Keywords are compared by their analyzed terms, so "Hochschulen"
+        matches "hochschule" and "Universitäten" matches "universität".
+        Returns the original committee keywords.
+        """
+        analyzer = get_analyzer()
+        topic_terms = {tuple(analyzer.terms(keyword)) for keyword in topic_keywords}
+        topic_terms.discard(())
+        return sorted(
+            keyword for keyword in committee_keywords
+            if tuple(analyzer.terms(keyword)) in topic_terms
+        )
+
     @classmethod
     def map_all_committees(cls, min_overlap: int = MIN_KEYWORD_OVERLAP) -> Dict[str, Any]:
         """
@@ -71,14 +89,13 @@ class CommitteeTopicMappingService:
             matched_topics = []
 
             for topic in topic_areas:
-                topic_keywords = set(topic.get_keywords_list())
-                overlap = committee_keywords & topic_keywords
+                overlap = cls._keyword_overlap(committee_keywords, topic.get_keywords_list())
 
                 if len(overlap) >= min_overlap:
                     matched_topics.append({
                         'topic': topic,
                         'overlap_count': len(overlap),
-                        'overlap_keywords': sorted(overlap)
+                        'overlap_keywords': overlap
                     })
 
             if matched_topics:
@@ -117,12 +134,12 @@ class CommitteeTopicMappingService:
         matches = []
         for topic in topic_areas:
             topic_keywords = set(topic.get_keywords_list())
-            overlap = committee_keywords & topic_keywords
+            overlap = cls._keyword_overlap(committee_keywords, topic_keywords)
             matches.append({
                 'topic_name': topic.name,
                 'topic_type': topic.competency_type,
                 'overlap_count': len(overlap),
-                'overlap_keywords': sorted(overlap),
+                'overlap_keywords': overlap,
                 'topic_keywords': sorted(topic_keywords),
             })
 
@@ -0,0 +1,99 @@
+# ABOUTME: Data version counters for invalidating process-level caches built from database tables.
+# ABOUTME: Versions live in the default Django cache so every worker sharing it sees a bump.
+
+import logging
+import threading
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger('letters.services')
+
+KEY_PREFIX = 'data-version:'
+
+
+def get_data_version(name: str) -> int:
+    """Return the current version of a named data set, starting at 1."""
+    return caches['default'].get_or_set(KEY_PREFIX + name, 1, None)
+
+
+def bump_data_version(name: str) -> int:
+    """Mark a named data set as changed so caches built from it are rebuilt."""
+    cache = caches['default']
+    try:
+        version = cache.incr(KEY_PREFIX + name)
+    except ValueError:
+        # Key missing or evicted; anything but the default 1 invalidates older builds
+        version = 2
+        cache.set(KEY_PREFIX + name, version, None)
+    logger.debug("Bumped data version %s to %s", name, version)
+    return version
+
+
+class VersionedSnapshot:
+    """
+    Base for process-level snapshots of database tables, held in class attributes.
+
+    Subclasses set VERSION_KEY, the data version their source tables bump,
+    and TTL_SETTING, the name of the setting that bounds staleness in
+    seconds (DEFAULT_TTL if unset) when the default cache is per-process and
+    another worker wrote the data. They implement build(), which loads the
+    snapshot, and reset(), which drops it. build() runs under the
+    subclass's own lock whenever the version changed or the TTL ran out.
+    """
+
+    VERSION_KEY = ''
+    TTL_SETTING = ''
+    DEFAULT_TTL = 300
+
+    _version: Optional[int] = None
+    _built_at: float = 0.0
+    _lock = threading.Lock()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # One lock and build state per snapshot, not shared through the base class
+        cls._lock = threading.Lock()
+        cls._version = None
+        cls._built_at = 0.0
+
+    @classmethod
+    def build(cls) -> None:
+        """Load the snapshot from the database into class attributes."""
+        raise NotImplementedError
+
+    @classmethod
+    def reset(cls) -> None:
+        """Drop the snapshot's data."""
+        raise NotImplementedError
+
+    @classmethod
+    def _is_current(cls, version: int) -> bool:
+        ttl = getattr(settings, cls.TTL_SETTING, cls.DEFAULT_TTL)
+        return version == cls._version and time.monotonic() - cls._built_at < ttl
+
+    @classmethod
+    def _mark_built(cls, version: int) -> None:
+        cls._version = version
+        cls._built_at = time.monotonic()
+
+    @classmethod
+    def _ensure_current(cls) -> None:
+        version = get_data_version(cls.VERSION_KEY)
+        if cls._is_current(version):
+            return
+        with cls._lock:
+            if cls._is_current(version):
+                return
+            cls.build()
+            cls._mark_built(version)
+
+    @classmethod
+    def clear(cls) -> None:
+        """Drop the snapshot so the next lookup reloads it (mainly for tests)."""
+        with cls._lock:
+            cls.reset()
+            cls._version = None
+            cls._built_at = 0.0
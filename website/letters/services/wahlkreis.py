@@ -3,24 +3,33 @@
 
 from typing import Dict, List, Optional
 import logging
+import re
 
-from django.db.models import Q
+from asgiref.sync import sync_to_async
 
-from ..models import Constituency
+from ..models import PostalCodeWahlkreis
 from ..constants import normalize_german_state
+from .constituency_directory import ConstituencyDirectory
 from .geocoding import AddressGeocoder, WahlkreisLocator
+from .geocoding_backends import format_address
+from .instrumentation import span
 
 logger = logging.getLogger('letters.services')
 
+# A postal code with at most one place name after it ("10117", "10117 Berlin", "10117, Deutschland")
+POSTAL_CODE_ONLY_RE = re.compile(r'^\s*(\d{5})(?:[\s,]+[^\d,]*)?$')
+
 
 class WahlkreisResolver:
     """
     Resolve addresses to Wahlkreis identifiers and Constituency objects.
 
     Process:
-    1. Geocode address → coordinates
+    1. Postal code without a street: unambiguous postal code in
+       PostalCodeWahlkreis → federal/state Wahlkreis IDs; otherwise (and always
+       when a street is given) geocode address → coordinates
     2. Look up Wahlkreis from GeoJSON → get federal/state Wahlkreis IDs
-    3. Query Constituency objects by list_id
+    3. Look up Constituency objects by list_id in the ConstituencyDirectory
     4. Add state-level list constituencies for the user's state
     """
 
@@ -39,9 +48,12 @@ class WahlkreisResolver:
     def wahlkreis_locator(self):
         """Lazy-load WahlkreisLocator."""
         if self._wahlkreis_locator is None:
-            self._wahlkreis_locator = WahlkreisLocator()
+            # Parses and indexes the boundary files on first use in the process
+            with span('locator.load'):
+                self._wahlkreis_locator = WahlkreisLocator()
         return self._wahlkreis_locator
 
+    @span('resolve')
     def resolve(
         self,
         address: str,
@@ -62,37 +74,206 @@ class WahlkreisResolver:
                 'constituencies': List[Constituency]
             }
         """
-        result = {
-            'federal_wahlkreis_number': None,
-            'state_wahlkreis_number': None,
-            'eu_wahlkreis': 'DE',
-            'constituencies': []
-        }
+        result = self._empty_result()
 
         address = (address or '').strip()
         if not address:
             logger.warning("Empty address provided to WahlkreisResolver")
             return result
 
-        # Step 1: Geocode address
-        lat, lon, success, error = self.geocoder.geocode(address, country)
+        # Step 1: Precomputed postal code mapping, only when the address is nothing but a
+        # postal code: a "99% inside" postal code can still put a given street in the wrong Wahlkreis
+        match = POSTAL_CODE_ONLY_RE.match(address)
+        wahlkreis_result = self._postal_code_result(match.group(1), country) if match else None
+
+        # Step 2: Geocode address and look up Wahlkreise (federal and state)
+        if wahlkreis_result is None:
+            wahlkreis_result = self._locate(self.geocoder.geocode(address, country))
+            if wahlkreis_result is None:
+                return result
+
+        return self._build_result(result, wahlkreis_result, address)
+
+    @span('resolve')
+    def resolve_structured(
+        self,
+        street: str,
+        postal_code: str,
+        city: str,
+        country: str = 'DE'
+    ) -> Dict:
+        """
+        Resolve an address given as separate street, postal code and city.
+
+        Without a street, unambiguous postal codes are answered from
+        PostalCodeWahlkreis without geocoding. Addresses with a street always
+        use the geocoder's structured query mode, since the street decides on
+        postal codes split between Wahlkreise.
+
+        Returns the same structure as resolve().
+        """
+        result = self._empty_result()
+
+        street = (street or '').strip()
+        postal_code = (postal_code or '').strip()
+        city = (city or '').strip()
+        address = format_address(street, postal_code, city)
+        if not address:
+            logger.warning("Empty address provided to WahlkreisResolver")
+            return result
+
+        wahlkreis_result = None if street else self._postal_code_result(postal_code, country)
+        if wahlkreis_result is None:
+            wahlkreis_result = self._locate(
+                self.geocoder.geocode_structured(street, postal_code, city, country)
+            )
+            if wahlkreis_result is None:
+                return result
+
+        return self._build_result(result, wahlkreis_result, address)
+
+    async def resolve_structured_async(
+        self,
+        street: str,
+        postal_code: str,
+        city: str,
+        country: str = 'DE'
+    ) -> Dict:
+        """
+        Async resolve_structured() for async views.
+
+        Geocoding awaits the backend without holding a thread; database and
+        boundary lookups run through sync_to_async.
+        """
+        with span('resolve'):
+            return await self._resolve_structured_async(street, postal_code, city, country)
+
+    async def _resolve_structured_async(
+        self,
+        street: str,
+        postal_code: str,
+        city: str,
+        country: str
+    ) -> Dict:
+        result = self._empty_result()
+
+        street = (street or '').strip()
+        postal_code = (postal_code or '').strip()
+        city = (city or '').strip()
+        address = format_address(street, postal_code, city)
+        if not address:
+            logger.warning("Empty address provided to WahlkreisResolver")
+            return result
+
+        wahlkreis_result = None
+        if not street:
+            wahlkreis_result = await sync_to_async(self._postal_code_result)(postal_code, country)
+        if wahlkreis_result is None:
+            geocoded = await self.geocoder.geocode_structured_async(street, postal_code, city, country)
+            wahlkreis_result = await sync_to_async(self._locate)(geocoded)
+            if wahlkreis_result is None:
+                return result
+
+        return await sync_to_async(self._build_result)(result, wahlkreis_result, address)
+
+    def resolve_coordinates(
+        self,
+        latitude: Optional[float],
+        longitude: Optional[float],
+        address: str = ''
+    ) -> Dict:
+        """
+        Resolve coordinates that were already geocoded, e.g. by a GeocodeJob.
+
+        Returns the same structure as resolve().
+        """
+        result = self._empty_result()
+        wahlkreis_result = self._locate((latitude, longitude, True, None))
+        if wahlkreis_result is None:
+            return result
+        return self._build_result(result, wahlkreis_result, address or f"{latitude}, {longitude}")
+
+    def _postal_code_result(self, postal_code: str, country: str) -> Optional[Dict]:
+        """Return a locate()-style result for an unambiguous German postal code, else None."""
+        if (country or 'DE').upper() != 'DE':
+            return None
+        with span('resolve.postal_code'):
+            mapping = self._postal_code_mapping(postal_code)
+        if mapping is None or mapping.is_ambiguous:
+            return None
+        logger.debug(f"Resolved postal code {postal_code} from postal code table, skipping geocoding")
+        return mapping.as_locate_result()
+
+    def _locate(self, geocoded) -> Optional[Dict]:
+        """Look up the Wahlkreise for an AddressGeocoder result, or None if either step fails."""
+        lat, lon, success, error = geocoded
 
         if not success or lat is None or lon is None:
             logger.warning(f"Geocoding failed: {error}")
-            return result
+            return None
 
-        # Step 2: Look up Wahlkreise (federal and state)
-        wahlkreis_result = self.wahlkreis_locator.locate(lat, lon)
+        locator = self.wahlkreis_locator
+        with span('locator.locate'):
+            wahlkreis_result = locator.locate(lat, lon)
 
         if not wahlkreis_result:
             logger.warning(f"No Wahlkreis found for coordinates {lat}, {lon}")
-            return result
+            return None
+
+        return wahlkreis_result
 
+    def resolve_postal_code(
+        self,
+        postal_code: str,
+        country: str = 'DE',
+        geocode_ambiguous: bool = True
+    ) -> Dict:
+        """
+        Resolve a postal code alone, using the PostalCodeWahlkreis table.
+
+        Unambiguous postal codes are answered without geocoding. Ambiguous or
+        unknown ones are geocoded to the postal code area's centre if
+        geocode_ambiguous is True, otherwise an empty result is returned.
+
+        Returns the same structure as resolve(), plus 'postal_code_ambiguous'
+        (None when the postal code is not in the table).
+        """
+        postal_code = (postal_code or '').strip()
+        mapping = self._postal_code_mapping(postal_code)
+
+        if mapping is not None and not mapping.is_ambiguous:
+            result = self._build_result(self._empty_result(), mapping.as_locate_result(), postal_code)
+        elif geocode_ambiguous and postal_code:
+            result = self.resolve(f"{postal_code}, Deutschland", country)
+        else:
+            result = self._empty_result()
+
+        result['postal_code_ambiguous'] = mapping.is_ambiguous if mapping is not None else None
+        return result
+
+    @staticmethod
+    def _empty_result() -> Dict:
+        return {
+            'federal_wahlkreis_number': None,
+            'state_wahlkreis_number': None,
+            'eu_wahlkreis': 'DE',
+            'constituencies': []
+        }
+
+    @staticmethod
+    def _postal_code_mapping(postal_code: str) -> Optional[PostalCodeWahlkreis]:
+        if not postal_code:
+            return None
+        return PostalCodeWahlkreis.objects.filter(postal_code=postal_code).first()
+
+    @span('resolve.constituencies')
+    def _build_result(self, result: Dict, wahlkreis_result: Dict, address: str) -> Dict:
+        """Fill Wahlkreis numbers and Constituency objects from a locate()-style result."""
         federal_data = wahlkreis_result.get('federal')
         state_data = wahlkreis_result.get('state')
 
         if not federal_data:
-            logger.warning(f"No federal Wahlkreis found for coordinates {lat}, {lon}")
+            logger.warning(f"No federal Wahlkreis found for {address}")
             return result
 
         # Extract federal Wahlkreis data
@@ -112,36 +293,23 @@ class WahlkreisResolver:
             state_wahlkreis_number = f"{state_land_code}-{str(state_wkr_nr).zfill(4)}"
             result['state_wahlkreis_number'] = state_wahlkreis_number
 
-        # Step 3: Find constituencies by list_id
+        # Step 3: Find constituencies by list_id (served from memory, no queries)
         constituencies = []
 
         # Add federal district constituency
-        federal_constituencies = list(
-            Constituency.objects.filter(
-                list_id=federal_wahlkreis_number,
-                scope='FEDERAL_DISTRICT'
-            )
+        constituencies.extend(
+            ConstituencyDirectory.by_list_id('FEDERAL_DISTRICT', federal_wahlkreis_number)
         )
-        constituencies.extend(federal_constituencies)
 
         # Add state district constituency if we have state Wahlkreis data
         if state_data:
-            state_wahlkreis_number = result['state_wahlkreis_number']
-            state_district_constituencies = list(
-                Constituency.objects.filter(
-                    list_id=state_wahlkreis_number,
-                    scope='STATE_DISTRICT'
-                )
+            constituencies.extend(
+                ConstituencyDirectory.by_list_id('STATE_DISTRICT', result['state_wahlkreis_number'])
             )
-            constituencies.extend(state_district_constituencies)
 
         # Add federal state list constituency
         if normalized_state:
-            federal_state_list_constituencies = Constituency.objects.filter(
-                scope='FEDERAL_STATE_LIST',
-                metadata__state=normalized_state
-            )
-            constituencies.extend(federal_state_list_constituencies)
+            constituencies.extend(ConstituencyDirectory.federal_state_lists(normalized_state))
 
         result['constituencies'] = constituencies
 
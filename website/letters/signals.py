@@ -0,0 +1,39 @@
+# ABOUTME: Signal receivers that keep process-level caches consistent with the database.
+# ABOUTME: Connected in LettersConfig.ready().
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Committee, Constituency, GeocodeCache, Parliament, ParliamentTerm, Tag, TopicArea
+from .services.constituency_directory import ConstituencyDirectory
+from .services.geocoding_cache import GeocodeResultCache
+from .services.ranking import RankingIndex
+from .services.tag_index import TagIndex
+from .services.versioning import bump_data_version
+
+
+@receiver([post_save, post_delete], sender=GeocodeCache)
+def invalidate_geocode_result(sender, instance, **kwargs):
+    """Drop the row's address from the faster tiers so they never outlive a DB change."""
+    GeocodeResultCache.invalidate(instance.address_hash)
+
+
+@receiver([post_save, post_delete], sender=Constituency)
+@receiver([post_save, post_delete], sender=ParliamentTerm)
+@receiver([post_save, post_delete], sender=Parliament)
+def invalidate_constituency_directory(sender, instance, **kwargs):
+    """Rebuild the constituency directory (which caches related terms and parliaments) on next use."""
+    bump_data_version(ConstituencyDirectory.VERSION_KEY)
+
+
+@receiver([post_save, post_delete], sender=TopicArea)
+@receiver([post_save, post_delete], sender=Committee)
+def invalidate_ranking_index(sender, instance, **kwargs):
+    """Have workers check the ranking index against the tables on next use."""
+    bump_data_version(RankingIndex.VERSION_KEY)
+
+
+@receiver([post_save, post_delete], sender=Tag)
+def invalidate_tag_index(sender, instance, **kwargs):
+    """Rebuild the tag index on next use."""
+    bump_data_version(TagIndex.VERSION_KEY)
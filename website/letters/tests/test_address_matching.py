@@ -2,10 +2,14 @@
 # ABOUTME: Covers AddressGeocoder, WahlkreisLocator, and ConstituencyLocator services.
 
 import os
-from django.test import TestCase
+import tempfile
+
+import requests
+from django.test import TestCase, override_settings
 from unittest.mock import patch, MagicMock
 from letters.services import AddressGeocoder, WahlkreisLocator
 from letters.services.wahlkreis import WahlkreisResolver
+from letters.services.geocoding_cache import GeocodeResultCache
 from letters.models import GeocodeCache
 
 
@@ -53,6 +57,10 @@ class AddressGeocodingTests(TestCase):
     """Test address geocoding with OSM Nominatim."""
 
     def setUp(self):
+        GeocodeResultCache.clear()
+        # Fresh rate-limiter state, so a test doesn't wait for the previous test's lookups
+        rate_limit_dir = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(GEOCODER_RATE_LIMIT_DIR=rate_limit_dir))
         self.geocoder = AddressGeocoder()
 
     def test_geocode_success_with_mocked_api(self):
@@ -124,7 +132,7 @@ class AddressGeocodingTests(TestCase):
     def test_geocode_handles_api_error(self):
         """Test graceful handling of Nominatim API errors."""
         with patch('requests.get') as mock_get:
-            mock_get.side_effect = Exception("API Error")
+            mock_get.side_effect = requests.ConnectionError("API Error")
 
             # Capture expected warning log
             with self.assertLogs('letters.services', level='WARNING') as log_context:
@@ -140,6 +148,241 @@ class AddressGeocodingTests(TestCase):
             self.assertEqual(len(log_context.output), 1)
             self.assertIn('Geocoding failed', log_context.output[0])
 
+    def test_repeat_lookups_served_from_memory_tier(self):
+        """Test that a repeated lookup skips both the API and the database."""
+        address = 'Platz der Republik 1, 11011 Berlin'
+        cache_key = self.geocoder._generate_cache_key(address, 'DE')
+        GeocodeCache.objects.create(address_hash=cache_key, latitude=52.5, longitude=13.4)
+
+        with patch('requests.get') as mock_get:
+            self.geocoder.geocode(address)
+            with self.assertNumQueries(0):
+                lat, lon, success, _error = self.geocoder.geocode(address)
+
+        mock_get.assert_not_called()
+        self.assertEqual((lat, lon, success), (52.5, 13.4, True))
+        stats = GeocodeResultCache.stats()
+        self.assertEqual(stats['memory']['hits'], 1)
+        self.assertEqual(stats['database']['hits'], 1)
+
+    def test_negative_results_expire_sooner_than_positive(self):
+        """Test that failed lookups use the shorter negative TTL in the memory tier."""
+        from django.test import override_settings
+
+        with override_settings(GEOCODE_CACHE_TTL=3600, GEOCODE_NEGATIVE_CACHE_TTL=60):
+            with patch('letters.services.geocoding_cache.time.monotonic', return_value=1000.0):
+                GeocodeResultCache.set('ok', (52.0, 13.0, True, None), defaults={'city': 'ok'})
+                GeocodeResultCache.set('bad', (None, None, False, 'Address not found'), defaults={'city': 'bad', 'success': False})
+
+            with patch('letters.services.geocoding_cache.time.monotonic', return_value=1000.0 + 120):
+                memory = GeocodeResultCache._memory_tier()
+                self.assertIsNotNone(memory.get('ok'))
+                self.assertIsNone(memory.get('bad'))
+
+    def test_shared_tier_populated_when_configured(self):
+        """Test that results are shared through the configured Django cache alias."""
+        from django.core.cache import caches
+        from django.test import override_settings
+
+        address = 'Rathausmarkt 1, 20095 Hamburg'
+        cache_key = self.geocoder._generate_cache_key(address, 'DE')
+        with override_settings(GEOCODE_SHARED_CACHE_ALIAS='default'):
+            with patch('requests.get') as mock_get:
+                mock_response = MagicMock()
+                mock_response.json.return_value = [{'lat': '53.55', 'lon': '9.99'}]
+                mock_get.return_value = mock_response
+                self.geocoder.geocode(address)
+
+            result, retry_after = caches['default'].get(GeocodeResultCache.KEY_PREFIX + cache_key)
+            self.assertEqual(tuple(result), (53.55, 9.99, True, None))
+            self.assertIsNone(retry_after)
+
+            # Another worker: empty memory tier, answered by the shared tier
+            GeocodeResultCache.clear()
+            with self.assertNumQueries(0):
+                self.assertEqual(GeocodeResultCache.get(cache_key), (53.55, 9.99, True, None))
+            caches['default'].clear()
+
+    def test_shared_failure_promoted_until_retry_after_only(self):
+        """Test that a failure from the shared tier stays in memory no longer than its retry_after."""
+        from datetime import timedelta
+        from django.core.cache import caches
+        from django.test import override_settings
+        from django.utils import timezone
+
+        failure = (None, None, False, 'Geocoding API error: timed out')
+        with override_settings(GEOCODE_SHARED_CACHE_ALIAS='default', GEOCODE_NEGATIVE_CACHE_TTL=300):
+            caches['default'].set(
+                GeocodeResultCache.KEY_PREFIX + 'failed',
+                (failure, timezone.now() + timedelta(seconds=60)),
+                300
+            )
+
+            with patch('letters.services.geocoding_cache.time.monotonic', return_value=1000.0):
+                self.assertEqual(GeocodeResultCache.get('failed'), failure)
+            with patch('letters.services.geocoding_cache.time.monotonic', return_value=1000.0 + 90):
+                self.assertIsNone(GeocodeResultCache._memory_tier().get('failed'))
+            caches['default'].clear()
+
+    def test_transient_failures_back_off_exponentially(self):
+        """Test that API errors are cached with a growing retry delay."""
+        from datetime import timedelta
+        from django.test import override_settings
+        from django.utils import timezone
+
+        address = 'Timeout Street 1, 10115 Berlin'
+        cache_key = self.geocoder._generate_cache_key(address, 'DE')
+
+        with override_settings(GEOCODE_RETRY_BASE_SECONDS=60, GEOCODE_RETRY_MAX_SECONDS=3600):
+            with patch('requests.get', side_effect=requests.Timeout('timed out')):
+                with self.assertLogs('letters.services', level='WARNING'):
+                    self.geocoder.geocode(address)
+                entry = GeocodeCache.objects.get(address_hash=cache_key)
+                self.assertEqual(entry.failure_kind, 'TRANSIENT')
+                self.assertEqual(entry.failure_count, 1)
+                self.assertLess(entry.retry_after, timezone.now() + timedelta(seconds=61))
+
+                # Expire the entry; the next lookup retries and doubles the delay
+                GeocodeCache.objects.filter(pk=entry.pk).update(retry_after=timezone.now())
+                GeocodeResultCache.clear()
+                with self.assertLogs('letters.services', level='WARNING'):
+                    self.geocoder.geocode(address)
+
+        entry.refresh_from_db()
+        self.assertEqual(entry.failure_count, 2)
+        self.assertGreater(entry.retry_after, timezone.now() + timedelta(seconds=100))
+
+    def test_client_error_is_not_transient(self):
+        """Test that a 4xx response is cached as a permanent failure, not retried with backoff."""
+        from datetime import timedelta
+        from django.utils import timezone
+
+        response = requests.Response()
+        response.status_code = 400
+        with patch('requests.get', return_value=response):
+            with self.assertLogs('letters.services', level='WARNING'):
+                _lat, _lon, success, _error = self.geocoder.geocode('Bad Request 1, 10115 Berlin')
+
+        self.assertFalse(success)
+        entry = GeocodeCache.objects.get()
+        self.assertEqual(entry.failure_kind, 'PERMANENT')
+        self.assertGreater(entry.retry_after, timezone.now() + timedelta(days=1))
+
+    def test_server_error_is_transient(self):
+        """Test that a 5xx response is retried with backoff."""
+        response = requests.Response()
+        response.status_code = 503
+        with patch('requests.get', return_value=response):
+            with self.assertLogs('letters.services', level='WARNING'):
+                self.geocoder.geocode('Overloaded 1, 10115 Berlin')
+
+        self.assertEqual(GeocodeCache.objects.get().failure_kind, 'TRANSIENT')
+
+    def test_malformed_payload_is_not_transient(self):
+        """Test that a response without coordinates is cached as a permanent failure."""
+        with patch('requests.get') as mock_get:
+            mock_get.return_value.json.return_value = [{'display_name': 'Somewhere'}]
+            with self.assertLogs('letters.services', level='WARNING'):
+                _lat, _lon, success, _error = self.geocoder.geocode('Broken 1, 10115 Berlin')
+
+        self.assertFalse(success)
+        self.assertEqual(GeocodeCache.objects.get().failure_kind, 'PERMANENT')
+
+    def test_not_found_cached_until_long_retry(self):
+        """Test that "not found" results are kept much longer than transient errors."""
+        from datetime import timedelta
+        from django.utils import timezone
+
+        with patch('requests.get') as mock_get:
+            mock_response = MagicMock()
+            mock_response.json.return_value = []
+            mock_get.return_value = mock_response
+            self.geocoder.geocode('Nowhere 1, 99999 Nirgendwo')
+
+        entry = GeocodeCache.objects.get()
+        self.assertEqual(entry.failure_kind, 'NOT_FOUND')
+        self.assertGreater(entry.retry_after, timezone.now() + timedelta(days=7))
+
+    def test_expired_failure_is_geocoded_again(self):
+        """Test that a failure past retry_after no longer short-circuits geocoding."""
+        from datetime import timedelta
+        from django.utils import timezone
+
+        address = 'Platz der Republik 1, 11011 Berlin'
+        GeocodeCache.objects.create(
+            address_hash=self.geocoder._generate_cache_key(address, 'DE'),
+            city=address,
+            success=False,
+            error_message='Geocoding API error: 503',
+            failure_kind='TRANSIENT',
+            failure_count=3,
+            retry_after=timezone.now() - timedelta(seconds=1)
+        )
+
+        with patch('requests.get') as mock_get:
+            mock_response = MagicMock()
+            mock_response.json.return_value = [{'lat': '52.5186', 'lon': '13.3761'}]
+            mock_get.return_value = mock_response
+            _lat, _lon, success, _error = self.geocoder.geocode(address)
+
+        self.assertTrue(success)
+        entry = GeocodeCache.objects.get()
+        self.assertTrue(entry.success)
+        self.assertEqual(entry.failure_count, 0)
+        self.assertIsNone(entry.retry_after)
+
+    def test_address_variants_share_cache_entry(self):
+        """Test that case, spacing and Straße/Str. variants hit the same cache entry."""
+        with patch('requests.get') as mock_get:
+            mock_response = MagicMock()
+            mock_response.status_code = 200
+            mock_response.json.return_value = [{'lat': '52.5170', 'lon': '13.3889'}]
+            mock_get.return_value = mock_response
+
+            self.geocoder.geocode('Unter den Linden 1, 10117 Berlin')
+            _lat, _lon, success, _error = self.geocoder.geocode('unter den linden 1,10117  berlin')
+
+            self.assertEqual(mock_get.call_count, 1)
+            self.assertTrue(success)
+            self.assertEqual(
+                self.geocoder._generate_cache_key('Hauptstraße 5, 80331 München', 'DE'),
+                self.geocoder._generate_cache_key('Hauptstr. 5, 80331 Muenchen', 'de')
+            )
+
+    def test_rehash_migration_merges_variants(self):
+        """Test that the rehash migration recomputes keys and keeps the successful duplicate."""
+        import hashlib
+        import importlib
+        from django.apps import apps
+
+        migration = importlib.import_module('letters.migrations.0021_rehash_geocode_cache_keys')
+
+        def legacy_key(address):
+            return hashlib.sha256(f"{address}|DE".encode('utf-8')).hexdigest()
+
+        GeocodeCache.objects.create(
+            address_hash=legacy_key('Hauptstr. 5, 80331 München'),
+            city='Hauptstr. 5, 80331 München',
+            success=False,
+            error_message='Address not found'
+        )
+        GeocodeCache.objects.create(
+            address_hash=legacy_key('hauptstraße 5,80331 münchen'),
+            city='hauptstraße 5,80331 münchen',
+            latitude=48.1,
+            longitude=11.5
+        )
+
+        with patch('builtins.print'):
+            migration.rehash_geocode_cache(apps, None)
+
+        entry = GeocodeCache.objects.get()
+        self.assertTrue(entry.success)
+        self.assertEqual(
+            entry.address_hash,
+            self.geocoder._generate_cache_key('Hauptstraße 5, 80331 München', 'DE')
+        )
+
 
 class WahlkreisLocationTests(TestCase):
     """Test point-in-polygon constituency matching."""
@@ -188,6 +431,207 @@ class WahlkreisLocationTests(TestCase):
         result = locator.locate(51.5074, -0.1278)
         self.assertIsNone(result)
 
+    def test_spatial_index_matches_linear_scan(self):
+        """Test that STRtree lookups agree with testing every polygon."""
+        from shapely.geometry import Point
+
+        locator = WahlkreisLocator(self.fixture_path)
+        minx, miny, maxx, maxy = locator.constituencies.tree.geometries[0].bounds
+
+        for step in range(10):
+            latitude = miny + (maxy - miny) * step / 10
+            longitude = minx + (maxx - minx) * step / 10
+            point = Point(longitude, latitude)
+            expected = next(
+                (
+                    feature.properties['WKR_NR']
+                    for feature in locator.constituencies
+                    if feature.geometry.contains(point)
+                ),
+                None
+            )
+            federal = locator._locate_detailed(latitude, longitude)['federal']
+            self.assertEqual(federal['wkr_nr'] if federal else None, expected)
+
+    def test_simplified_tiers_agree_with_exact_geometry(self):
+        """Test that inner/outer tiers bound each polygon and never change a lookup result."""
+        import numpy as np
+        import shapely
+        from letters.geo import BoundaryIndex
+
+        # A jagged polygon with many vertices, like a detailed state boundary
+        angles = np.linspace(0, 2 * np.pi, 2000)
+        radii = 0.1 * (1 + 0.3 * np.sin(9 * angles))
+        star = shapely.Polygon(np.column_stack([10 + radii * np.cos(angles), 50 + radii * np.sin(angles)]))
+
+        tiered = BoundaryIndex.from_geometries([{'WKR_NR': 1}], [star], simplify_tolerance=0.0005)
+        exact = BoundaryIndex.from_geometries([{'WKR_NR': 1}], [star], simplify_tolerance=0)
+
+        inner, outer = tiered.tiers
+        self.assertTrue(star.contains(inner[0]))
+        self.assertTrue(outer[0].covers(star))
+        self.assertLess(shapely.get_num_coordinates(inner[0]), 500)
+
+        xs, ys = np.meshgrid(np.linspace(9.85, 10.15, 60), np.linspace(49.85, 50.15, 60))
+        points = shapely.points(xs.ravel(), ys.ravel())
+        for point in points:
+            self.assertEqual(tiered.find(point) is None, exact.find(point) is None)
+        self.assertEqual(tiered.find_many(points).tolist(), exact.find_many(points).tolist())
+
+        self.assertGreater(tiered.tier_stats['inner'], 0)
+        self.assertGreater(tiered.tier_stats['outer'], 0)
+        self.assertLess(tiered.tier_stats['exact'], exact.tier_stats['exact'] / 4)
+
+    def test_compiled_artifact_stores_simplified_tiers(self):
+        """Test that loading an artifact reuses the stored tiers instead of recomputing them."""
+        import tempfile
+        from pathlib import Path
+        from letters import geo
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            artifact_path = Path(tmpdir) / 'boundaries.bin'
+            geo.BoundaryArtifact.compile({Path(self.fixture_path): None}, artifact_path, simplify_tolerance=0.001)
+            artifact = geo.BoundaryArtifact(artifact_path)
+
+            with patch.object(geo, 'simplified_tiers') as mock_tiers:
+                index = artifact.load_index(Path(self.fixture_path), simplify_tolerance=0.001)
+            mock_tiers.assert_not_called()
+            self.assertIsNotNone(index.tiers)
+
+            # A different tolerance recomputes them
+            index = artifact.load_index(Path(self.fixture_path), simplify_tolerance=0.002)
+            self.assertEqual(index.simplify_tolerance, 0.002)
+
+    def test_cell_cache_serves_repeat_lookups_in_interior_cells(self):
+        """Test that a second lookup in the same grid cell skips the polygon tests."""
+        from letters.geo import BoundaryIndex
+
+        WahlkreisLocator.clear_cell_cache()
+        locator = WahlkreisLocator(self.fixture_path)
+        expected = locator._locate_exact(52.5186, 13.3761)
+
+        # The first lookup in an interior cell costs one exact test, no more
+        with patch.object(BoundaryIndex, 'find', autospec=True, side_effect=BoundaryIndex.find) as mock_find:
+            first = locator.locate(52.5186, 13.3761)
+        self.assertEqual(mock_find.call_count, 1 + len(locator.state_constituencies))
+
+        with patch.object(BoundaryIndex, 'find') as mock_find:
+            second = locator.locate(52.51861, 13.37611)
+        mock_find.assert_not_called()
+
+        self.assertEqual(first, expected)
+        self.assertEqual(second, expected)
+        self.assertEqual(WahlkreisLocator.cell_cache_stats()['hits'], 1)
+        self.assertEqual(WahlkreisLocator.cell_cache_stats()['misses'], 1)
+
+        # Returned results are copies of the cached entry
+        second['federal']['wkr_nr'] = -1
+        self.assertEqual(locator.locate(52.5186, 13.3761), expected)
+
+    def test_cell_cache_falls_back_to_exact_test_on_boundary_cells(self):
+        """Test that cells crossing a polygon edge are flagged and resolved exactly."""
+        locator = WahlkreisLocator(self.fixture_path)
+        WahlkreisLocator.clear_cell_cache()
+        minx, miny, _maxx, maxy = locator.constituencies[0].geometry.bounds
+
+        # Just inside and just outside the western edge, within one cell
+        latitude = (miny + maxy) / 2
+        inside = locator.locate(latitude, minx + 0.00002)
+        outside = locator.locate(latitude, minx - 0.00002)
+
+        self.assertEqual(inside['federal'], locator._federal_result(locator.constituencies[0]))
+        self.assertIsNone(outside)
+        self.assertGreaterEqual(WahlkreisLocator.cell_cache_stats()['boundary'], 1)
+
+    def test_boundary_cells_are_flagged_once_on_first_lookup(self):
+        """Test that attaching a locator is cheap and boundary cells are computed by the first lookup only."""
+        from letters.geo import BoundaryIndex
+
+        WahlkreisLocator.clear_cell_cache()
+        with patch.object(
+            BoundaryIndex, 'boundary_cells', autospec=True, side_effect=BoundaryIndex.boundary_cells,
+        ) as mock_cells:
+            locator = WahlkreisLocator(self.fixture_path)
+            self.assertEqual(mock_cells.call_count, 0)
+            locator.locate(52.5186, 13.3761)
+            self.assertEqual(mock_cells.call_count, 1 + len(locator.state_constituencies))
+            WahlkreisLocator(self.fixture_path).locate(53.5511, 9.9937)
+        self.assertEqual(mock_cells.call_count, 1 + len(locator.state_constituencies))
+
+    def test_boundary_cells_cover_every_cell_an_edge_crosses(self):
+        """Test that boundary_cells flags each cell along an edge, including diagonal corners."""
+        import numpy as np
+        from shapely.geometry import Polygon
+        from letters.geo import boundary_cells, cell_key
+
+        # A triangle whose diagonal edge cuts through cell corners
+        triangle = Polygon([(0.0, 0.0), (0.01, 0.0), (0.0, 0.01)])
+        flagged = set(boundary_cells([triangle], 0.001).tolist())
+
+        for step in range(10):
+            self.assertIn(cell_key(0, step), flagged)          # southern edge
+            self.assertIn(cell_key(step, 0), flagged)          # western edge
+            self.assertIn(cell_key(step, 9 - step), flagged)   # hypotenuse
+        self.assertNotIn(cell_key(2, 2), flagged)
+        self.assertNotIn(cell_key(20, 20), flagged)
+        self.assertEqual(len(boundary_cells([], 0.001)), 0)
+        self.assertEqual(boundary_cells([triangle], 0.001).dtype, np.int64)
+
+    def test_locate_many_matches_single_lookups_in_input_order(self):
+        """Test that batch lookups return the same results as locate(), aligned with the input."""
+        locator = WahlkreisLocator(self.fixture_path)
+        coords = [
+            (53.5511, 9.9937),   # Hamburg
+            (48.8566, 2.3522),   # Paris (outside)
+            (52.5186, 13.3761),  # Berlin
+            (48.15, 11.6),       # München
+        ]
+
+        results = locator.locate_many(coords)
+
+        self.assertEqual(len(results), len(coords))
+        self.assertIsNone(results[1])
+        for (latitude, longitude), result in zip(coords, results):
+            self.assertEqual(result, locator.locate(latitude, longitude))
+
+    def test_locator_shares_boundary_index_with_repository(self):
+        """Test that the locator and BoundaryRepository use one cached index per file."""
+        from pathlib import Path
+        from letters.geo import BoundaryRepository
+
+        first = WahlkreisLocator(self.fixture_path)
+        second = WahlkreisLocator(self.fixture_path)
+
+        self.assertIs(first.constituencies, second.constituencies)
+        self.assertIs(
+            first.constituencies,
+            BoundaryRepository.get_index(Path(self.fixture_path))
+        )
+
+    def test_locator_loads_compiled_boundary_artifact(self):
+        """Test that a compiled artifact replaces GeoJSON parsing when present."""
+        import tempfile
+        from pathlib import Path
+        from django.test import override_settings
+        from letters.geo import BoundaryArtifact, BoundaryIndex, BoundaryRepository
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            artifact_path = Path(tmpdir) / 'boundaries.bin'
+            BoundaryArtifact.compile({Path(self.fixture_path): None}, artifact_path)
+
+            with override_settings(CONSTITUENCY_BOUNDARIES_ARTIFACT_PATH=artifact_path):
+                BoundaryRepository.clear()
+                try:
+                    with patch.object(BoundaryIndex, 'from_geojson') as mock_from_geojson:
+                        locator = WahlkreisLocator(self.fixture_path)
+                        result = locator.locate(52.5186, 13.3761)
+                    mock_from_geojson.assert_not_called()
+                finally:
+                    BoundaryRepository.clear()
+
+        self.assertEqual(len(locator.constituencies), 3)
+        self.assertIn('Berlin', result['federal']['land_name'])
+
     def test_locator_loads_available_state_files(self):
         """Test WahlkreisLocator loads state GeoJSON files if they exist."""
         import tempfile
@@ -231,5 +675,44 @@ class WahlkreisLocationTests(TestCase):
             self.assertIn('BW', locator.state_constituencies)
             self.assertEqual(len(locator.state_constituencies['BW']), 1)
 
+    def test_state_files_reprojected_to_wgs84_at_load(self):
+        """Test that projected state files are located with plain WGS84 coordinates."""
+        import tempfile
+        import shutil
+        import json
+        from pathlib import Path
+        from pyproj import Transformer
+
+        # Square around München (11.5-11.7 E, 48.1-48.2 N) in Gauss-Krüger zone 4
+        transformer = Transformer.from_crs('EPSG:4326', 'EPSG:31468', always_xy=True)
+        ring = [
+            list(transformer.transform(lon, lat))
+            for lon, lat in [(11.5, 48.1), (11.7, 48.1), (11.7, 48.2), (11.5, 48.2), (11.5, 48.1)]
+        ]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            federal_path = tmpdir_path / 'wahlkreise.geojson'
+            shutil.copy(self.fixture_path, federal_path)
+
+            state_data = {
+                "type": "FeatureCollection",
+                "features": [{
+                    "type": "Feature",
+                    "geometry": {"type": "Polygon", "coordinates": [ring]},
+                    "properties": {"SKR_NR": 108, "SKR_NAME": "München-Mitte"}
+                }]
+            }
+            (tmpdir_path / 'wahlkreise_by.geojson').write_text(json.dumps(state_data))
+
+            locator = WahlkreisLocator(geojson_path=str(federal_path))
+            minx, _miny, _maxx, maxy = locator.state_constituencies['BY'][0].geometry.bounds
+            self.assertAlmostEqual(minx, 11.5, places=3)
+            self.assertAlmostEqual(maxy, 48.2, places=3)
+
+            result = locator.locate(48.15, 11.6)
+            self.assertEqual(result['state']['wkr_nr'], 108)
+            self.assertEqual(result['state']['land_code'], 'BY')
+
 
 # End of file
@@ -0,0 +1,72 @@
+# ABOUTME: Tests for the boundary_report command's integrity checks and repaired output.
+# ABOUTME: Uses small synthetic GeoJSON files with a self-intersecting and an overlapping district.
+
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+import shapely
+from django.core.management import call_command
+from django.test import TestCase
+from shapely.geometry import shape
+
+
+def _feature(number, coordinates):
+    return {
+        'type': 'Feature',
+        'properties': {'WKR_NR': number, 'WKR_NAME': f'Wahlkreis {number}', 'LAND_NAME': 'Berlin'},
+        'geometry': {'type': 'Polygon', 'coordinates': [coordinates]},
+    }
+
+
+class BoundaryReportCommandTests(TestCase):
+    """Test the boundary_report management command."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.geojson_path = Path(self.tmpdir.name) / 'wahlkreise.geojson'
+        self.geojson_path.write_text(json.dumps({
+            'type': 'FeatureCollection',
+            'features': [
+                _feature(1, [[13.0, 52.0], [13.2, 52.0], [13.2, 52.2], [13.0, 52.2], [13.0, 52.0]]),
+                # Overlaps district 1 by 0.05°
+                _feature(2, [[13.15, 52.0], [13.4, 52.0], [13.4, 52.2], [13.15, 52.2], [13.15, 52.0]]),
+                # Bow tie: self-intersecting ring
+                _feature(3, [[13.5, 52.0], [13.7, 52.2], [13.7, 52.0], [13.5, 52.2], [13.5, 52.0]]),
+            ],
+        }))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_reports_invalid_geometries_and_overlaps(self):
+        out = StringIO()
+        call_command('boundary_report', '--geojson', str(self.geojson_path), stdout=out)
+        output = out.getvalue()
+
+        self.assertIn('Features:        3', output)
+        self.assertIn('Invalid:         1', output)
+        self.assertIn('3 Wahlkreis 3: Self-intersection', output)
+        self.assertIn('Overlaps:        1 pairs', output)
+        self.assertIn('1 files have invalid geometries, gaps or overlaps', output)
+
+    def test_writes_repaired_wgs84_copy(self):
+        output_dir = Path(self.tmpdir.name) / 'repaired'
+        call_command(
+            'boundary_report',
+            '--geojson', str(self.geojson_path),
+            '--write-repaired', str(output_dir),
+            '--simplify', '0.001',
+            stdout=StringIO()
+        )
+
+        data = json.loads((output_dir / 'wahlkreise.geojson').read_text())
+        geometries = [shape(feature['geometry']) for feature in data['features']]
+        self.assertEqual(len(geometries), 3)
+        self.assertTrue(all(shapely.is_valid(geometries)))
+        self.assertEqual(data['features'][2]['properties']['WKR_NR'], 3)
+        self.assertIn('CRS84', data['crs']['properties']['name'])
+
+
+# End of file
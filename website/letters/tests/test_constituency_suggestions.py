@@ -9,7 +9,7 @@ from letters.services import ConstituencySuggestionService
 class ConstituencySuggestionTests(TestCase):
     """Test constituency suggestion combining topic and address matching."""
 
-    @patch('letters.services.AddressGeocoder.geocode')
+    @patch('letters.services.AddressGeocoder.geocode_structured')
     def test_suggest_with_title_and_address(self, mock_geocode):
         """Test suggestions work with both title and address."""
         # Mock geocoding
@@ -0,0 +1,237 @@
+# ABOUTME: Tests for precomputed representative expertise profiles and expert ranking built on them.
+# ABOUTME: Covers profile weights and topic links, the in-memory index, and the refresh after syncs.
+
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from letters.models import (
+    Committee,
+    CommitteeMembership,
+    Constituency,
+    Parliament,
+    ParliamentTerm,
+    Representative,
+    RepresentativeExpertise,
+)
+from letters.services import ConstituencySuggestionService, LocationContext
+from letters.services.abgeordnetenwatch_api_client import AbgeordnetenwatchAPI
+from letters.services.expertise import ExpertiseIndex, ExpertiseProfileBuilder
+from letters.services.ranking import RankingIndex
+from letters.services.representative_sync import RepresentativeSyncService
+from letters.services.text_analysis import get_analyzer
+from letters.tests.test_fixtures import RankingIndexMixin, create_topic
+
+
+def stem(word):
+    return get_analyzer().terms(word)[0]
+
+
+class ExpertiseTestCase(RankingIndexMixin, TestCase):
+    INDEXES = (ExpertiseIndex, RankingIndex)
+
+    def setUp(self):
+        super().setUp()
+        self.parliament = Parliament.objects.create(
+            name='Bundestag', level='FEDERAL', legislative_body='Bundestag', region='DE'
+        )
+        self.term = ParliamentTerm.objects.create(parliament=self.parliament, name='21. Wahlperiode')
+        self.verkehr = create_topic('Verkehr', 'bahn, autobahn, nahverkehr')
+        self.verkehrsausschuss = Committee.objects.create(
+            parliament_term=self.term, name='Verkehrsausschuss', keywords='eisenbahn, autobahn, radverkehr'
+        )
+        self.verkehrsausschuss.topic_areas.add(self.verkehr)
+        self.bauausschuss = Committee.objects.create(
+            parliament_term=self.term, name='Bauausschuss', keywords='wohnungsbau, stadtentwicklung, radverkehr'
+        )
+
+    def create_representative(self, last_name, committees=(), focus_areas='', **kwargs):
+        representative = Representative.objects.create(
+            parliament=self.parliament,
+            parliament_term=self.term,
+            election_mode='FEDERAL_LIST',
+            external_id=f'rep-{last_name}',
+            first_name='Alex',
+            last_name=last_name,
+            focus_areas=focus_areas,
+            **kwargs
+        )
+        for committee, role in committees:
+            CommitteeMembership.objects.create(representative=representative, committee=committee, role=role)
+        return representative
+
+
+class ExpertiseProfileBuilderTests(ExpertiseTestCase):
+    """Test the term vectors and topic links of stored profiles."""
+
+    def test_profile_weights_each_source_once(self):
+        """Test that committee, topic and focus terms are weighted and linked once each."""
+        rep = self.create_representative(
+            'Schmidt',
+            committees=[(self.verkehrsausschuss, 'chair'), (self.bauausschuss, 'member')],
+            focus_areas='Radverkehr, Klimaschutz',
+        )
+        rep.topic_areas.add(self.verkehr)
+
+        ExpertiseProfileBuilder.refresh()
+
+        profile = RepresentativeExpertise.objects.get(representative=rep)
+        # Committee (5) once despite two committees, plus focus topic (2)
+        self.assertEqual(profile.terms[stem('Radverkehr')], 7.0)
+        # Committee keyword (5) plus topic area keyword (3)
+        self.assertEqual(profile.terms[stem('Autobahn')], 8.0)
+        self.assertEqual(profile.terms[stem('Klimaschutz')], 2.0)
+        membership = rep.committee_memberships.get(committee=self.verkehrsausschuss)
+        self.assertEqual(profile.topic_links, {str(self.verkehr.id): [3, membership.id]})
+
+    def test_refresh_skips_inactive_representatives(self):
+        """Test that refresh() stores profiles only for active representatives."""
+        self.create_representative('Aktiv', committees=[(self.bauausschuss, 'member')])
+        self.create_representative('Ehemalig', committees=[(self.bauausschuss, 'member')], is_active=False)
+
+        self.assertEqual(ExpertiseProfileBuilder.refresh(), 1)
+        self.assertEqual(
+            list(RepresentativeExpertise.objects.values_list('representative__last_name', flat=True)),
+            ['Aktiv'],
+        )
+
+    def test_sync_refreshes_profiles(self):
+        """Test that a representative sync rebuilds the expertise profiles."""
+        self.create_representative('Schmidt', committees=[(self.verkehrsausschuss, 'member')])
+
+        with patch.object(AbgeordnetenwatchAPI, 'get_parliaments', return_value=[]):
+            stats = RepresentativeSyncService.sync()
+
+        self.assertEqual(stats['expertise_profiles'], 1)
+        self.assertTrue(RepresentativeExpertise.objects.exists())
+
+
+class ExpertRankingTests(ExpertiseTestCase):
+    """Test expert suggestions scored from the expertise index."""
+
+    def suggest_experts(self, title, exclude_ids=()):
+        tokens = ConstituencySuggestionService._extract_tokens(title)
+        return ConstituencySuggestionService._get_expert_representatives(
+            tokens, [self.verkehr], location=None, parliament_ids=set(), exclude_ids=set(exclude_ids)
+        )
+
+    def test_experts_rank_by_role_then_terms(self):
+        """Test that topic-linked experts rank by role before term-only matches."""
+        member = self.create_representative('Adler', committees=[(self.verkehrsausschuss, 'member')])
+        chair = self.create_representative('Zander', committees=[(self.verkehrsausschuss, 'chair')])
+        unlinked = self.create_representative('Bauer', committees=[(self.bauausschuss, 'member')])
+        self.create_representative('Ohne')
+        ExpertiseProfileBuilder.refresh()
+
+        experts = self.suggest_experts('Mehr Radverkehr in Städten')
+
+        self.assertEqual(experts, [chair, member, unlinked])
+        self.assertEqual(experts[0].relevant_committees[0].committee, self.verkehrsausschuss)
+        self.assertEqual(experts[2].relevant_committees, [])
+
+    def test_committee_relevance_breaks_ties_between_equal_roles(self):
+        """Test that committee BM25 scores order experts with the same role."""
+        strassen = Committee.objects.create(parliament_term=self.term, name='Ausschuss A', keywords='autobahn')
+        schienen = Committee.objects.create(parliament_term=self.term, name='Ausschuss B', keywords='autobahn')
+        for committee in (strassen, schienen):
+            committee.topic_areas.add(self.verkehr)
+        adler = self.create_representative('Adler', committees=[(strassen, 'member')])
+        zander = self.create_representative('Zander', committees=[(schienen, 'member')])
+        ExpertiseProfileBuilder.refresh()
+
+        with patch.object(RankingIndex, 'score_committees', return_value={strassen.id: 1.0, schienen.id: 4.0}):
+            self.assertEqual(self.suggest_experts('Autobahn'), [zander, adler])
+        with patch.object(RankingIndex, 'score_committees', return_value={}):
+            self.assertEqual(self.suggest_experts('Autobahn'), [adler, zander])
+
+    def test_ranking_is_a_single_pass_over_the_index(self):
+        """Test that expert ranking loads only the experts it returns."""
+        for index in range(60):
+            self.create_representative(f'Mitglied{index:02d}', committees=[(self.verkehrsausschuss, 'member')])
+        chair = self.create_representative('Zander', committees=[(self.verkehrsausschuss, 'chair')])
+        ExpertiseProfileBuilder.refresh()
+        ExpertiseIndex.profiles()
+        RankingIndex.score_committees(['autobahn'])
+
+        # Representatives, their prefetched constituencies and topics, and the memberships shown
+        with self.assertNumQueries(4):
+            experts = self.suggest_experts('Autobahn')
+
+        self.assertEqual(experts[0], chair)
+        self.assertEqual(len(experts), 15)
+
+    def test_representatives_without_stored_profile_are_scored(self):
+        """Test that representatives added since the last sync get an in-memory profile."""
+        ExpertiseProfileBuilder.refresh()
+        newcomer = self.create_representative('Neu', committees=[(self.verkehrsausschuss, 'member')])
+        ExpertiseIndex.clear()
+
+        self.assertEqual(self.suggest_experts('Autobahn'), [newcomer])
+
+
+class RepresentativeRankingTests(ExpertiseTestCase):
+    """Test the combined geographic and expertise ranking over in-memory profiles."""
+
+    def rank(self, title, location, limit=3):
+        tokens = ConstituencySuggestionService._extract_tokens(title)
+        return ConstituencySuggestionService._rank_representatives(
+            tokens, [self.verkehr], location, limit=limit, primary_topic=self.verkehr
+        )
+
+    def test_direct_representative_outranks_experts_and_only_top_n_are_loaded(self):
+        """Test that the direct representative ranks first and only the top N are loaded."""
+        wahlkreis = Constituency.objects.create(
+            parliament_term=self.term, name='Berlin-Mitte', scope='FEDERAL_DISTRICT', metadata={'state': 'Berlin'}
+        )
+        berlin_list = Constituency.objects.create(
+            parliament_term=self.term, name='Berlin (Liste)', scope='FEDERAL_STATE_LIST', metadata={'state': 'Berlin'}
+        )
+        direct = self.create_representative('Zander')
+        direct.election_mode = 'DIRECT'
+        direct.save()
+        direct.constituencies.add(wahlkreis)
+        for index in range(20):
+            member = self.create_representative(f'Liste{index:02d}')
+            member.constituencies.add(berlin_list)
+        expert = self.create_representative('Adler', committees=[(self.verkehrsausschuss, 'chair')])
+        expert.constituencies.add(berlin_list)
+        ExpertiseProfileBuilder.refresh()
+        ExpertiseIndex.profiles()
+        location = LocationContext(postal_code='10117', state='Berlin', constituencies=[wahlkreis])
+
+        # Candidates, their constituency links, then the top representatives and their constituencies
+        with self.assertNumQueries(4):
+            ranked = self.rank('Autobahn', location)
+
+        self.assertEqual(ranked[:2], [direct, expert])
+        self.assertEqual(len(ranked), 3)
+        self.assertEqual(ranked[0].geo_score, 20)
+        self.assertEqual(ranked[0].suggested_constituency, wahlkreis)
+        self.assertEqual(ranked[1].geo_score, 0)
+        self.assertGreater(ranked[1].expertise_score, 0)
+        self.assertEqual(ranked[1].suggested_constituency, berlin_list)
+
+    def test_without_location_ranks_profiles_of_the_inferred_level(self):
+        """Test that without a location only the inferred level is ranked, by expertise."""
+        for index in range(10):
+            self.create_representative(f'Mitglied{index:02d}')
+        expert = self.create_representative('Zander', committees=[(self.verkehrsausschuss, 'member')])
+        landtag = Parliament.objects.create(
+            name='Abgeordnetenhaus Berlin', level='STATE', legislative_body='Abgeordnetenhaus', region='Berlin'
+        )
+        state_expert = self.create_representative('Adler', focus_areas='Autobahn, Verkehr')
+        state_expert.parliament = landtag
+        state_expert.parliament_term = ParliamentTerm.objects.create(parliament=landtag, name='19. Wahlperiode')
+        state_expert.save()
+        ExpertiseProfileBuilder.refresh()
+
+        # Verkehr is a federal topic, so state parliament members are left out
+        ranked = self.rank('Autobahn', LocationContext(postal_code=None, state=None, constituencies=[]), limit=20)
+
+        self.assertEqual(ranked[0], expert)
+        self.assertNotIn(state_expert, ranked)
+        self.assertEqual(len(ranked), 11)
+        self.assertTrue(all(rep.parliament_id == self.parliament.id for rep in ranked))
+
+
+# End of file
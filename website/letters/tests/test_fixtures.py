@@ -1,16 +1,34 @@
 # ABOUTME: Shared test fixtures for letters app tests
-# ABOUTME: Provides ParliamentFixtureMixin with common test data setup
+# ABOUTME: Provides ParliamentFixtureMixin with common test data setup and RankingIndexMixin for index tests
 
+import tempfile
 from datetime import date
+from pathlib import Path
 
 from django.contrib.auth.models import User
+from django.test import override_settings
 
 from letters.models import (
     Constituency,
     Parliament,
     ParliamentTerm,
     Representative,
+    TopicArea,
 )
+from letters.services.ranking import RankingIndex
+
+
+def create_topic(name, keywords, description='', **fields):
+    """Create a federal TopicArea with placeholder legal basis fields."""
+    values = {
+        'slug': name.lower(),
+        'primary_level': 'FEDERAL',
+        'competency_type': 'CONCURRENT',
+        'legal_basis': 'Art. 74 GG',
+        'legal_basis_url': 'https://www.gesetze-im-internet.de/gg/art_74.html',
+    }
+    values.update(fields)
+    return TopicArea.objects.create(name=name, keywords=keywords, description=description, **values)
 
 
 class ParliamentFixtureMixin:
@@ -166,3 +184,20 @@ class ParliamentFixtureMixin:
             term_start=date(2021, 10, 26),
         )
         self.federal_expert_rep.constituencies.add(self.constituency_hamburg_list)
+
+
+class RankingIndexMixin:
+    """Start each test with empty in-memory indexes and a private RANKING_INDEX_PATH."""
+
+    # Process-level indexes and caches to drop before and after each test
+    INDEXES = (RankingIndex,)
+
+    def setUp(self):
+        super().setUp()
+
+        for index in self.INDEXES:
+            index.clear()
+            self.addCleanup(index.clear)
+        artifact_dir = self.enterContext(tempfile.TemporaryDirectory())
+        self.artifact_path = Path(artifact_dir) / 'ranking_index.json'
+        self.enterContext(override_settings(RANKING_INDEX_PATH=self.artifact_path))
@@ -0,0 +1,258 @@
+# ABOUTME: Tests for the database-backed geocoding queue, worker command, and polling endpoints.
+# ABOUTME: Nominatim is mocked; rate limiting is disabled by patching the geocoder.
+
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch, MagicMock
+
+import requests
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from letters.models import GeocodeCache, GeocodeJob
+from letters.services import AddressGeocoder, GeocodeQueue
+from letters.services.geocoding_cache import GeocodeResultCache
+
+
+def _nominatim_response(lat='52.5186', lon='13.3761'):
+    response = MagicMock()
+    response.status_code = 200
+    response.json.return_value = [{'lat': lat, 'lon': lon}]
+    return response
+
+
+@patch.object(AddressGeocoder, '_apply_rate_limit', lambda self: None)
+class GeocodeQueueTests(TestCase):
+    """Test enqueueing, deduplication and processing of geocode jobs."""
+
+    address = 'Platz der Republik 1, 11011 Berlin'
+
+    def setUp(self):
+        GeocodeResultCache.clear()
+
+    def test_enqueue_creates_pending_job_without_calling_api(self):
+        with patch('requests.get') as mock_get:
+            job = GeocodeQueue.enqueue(self.address)
+
+        mock_get.assert_not_called()
+        self.assertEqual(job.status, 'PENDING')
+        self.assertFalse(job.is_finished)
+
+    def test_identical_pending_addresses_share_one_job(self):
+        first = GeocodeQueue.enqueue(self.address)
+        second = GeocodeQueue.enqueue(self.address)
+
+        self.assertEqual(first.token, second.token)
+        self.assertEqual(GeocodeJob.objects.count(), 1)
+
+    def test_cached_address_finishes_immediately(self):
+        geocoder = AddressGeocoder()
+        GeocodeCache.objects.create(
+            address_hash=geocoder._generate_cache_key(self.address, 'DE'),
+            success=True,
+            latitude=52.0,
+            longitude=13.0
+        )
+
+        job = GeocodeQueue.enqueue(self.address)
+
+        self.assertEqual(job.status, 'DONE')
+        self.assertEqual((job.latitude, job.longitude), (52.0, 13.0))
+
+    def test_process_next_geocodes_and_completes_job(self):
+        job = GeocodeQueue.enqueue(self.address)
+
+        with patch('requests.get', return_value=_nominatim_response()) as mock_get:
+            processed = GeocodeQueue.process_next()
+            self.assertIsNone(GeocodeQueue.process_next())
+
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(processed.token, job.token)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'DONE')
+        self.assertAlmostEqual(job.latitude, 52.5186, places=4)
+        self.assertEqual(job.attempts, 1)
+
+    def test_duplicate_pending_jobs_resolved_by_single_lookup(self):
+        first = GeocodeQueue.enqueue(self.address)
+        # Simulate a second job created while the first one was already claimed
+        second = GeocodeJob.objects.create(address_hash=first.address_hash, address=self.address)
+
+        with patch('requests.get', return_value=_nominatim_response()) as mock_get:
+            self.assertEqual(GeocodeQueue.drain(), 1)
+
+        self.assertEqual(mock_get.call_count, 1)
+        second.refresh_from_db()
+        self.assertEqual(second.status, 'DONE')
+
+    def test_not_found_marks_job_failed(self):
+        job = GeocodeQueue.enqueue('Nowhere 1, 99999 Nirgendwo')
+        response = _nominatim_response()
+        response.json.return_value = []
+
+        with patch('requests.get', return_value=response):
+            GeocodeQueue.process_next()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'FAILED')
+        self.assertEqual(job.error_message, 'Address not found')
+
+    def test_transient_failure_requeues_job_with_backoff(self):
+        job = GeocodeQueue.enqueue(self.address)
+
+        with patch('requests.get', side_effect=requests.Timeout('read timed out')):
+            GeocodeQueue.process_next()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'PENDING')
+        self.assertEqual(job.attempts, 1)
+        self.assertGreater(job.next_attempt_at, timezone.now())
+        # Not claimed again until the backoff has passed
+        self.assertIsNone(GeocodeQueue.claim_next())
+
+    def test_transient_failures_give_up_after_max_attempts(self):
+        job = GeocodeQueue.enqueue(self.address)
+        GeocodeJob.objects.filter(pk=job.pk).update(attempts=GeocodeQueue.MAX_ATTEMPTS - 1)
+
+        with patch('requests.get', side_effect=requests.Timeout('read timed out')):
+            GeocodeQueue.process_next()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'FAILED')
+        self.assertIsNone(job.next_attempt_at)
+
+    def test_stale_running_jobs_are_reclaimed(self):
+        job = GeocodeQueue.enqueue(self.address)
+        GeocodeJob.objects.filter(pk=job.pk).update(
+            status='RUNNING',
+            started_at=timezone.now() - GeocodeQueue.STALE_AFTER - timedelta(seconds=1)
+        )
+
+        with self.assertLogs('letters.services', level='WARNING'):
+            claimed = GeocodeQueue.claim_next()
+
+        self.assertEqual(claimed.pk, job.pk)
+        self.assertEqual(claimed.status, 'RUNNING')
+
+    def test_worker_command_drains_queue_once(self):
+        GeocodeQueue.enqueue(self.address)
+        GeocodeQueue.enqueue('Rathausmarkt 1, 20095 Hamburg')
+        out = StringIO()
+
+        with patch('requests.get', return_value=_nominatim_response()):
+            call_command('geocode_worker', '--once', stdout=out)
+
+        self.assertIn('Processed 2 geocode jobs', out.getvalue())
+        self.assertFalse(GeocodeJob.objects.filter(status='PENDING').exists())
+
+
+    def test_retry_command_requeues_expired_failures(self):
+        geocoder = AddressGeocoder()
+        expired = GeocodeCache.objects.create(
+            address_hash=geocoder._generate_cache_key(self.address, 'DE'),
+            city=self.address,
+            success=False,
+            failure_kind='TRANSIENT',
+            retry_after=timezone.now() - timedelta(minutes=1)
+        )
+        GeocodeCache.objects.create(
+            address_hash=geocoder._generate_cache_key('Later 1, 10115 Berlin', 'DE'),
+            city='Later 1, 10115 Berlin',
+            success=False,
+            failure_kind='TRANSIENT',
+            retry_after=timezone.now() + timedelta(hours=1)
+        )
+        out = StringIO()
+
+        with patch('requests.get', return_value=_nominatim_response()):
+            call_command('retry_geocode_failures', '--inline', stdout=out)
+
+        self.assertIn('1 failed lookups due for a retry', out.getvalue())
+        self.assertIn('1 addresses now resolve', out.getvalue())
+        expired.refresh_from_db()
+        self.assertTrue(expired.success)
+
+
+class GeocodeJobEndpointTests(TestCase):
+    """Test the enqueue and polling JSON endpoints."""
+
+    def setUp(self):
+        GeocodeResultCache.clear()
+        caches['default'].clear()
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.client.login(username='testuser', password='testpass')
+
+    def test_enqueue_returns_pollable_handle(self):
+        response = self.client.post(reverse('enqueue_geocode_job'), {
+            'street_address': 'Platz der Republik 1',
+            'postal_code': '11011',
+            'city': 'Berlin',
+        })
+
+        self.assertEqual(response.status_code, 202)
+        payload = response.json()
+        self.assertEqual(payload['status'], 'PENDING')
+
+        poll = self.client.get(reverse('geocode_job_status', kwargs={'token': payload['token']}))
+        self.assertEqual(poll.status_code, 202)
+
+    def test_enqueue_requires_all_address_fields(self):
+        response = self.client.post(reverse('enqueue_geocode_job'), {'city': 'Berlin'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_enqueue_requires_login(self):
+        self.client.logout()
+
+        response = self.client.post(reverse('enqueue_geocode_job'), {
+            'street_address': 'Platz der Republik 1',
+            'postal_code': '11011',
+            'city': 'Berlin',
+        })
+
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(GeocodeJob.objects.exists())
+
+    @override_settings(GEOCODE_JOB_USER_LIMIT=2)
+    def test_enqueue_is_throttled_per_user(self):
+        for number in (1, 2):
+            response = self.client.post(reverse('enqueue_geocode_job'), {
+                'street_address': f'Platz der Republik {number}',
+                'postal_code': '11011',
+                'city': 'Berlin',
+            })
+            self.assertEqual(response.status_code, 202)
+
+        response = self.client.post(reverse('enqueue_geocode_job'), {
+            'street_address': 'Platz der Republik 3',
+            'postal_code': '11011',
+            'city': 'Berlin',
+        })
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(GeocodeJob.objects.count(), 2)
+
+    def test_finished_job_returns_coordinates(self):
+        job = GeocodeJob.objects.create(
+            address_hash='x' * 64,
+            address='Somewhere',
+            status='DONE',
+            latitude=52.5,
+            longitude=13.4,
+        )
+
+        response = self.client.get(reverse('geocode_job_status', kwargs={'token': job.token}))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['latitude'], 52.5)
+
+    def test_unknown_token_returns_404(self):
+        import uuid
+        response = self.client.get(reverse('geocode_job_status', kwargs={'token': uuid.uuid4()}))
+        self.assertEqual(response.status_code, 404)
+
+
+# End of file
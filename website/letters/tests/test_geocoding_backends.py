@@ -0,0 +1,337 @@
+# ABOUTME: Tests for the pluggable geocoder backends behind AddressGeocoder.
+# ABOUTME: Covers backend selection, self-hosted Nominatim, and the offline gazetteer.
+
+import asyncio
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, patch, MagicMock
+
+import httpx
+from asgiref.sync import async_to_sync
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+
+from letters.models import GeocodeCache
+from letters.services import AddressGeocoder
+from letters.services import geocoding_backends
+from letters.services.geocoding_cache import GeocodeResultCache
+from letters.services.geocoding_backends import (
+    LocalGazetteerBackend,
+    NominatimBackend,
+    SelfHostedNominatimBackend,
+    get_async_client,
+    get_geocoder_backend,
+)
+from letters.services.rate_limiting import RateLimitExceeded, SharedRateLimiter
+
+
+GAZETTEER_CSV = """postal_code,street,latitude,longitude
+11011,,52.5170,13.3770
+11011,Platz der Republik,52.5186,13.3761
+80331,Marienplatz,48.1374,11.5755
+80331,Sendlinger Str.,48.1350,11.5700
+"""
+
+
+class GeocoderBackendSelectionTests(TestCase):
+    """Test that settings choose the backend."""
+
+    def test_default_backend_is_public_nominatim(self):
+        geocoder = AddressGeocoder()
+        self.assertIsInstance(geocoder.backend, NominatimBackend)
+        self.assertEqual(geocoder.backend.rate_limit_seconds, 1.0)
+
+    @override_settings(GEOCODER_BACKEND='nominatim-self-hosted', GEOCODER_NOMINATIM_URL='http://nominatim.internal/search')
+    def test_self_hosted_backend_uses_configured_url_without_rate_limit(self):
+        backend = get_geocoder_backend()
+        self.assertIsInstance(backend, SelfHostedNominatimBackend)
+        self.assertEqual(backend.rate_limit_seconds, 0)
+
+        response = MagicMock()
+        response.json.return_value = [{'lat': '52.5', 'lon': '13.4'}]
+        with patch('requests.get', return_value=response) as mock_get, patch('time.sleep') as mock_sleep:
+            backend.wait()
+            self.assertEqual(backend.lookup('Somewhere 1, 10115 Berlin', 'DE'), (52.5, 13.4))
+            backend.wait()
+
+        mock_sleep.assert_not_called()
+        self.assertEqual(mock_get.call_args.args[0], 'http://nominatim.internal/search')
+
+    @override_settings(GEOCODER_BACKEND='nominatim-self-hosted', GEOCODER_NOMINATIM_URL=None)
+    def test_self_hosted_backend_requires_url(self):
+        with self.assertRaises(ImproperlyConfigured):
+            get_geocoder_backend()
+
+    @override_settings(GEOCODER_BACKEND='carrier-pigeon')
+    def test_unknown_backend_rejected(self):
+        with self.assertRaises(ImproperlyConfigured):
+            AddressGeocoder()
+
+
+class LocalGazetteerBackendTests(TestCase):
+    """Test offline geocoding from a PLZ/street centroid CSV."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name) / 'gazetteer.csv'
+        self.path.write_text(GAZETTEER_CSV, encoding='utf-8')
+        self.backend = LocalGazetteerBackend(self.path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_street_centroid_preferred_over_postal_code(self):
+        self.assertEqual(
+            self.backend.lookup('Platz der Republik 1, 11011 Berlin', 'DE'),
+            (52.5186, 13.3761)
+        )
+
+    def test_falls_back_to_postal_code_centroid(self):
+        self.assertEqual(
+            self.backend.lookup('Unbekannter Weg 5, 11011 Berlin', 'DE'),
+            (52.5170, 13.3770)
+        )
+
+    def test_street_abbreviation_matches(self):
+        self.assertEqual(
+            self.backend.lookup('Sendlinger Straße 12a, 80331 München', 'DE'),
+            (48.1350, 11.5700)
+        )
+
+    def test_unknown_postal_code_returns_none(self):
+        self.assertIsNone(self.backend.lookup('Hauptstraße 1, 99999 Nirgendwo', 'DE'))
+        self.assertIsNone(self.backend.lookup('Keine Postleitzahl', 'DE'))
+
+    def test_geocoder_with_local_backend_skips_api_and_cache(self):
+        geocoder = AddressGeocoder(backend=self.backend)
+
+        with patch('requests.get') as mock_get:
+            lat, lon, success, _error = geocoder.geocode('Marienplatz 1, 80331 München')
+
+        mock_get.assert_not_called()
+        self.assertTrue(success)
+        self.assertEqual((lat, lon), (48.1374, 11.5755))
+        self.assertFalse(GeocodeCache.objects.exists())
+
+    def test_structured_lookup_uses_postal_code_and_street(self):
+        self.assertEqual(
+            self.backend.lookup_structured('Sendlinger Str. 3', '80331', 'München', 'DE'),
+            (48.1350, 11.5700)
+        )
+        self.assertEqual(self.backend.lookup_structured('', '11011', 'Berlin', 'DE'), (52.5170, 13.3770))
+
+
+class StructuredGeocodingTests(TestCase):
+    """Test geocoding addresses given as street, postal code and city."""
+
+    def setUp(self):
+        GeocodeResultCache.clear()
+        self.response = MagicMock()
+        self.response.json.return_value = [{'lat': '52.5186', 'lon': '13.3761'}]
+
+    def test_nominatim_sends_structured_query(self):
+        with patch('requests.get', return_value=self.response) as mock_get:
+            result = NominatimBackend().lookup_structured('Platz der Republik 1', '11011', 'Berlin', 'DE')
+
+        self.assertEqual(result, (52.5186, 13.3761))
+        params = mock_get.call_args.kwargs['params']
+        self.assertNotIn('q', params)
+        self.assertEqual(params['street'], 'Platz der Republik 1')
+        self.assertEqual(params['postalcode'], '11011')
+        self.assertEqual(params['city'], 'Berlin')
+
+    def test_structured_and_free_form_share_cache_entry(self):
+        geocoder = AddressGeocoder()
+
+        with patch('requests.get', return_value=self.response) as mock_get, patch('time.sleep'):
+            geocoder.geocode_structured('Platz der Republik 1', '11011', 'Berlin')
+            lat, lon, success, _ = geocoder.geocode('platz der republik 1, 11011 berlin')
+
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertTrue(success)
+        self.assertEqual((lat, lon), (52.5186, 13.3761))
+
+        entry = GeocodeCache.objects.get()
+        self.assertEqual(
+            (entry.street, entry.postal_code, entry.city),
+            ('Platz der Republik 1', '11011', 'Berlin')
+        )
+
+    def test_empty_parts_rejected_without_lookup(self):
+        with patch('requests.get') as mock_get:
+            result = AddressGeocoder().geocode_structured('', ' ', '')
+
+        mock_get.assert_not_called()
+        self.assertEqual(result, (None, None, False, 'Address is required'))
+
+
+def _reserve_in_other_process(state_dir, results):
+    results.put(SharedRateLimiter('test', interval=5.0, state_dir=state_dir).reserve())
+
+
+class SharedRateLimiterTests(TestCase):
+    """Test the file-backed rate limiter shared by all geocoder instances and workers."""
+
+    def setUp(self):
+        self.state_dir = self.enterContext(tempfile.TemporaryDirectory())
+
+    def limiter(self, **kwargs):
+        kwargs.setdefault('interval', 5.0)
+        return SharedRateLimiter('test', state_dir=self.state_dir, **kwargs)
+
+    def test_reservations_are_spaced_in_arrival_order(self):
+        delays = [self.limiter().reserve() for _ in range(3)]
+
+        self.assertEqual(delays[0], 0)
+        self.assertAlmostEqual(delays[1], 5.0, places=1)
+        self.assertAlmostEqual(delays[2], 10.0, places=1)
+
+    def test_limit_is_shared_with_other_processes(self):
+        results = multiprocessing.get_context('fork').Queue()
+        process = multiprocessing.get_context('fork').Process(
+            target=_reserve_in_other_process, args=(self.state_dir, results)
+        )
+        process.start()
+        process.join()
+
+        self.assertEqual(results.get(timeout=5), 0)
+        self.assertAlmostEqual(self.limiter().reserve(), 5.0, places=1)
+
+    def test_max_wait_fails_fast_without_reserving(self):
+        self.limiter().reserve()
+
+        with self.assertRaises(RateLimitExceeded):
+            self.limiter().reserve(max_wait=1.0)
+        # The rejected caller did not push later callers back
+        self.assertAlmostEqual(self.limiter().reserve(), 5.0, places=1)
+
+    def test_burst_allows_back_to_back_requests(self):
+        delays = [self.limiter(burst=2).reserve() for _ in range(3)]
+
+        self.assertEqual(delays[:2], [0, 0])
+        self.assertAlmostEqual(delays[2], 5.0, places=1)
+
+    def test_backend_instances_share_the_limit(self):
+        with override_settings(GEOCODER_RATE_LIMIT_DIR=self.state_dir), patch('time.sleep') as mock_sleep:
+            NominatimBackend().wait()
+            NominatimBackend().wait()
+
+        mock_sleep.assert_called_once()
+        self.assertAlmostEqual(mock_sleep.call_args.args[0], 1.0, places=1)
+
+    def test_geocoder_reports_busy_without_calling_api_or_caching(self):
+        GeocodeResultCache.clear()
+        with override_settings(GEOCODER_RATE_LIMIT_DIR=self.state_dir, GEOCODER_RATE_LIMIT_MAX_WAIT=0.5):
+            SharedRateLimiter('nominatim', interval=30.0).reserve()
+            with patch('requests.get') as mock_get, self.assertLogs('letters.services', level='WARNING'):
+                _lat, _lon, success, error = AddressGeocoder().geocode('Platz der Republik 1, 11011 Berlin')
+
+        mock_get.assert_not_called()
+        self.assertFalse(success)
+        self.assertIn('rate limit', error)
+        self.assertFalse(GeocodeCache.objects.exists())
+
+
+class AsyncGeocodingTests(TestCase):
+    """Test the rate limiter under asyncio and async structured geocoding."""
+
+    # Async code that touches the ORM runs through async_to_sync so that
+    # sync_to_async calls stay on this thread, inside the test transaction.
+
+    def setUp(self):
+        GeocodeResultCache.clear()
+
+    def test_rate_limiter_serves_coroutines_without_overlap(self):
+        with tempfile.TemporaryDirectory() as state_dir:
+            limiter = SharedRateLimiter('test', interval=0.02, state_dir=state_dir)
+            finished = []
+
+            async def request(number):
+                await limiter.acquire_async()
+                finished.append((number, time.monotonic()))
+
+            async def main():
+                await asyncio.gather(*(request(number) for number in range(4)))
+
+            asyncio.run(main())
+
+        # Slots go out in the order the worker threads reach the flock
+        self.assertEqual(sorted(number for number, _ in finished), [0, 1, 2, 3])
+        gaps = [later - earlier for (_, earlier), (_, later) in zip(finished, finished[1:])]
+        self.assertTrue(all(gap >= 0.015 for gap in gaps), gaps)
+
+    def test_async_structured_geocode_caches_result(self):
+        geocoder = AddressGeocoder()
+
+        with patch.object(NominatimBackend, 'lookup_structured_async', new_callable=AsyncMock) as mock_lookup, \
+                patch.object(NominatimBackend, 'wait_async', new_callable=AsyncMock):
+            mock_lookup.return_value = (52.5186, 13.3761)
+            first = async_to_sync(geocoder.geocode_structured_async)('Platz der Republik 1', '11011', 'Berlin')
+            second = async_to_sync(geocoder.geocode_structured_async)('Platz der Republik 1', '11011', 'Berlin')
+
+        self.assertEqual(first, (52.5186, 13.3761, True, None))
+        self.assertEqual(second, first)
+        mock_lookup.assert_awaited_once()
+        self.assertTrue(GeocodeCache.objects.get().success)
+
+    def test_async_structured_geocode_records_transient_failure(self):
+        geocoder = AddressGeocoder()
+
+        with patch.object(NominatimBackend, 'lookup_structured_async', new_callable=AsyncMock) as mock_lookup, \
+                patch.object(NominatimBackend, 'wait_async', new_callable=AsyncMock):
+            mock_lookup.side_effect = TimeoutError('timed out')
+            with self.assertLogs('letters.services', level='WARNING'):
+                _lat, _lon, success, error = async_to_sync(geocoder.geocode_structured_async)(
+                    'Platz der Republik 1', '11011', 'Berlin'
+                )
+
+        self.assertFalse(success)
+        self.assertIn('timed out', error)
+        self.assertEqual(GeocodeCache.objects.get().failure_kind, 'TRANSIENT')
+
+    def test_async_client_is_shared_within_an_event_loop(self):
+        async def clients():
+            return await get_async_client(), await get_async_client()
+
+        first, second = asyncio.run(clients())
+        self.assertIs(first, second)
+        # Shutting the loop down closed its client
+        self.assertTrue(first.is_closed)
+
+        # A new loop gets its own client; the one of the closed loop is dropped
+        third, _ = asyncio.run(clients())
+        self.assertIsNot(third, first)
+        self.assertTrue(third.is_closed)
+        self.assertNotIn(first, [client for client, _ in geocoding_backends._async_clients.values()])
+
+    def test_closed_async_client_is_replaced_within_its_loop(self):
+        async def replace():
+            first = await get_async_client()
+            await first.aclose()
+            return first, await get_async_client()
+
+        first, second = asyncio.run(replace())
+        self.assertIsNot(second, first)
+        self.assertTrue(second.is_closed)
+
+    def test_async_lookup_uses_the_shared_client(self):
+        backend = NominatimBackend()
+        response = httpx.Response(
+            200, json=[{'lat': '52.5186', 'lon': '13.3761'}], request=httpx.Request('GET', backend.endpoint),
+        )
+
+        async def lookup():
+            client = await get_async_client()
+            with patch.object(client, 'get', new_callable=AsyncMock, return_value=response) as mock_get:
+                coordinates = await backend.lookup_structured_async('Platz der Republik 1', '11011', 'Berlin', 'DE')
+            return client.is_closed, coordinates, mock_get
+
+        closed_during_lookup, coordinates, mock_get = asyncio.run(lookup())
+        self.assertEqual(coordinates, (52.5186, 13.3761))
+        mock_get.assert_awaited_once()
+        self.assertFalse(closed_during_lookup)
+
+
+# End of file
@@ -64,7 +64,7 @@ class IdentityVerificationTests(ParliamentFixtureMixin, TestCase):
         self.assertIn(self.state_constituency_direct, verification.get_constituencies())
         self.assertTrue(self.direct_rep.qualifies_as_constituent(verification))
 
-    @patch('letters.services.wahlkreis.WahlkreisResolver.resolve')
+    @patch('letters.services.wahlkreis.WahlkreisResolver.resolve_structured')
     def test_complete_verification_with_full_address_populates_wahlkreis_fields(self, mock_resolve):
         """Test that Wahlkreis fields are populated when full address is provided"""
         # Set up test constituency with wahlkreis_id
@@ -91,6 +91,7 @@ class IdentityVerificationTests(ParliamentFixtureMixin, TestCase):
         )
 
         self.assertIsNotNone(verification)
+        mock_resolve.assert_called_once_with('Unter den Linden 1', '10117', 'Berlin', 'DE')
         # Verify Wahlkreis fields are populated
         self.assertEqual(verification.federal_wahlkreis_number, '075')
         self.assertEqual(verification.state_wahlkreis_number, '075')
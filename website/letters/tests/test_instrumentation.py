@@ -0,0 +1,114 @@
+# ABOUTME: Tests for the resolver timing spans, metrics sinks, and the bench_resolver command.
+# ABOUTME: Geocoding is mocked and boundaries come from the test fixture.
+
+import os
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from letters.services import WahlkreisLocator
+from letters.services.geocoding_backends import NominatimBackend
+from letters.services.geocoding_cache import GeocodeResultCache
+from letters.services.instrumentation import SpanRecorder, record, span
+from letters.services.wahlkreis import WahlkreisResolver
+
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), 'fixtures', 'wahlkreise.geojson')
+
+collected_spans = []
+
+
+def collecting_sink(name, seconds, tags):
+    collected_spans.append((name, tags))
+
+
+def failing_sink(name, seconds, tags):
+    raise RuntimeError('metrics backend down')
+
+
+class SpanTests(TestCase):
+    """Test span timing and delivery to sinks."""
+
+    def setUp(self):
+        collected_spans.clear()
+
+    def test_span_records_duration_even_when_block_raises(self):
+        with SpanRecorder() as recorder:
+            with self.assertRaises(ValueError):
+                with span('failing.stage'):
+                    raise ValueError('boom')
+
+        self.assertEqual(len(recorder.durations['failing.stage']), 1)
+
+    @override_settings(INSTRUMENTATION_SINK='letters.tests.test_instrumentation.collecting_sink')
+    def test_configured_sink_receives_spans_with_tags(self):
+        with span('geocode.http', backend='nominatim'):
+            pass
+
+        self.assertEqual(collected_spans, [('geocode.http', {'backend': 'nominatim'})])
+
+    @override_settings(INSTRUMENTATION_SINK='letters.tests.test_instrumentation.failing_sink')
+    def test_failing_sink_does_not_break_caller(self):
+        with self.assertLogs('letters.services', level='ERROR'):
+            record('resolve', 0.01)
+
+
+class ResolverInstrumentationTests(TestCase):
+    """Test that WahlkreisResolver reports a span for every pipeline stage."""
+
+    def setUp(self):
+        GeocodeResultCache.clear()
+        rate_limit_dir = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(GEOCODER_RATE_LIMIT_DIR=rate_limit_dir))
+
+    def test_resolve_reports_each_stage(self):
+        resolver = WahlkreisResolver()
+        resolver._wahlkreis_locator = WahlkreisLocator(FIXTURE_PATH)
+
+        with patch.object(NominatimBackend, 'lookup', return_value=(52.52, 13.38)), \
+                SpanRecorder() as recorder:
+            result = resolver.resolve('Unter den Linden 1, 10117 Berlin')
+
+        self.assertEqual(result['federal_wahlkreis_number'], '083')
+        for stage in (
+            'resolve', 'geocode.cache', 'geocode.rate_limit',
+            'geocode.http', 'geocode.store', 'locator.locate', 'resolve.constituencies',
+        ):
+            self.assertEqual(len(recorder.durations[stage]), 1, stage)
+        # A street address never consults the postal code table
+        self.assertNotIn('resolve.postal_code', recorder.durations)
+
+
+class BenchResolverCommandTests(TestCase):
+    """Test the bench_resolver management command."""
+
+    def test_reports_percentiles_per_stage(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            corpus_path = Path(tmpdir) / 'corpus.csv'
+            corpus_path.write_text(
+                'street,postal_code,city,latitude,longitude\n'
+                'Unter den Linden 1,10117,Berlin,52.52,13.38\n'
+                'Nirgendwo 1,99999,Nirgends,,\n'
+            )
+
+            out = StringIO()
+            with self.assertLogs('letters.services', level='WARNING'):
+                call_command(
+                    'bench_resolver', str(corpus_path),
+                    '--geojson', FIXTURE_PATH,
+                    '--repeat', '2',
+                    stdout=out
+                )
+
+        output = out.getvalue()
+        self.assertIn('p99', output)
+        self.assertIn('geocode.http', output)
+        self.assertIn('locator.locate', output)
+        self.assertIn('Located:    2 / 4', output)
+
+
+# End of file
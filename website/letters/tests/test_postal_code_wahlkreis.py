@@ -0,0 +1,239 @@
+# ABOUTME: Tests for the precomputed PostalCodeWahlkreis table, its build command, and resolver use.
+# ABOUTME: Boundaries come from the test fixture; geocoding is mocked so skipped calls are detectable.
+
+import json
+import os
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from django.core.management import call_command
+from django.test import TestCase
+from shapely.geometry import box
+
+from letters.models import Constituency, Parliament, ParliamentTerm, PostalCodeWahlkreis
+from letters.services import WahlkreisLocator
+from letters.services.postal_codes import PostalCodeWahlkreisBuilder
+from letters.services.wahlkreis import WahlkreisResolver
+
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), 'fixtures', 'wahlkreise.geojson')
+
+
+class PostalCodeWahlkreisBuilderTests(TestCase):
+    """Test mapping postal code areas and sample points to Wahlkreise."""
+
+    def setUp(self):
+        self.builder = PostalCodeWahlkreisBuilder(WahlkreisLocator(FIXTURE_PATH))
+
+    def test_area_inside_one_wahlkreis_is_unambiguous(self):
+        mappings = self.builder.build_from_areas({'10117': box(13.35, 52.50, 13.40, 52.53)})
+
+        self.assertEqual(len(mappings), 1)
+        self.assertEqual(mappings[0].federal_wkr_nr, 83)
+        self.assertFalse(mappings[0].is_ambiguous)
+        self.assertAlmostEqual(mappings[0].coverage, 1.0)
+
+    def test_area_straddling_boundary_is_ambiguous(self):
+        # Half inside the Berlin fixture polygon, half outside
+        mappings = self.builder.build_from_areas({'10999': box(13.5, 52.5, 13.7, 52.55)})
+
+        self.assertTrue(mappings[0].federal_ambiguous)
+        self.assertAlmostEqual(mappings[0].coverage, 0.5, places=2)
+
+    def test_points_majority_and_ambiguity(self):
+        mappings = {
+            mapping.postal_code: mapping
+            for mapping in self.builder.build_from_points([
+                ('20095', 53.55, 9.99),
+                ('20095', 53.56, 10.0),
+                ('20095', 53.555, 9.995),
+                ('10117', 52.52, 13.38),
+                ('10117', 52.521, 13.381),
+                ('10117', 53.55, 9.99),   # sample point in Hamburg
+            ])
+        }
+
+        self.assertEqual(mappings['20095'].federal_wkr_nr, 18)
+        self.assertFalse(mappings['20095'].is_ambiguous)
+        self.assertTrue(mappings['10117'].federal_ambiguous)
+
+    def test_single_point_postal_code_is_ambiguous(self):
+        mappings = self.builder.build_from_points([('20095', 53.55, 9.99)])
+
+        self.assertEqual(mappings[0].federal_wkr_nr, 18)
+        self.assertAlmostEqual(mappings[0].coverage, 1.0)
+        self.assertTrue(mappings[0].federal_ambiguous)
+
+        builder = PostalCodeWahlkreisBuilder(self.builder.locator, min_samples=1)
+        self.assertFalse(builder.build_from_points([('20095', 53.55, 9.99)])[0].is_ambiguous)
+
+
+class PostalCodeResolutionTests(TestCase):
+    """Test that WahlkreisResolver answers bare unambiguous postal codes without geocoding."""
+
+    def setUp(self):
+        parliament = Parliament.objects.create(
+            name='Bundestag', level='FEDERAL', legislative_body='Bundestag', region='DE'
+        )
+        term = ParliamentTerm.objects.create(parliament=parliament, name='21. Wahlperiode')
+        self.constituency = Constituency.objects.create(
+            parliament_term=term,
+            name='Berlin-Mitte',
+            scope='FEDERAL_DISTRICT',
+            list_id='083',
+            metadata={'state': 'Berlin'}
+        )
+        PostalCodeWahlkreis.objects.create(
+            postal_code='10117',
+            federal_wkr_nr=83,
+            federal_wkr_name='Berlin-Mitte',
+            land_name='Berlin',
+            land_code='BE',
+            source='AREAS',
+        )
+        PostalCodeWahlkreis.objects.create(
+            postal_code='10999',
+            federal_wkr_nr=83,
+            land_name='Berlin',
+            land_code='BE',
+            federal_ambiguous=True,
+            coverage=0.6,
+            source='AREAS',
+        )
+
+    def berlin_locator(self, wkr_nr, wkr_name):
+        locator = MagicMock()
+        locator.locate.return_value = {
+            'federal': {'wkr_nr': wkr_nr, 'wkr_name': wkr_name, 'land_name': 'Berlin', 'land_code': 'BE'},
+            'state': None,
+        }
+        return locator
+
+    @patch('letters.services.wahlkreis.AddressGeocoder.geocode')
+    def test_unambiguous_postal_code_skips_geocoding(self, mock_geocode):
+        """Test that an address made of just an unambiguous postal code is answered from the table."""
+        result = WahlkreisResolver().resolve('10117 Berlin')
+
+        mock_geocode.assert_not_called()
+        self.assertEqual(result['federal_wahlkreis_number'], '083')
+        self.assertIn(self.constituency, result['constituencies'])
+
+    @patch('letters.services.wahlkreis.AddressGeocoder.geocode')
+    def test_ambiguous_postal_code_is_geocoded(self, mock_geocode):
+        mock_geocode.return_value = (52.5, 13.42, True, None)
+        resolver = WahlkreisResolver()
+        resolver._wahlkreis_locator = MagicMock()
+        resolver._wahlkreis_locator.locate.return_value = {
+            'federal': {'wkr_nr': 84, 'wkr_name': 'Friedrichshain', 'land_name': 'Berlin', 'land_code': 'BE'},
+            'state': None,
+        }
+
+        result = resolver.resolve('Oranienstraße 1, 10999 Berlin')
+
+        mock_geocode.assert_called_once()
+        self.assertEqual(result['federal_wahlkreis_number'], '084')
+
+    @patch('letters.services.wahlkreis.AddressGeocoder.geocode')
+    def test_resolve_postal_code_without_geocoding_fallback(self, mock_geocode):
+        resolver = WahlkreisResolver()
+
+        unambiguous = resolver.resolve_postal_code('10117', geocode_ambiguous=False)
+        ambiguous = resolver.resolve_postal_code('10999', geocode_ambiguous=False)
+
+        mock_geocode.assert_not_called()
+        self.assertFalse(unambiguous['postal_code_ambiguous'])
+        self.assertEqual(unambiguous['federal_wahlkreis_number'], '083')
+        self.assertTrue(ambiguous['postal_code_ambiguous'])
+        self.assertEqual(ambiguous['constituencies'], [])
+
+    @patch('letters.services.wahlkreis.AddressGeocoder.geocode_structured')
+    def test_structured_address_without_street_uses_postal_code_fast_path(self, mock_geocode):
+        """Test that a structured address without a street is answered from the table."""
+        result = WahlkreisResolver().resolve_structured('', '10117', 'Berlin')
+
+        mock_geocode.assert_not_called()
+        self.assertEqual(result['federal_wahlkreis_number'], '083')
+        self.assertIn(self.constituency, result['constituencies'])
+
+    @patch('letters.services.wahlkreis.AddressGeocoder.geocode_structured')
+    @patch('letters.services.wahlkreis.AddressGeocoder.geocode')
+    def test_street_decides_in_split_postal_code(self, mock_geocode, mock_geocode_structured):
+        """Test that a street in a mostly-one-Wahlkreis postal code is geocoded, not taken from the table."""
+        # 99.5% of 10117 lies in Wahlkreis 83, so the table calls it unambiguous
+        PostalCodeWahlkreis.objects.filter(postal_code='10117').update(coverage=0.995)
+        mock_geocode.return_value = (52.5, 13.42, True, None)
+        mock_geocode_structured.return_value = (52.5, 13.42, True, None)
+        resolver = WahlkreisResolver()
+        resolver._wahlkreis_locator = self.berlin_locator(84, 'Friedrichshain')
+
+        free_form = resolver.resolve('Grenzstraße 1, 10117 Berlin')
+        structured = resolver.resolve_structured('Grenzstraße 1', '10117', 'Berlin')
+
+        mock_geocode.assert_called_once()
+        mock_geocode_structured.assert_called_once()
+        self.assertEqual(free_form['federal_wahlkreis_number'], '084')
+        self.assertEqual(structured['federal_wahlkreis_number'], '084')
+
+    @patch('letters.services.wahlkreis.AddressGeocoder.geocode_structured')
+    def test_structured_address_in_ambiguous_postal_code_is_geocoded(self, mock_geocode):
+        mock_geocode.return_value = (52.5, 13.42, True, None)
+        resolver = WahlkreisResolver()
+        resolver._wahlkreis_locator = MagicMock()
+        resolver._wahlkreis_locator.locate.return_value = {
+            'federal': {'wkr_nr': 83, 'wkr_name': 'Berlin-Mitte', 'land_name': 'Berlin', 'land_code': 'BE'},
+            'state': None,
+        }
+
+        result = resolver.resolve_structured('Oranienstraße 1', '10999', 'Berlin')
+
+        mock_geocode.assert_called_once_with('Oranienstraße 1', '10999', 'Berlin', 'DE')
+        self.assertEqual(result['federal_wahlkreis_number'], '083')
+
+    @patch('letters.services.wahlkreis.AddressGeocoder.geocode')
+    def test_query_wahlkreis_postal_code_option(self, mock_geocode):
+        out = StringIO()
+        call_command('query_wahlkreis', '--postal-code', '10117', stdout=out)
+
+        mock_geocode.assert_not_called()
+        self.assertIn('Federal Wahlkreis: 083', out.getvalue())
+
+
+class BuildPostalCodeWahlkreiseCommandTests(TestCase):
+    """Test the build_postal_code_wahlkreise management command."""
+
+    def test_builds_table_from_areas_and_points(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            areas_path = Path(tmpdir) / 'plz.geojson'
+            areas_path.write_text(json.dumps({
+                'type': 'FeatureCollection',
+                'features': [{
+                    'type': 'Feature',
+                    'properties': {'plz': '10117'},
+                    'geometry': {
+                        'type': 'Polygon',
+                        'coordinates': [[[13.35, 52.5], [13.4, 52.5], [13.4, 52.53], [13.35, 52.53], [13.35, 52.5]]]
+                    }
+                }]
+            }))
+            points_path = Path(tmpdir) / 'points.csv'
+            points_path.write_text('postal_code,latitude,longitude\n20095,53.55,9.99\n10117,53.55,9.99\n')
+
+            out = StringIO()
+            call_command(
+                'build_postal_code_wahlkreise',
+                '--areas', str(areas_path),
+                '--points', str(points_path),
+                '--geojson', FIXTURE_PATH,
+                '--min-samples', '1',
+                stdout=out
+            )
+
+        self.assertIn('Postal codes: 2', out.getvalue())
+        # The areas file wins over the (wrong) sample point for 10117
+        self.assertEqual(PostalCodeWahlkreis.objects.get(postal_code='10117').federal_wkr_nr, 83)
+        self.assertEqual(PostalCodeWahlkreis.objects.get(postal_code='20095').source, 'POINTS')
+
+
+# End of file
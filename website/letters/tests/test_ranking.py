@@ -0,0 +1,152 @@
+# ABOUTME: Tests for the BM25 ranking index, its serialized artifact, and the ranking commands.
+# ABOUTME: Uses small hand-built topics and committees; artifacts are written to temporary directories.
+
+import os
+from collections import Counter
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from letters.models import Committee, Parliament, ParliamentTerm
+from letters.services.ranking import BM25Index, RankingIndex
+from letters.services.text_analysis import get_analyzer
+from letters.tests.test_fixtures import RankingIndexMixin, create_topic
+
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def query(text):
+    return Counter(get_analyzer().terms(text))
+
+
+class BM25IndexTests(TestCase):
+    """Test BM25 weights on a hand-built collection."""
+
+    def test_rare_terms_outweigh_common_ones(self):
+        """Test that a term in few documents scores higher than one in all of them."""
+        index = BM25Index.build([
+            (1, {'name': 'Verkehr', 'keywords': 'bahn, politik'}),
+            (2, {'name': 'Umwelt', 'keywords': 'klima, politik'}),
+            (3, {'name': 'Bildung', 'keywords': 'schule, politik'}),
+        ])
+
+        scores = index.score(query('Bahn Politik'))
+
+        self.assertEqual(set(scores), {1, 2, 3})
+        self.assertGreater(scores[1], scores[2])
+        self.assertAlmostEqual(scores[2], scores[3])
+
+    def test_longer_documents_are_normalized(self):
+        """Test that the same hit scores lower in a longer document."""
+        index = BM25Index.build([
+            (1, {'keywords': 'bahn'}),
+            (2, {'keywords': 'bahn, bus, tram, fähre, flugzeug, auto'}),
+        ])
+
+        scores = index.score(query('Bahn'))
+
+        self.assertGreater(scores[1], scores[2])
+
+    def test_serialization_round_trip_keeps_scores(self):
+        """Test that to_dict() and from_dict() preserve scores and fallback terms."""
+        index = BM25Index.build([(7, {'name': 'Wohnungswesen', 'keywords': 'mietrecht, wohnungsbau'})])
+
+        restored = BM25Index.from_dict(index.to_dict())
+
+        self.assertEqual(restored.score(query('Mietrecht')), index.score(query('Mietrecht')))
+        self.assertEqual(restored.fallback_terms, index.fallback_terms)
+
+
+class RankingIndexTests(RankingIndexMixin, TestCase):
+    """Test the process-level indexes, their artifact, and committee relevance."""
+
+    def setUp(self):
+        super().setUp()
+        self.verkehr = create_topic('Verkehr', 'bahn, nahverkehr, autobahn')
+        self.wohnen = create_topic('Wohnen', 'mietrecht, wohnungsbau')
+        parliament = Parliament.objects.create(
+            name='Bundestag', level='FEDERAL', legislative_body='Bundestag', region='DE'
+        )
+        term = ParliamentTerm.objects.create(parliament=parliament, name='21. Wahlperiode')
+        self.verkehrsausschuss = Committee.objects.create(
+            parliament_term=term, name='Verkehrsausschuss', keywords='verkehr, bahn, autobahn'
+        )
+        self.bauausschuss = Committee.objects.create(
+            parliament_term=term, name='Bauausschuss', keywords='wohnungsbau, stadtentwicklung'
+        )
+
+    def test_rebuild_writes_artifact_that_workers_load(self):
+        """Test that a fresh worker loads the rebuilt artifact instead of analyzing rows."""
+        RankingIndex.rebuild()
+        self.assertTrue(self.artifact_path.exists())
+
+        # A fresh worker: fingerprint check plus loading the topics, no per-row analysis
+        RankingIndex.clear()
+        with self.assertNumQueries(3):
+            topics = RankingIndex.search_topics(['autobahn'])
+
+        self.assertEqual(topics, [self.verkehr])
+
+    def test_stale_artifact_is_rebuilt_from_database(self):
+        """Test that an artifact with an outdated fingerprint is rebuilt in memory."""
+        RankingIndex.rebuild()
+        create_topic('Radverkehr', 'fahrrad, radweg')
+        RankingIndex.clear()
+
+        with self.assertLogs('letters.services', level='INFO') as logs:
+            topics = RankingIndex.search_topics(['radweg'])
+
+        self.assertEqual([topic.name for topic in topics], ['Radverkehr'])
+        self.assertIn('out of date', logs.output[0])
+
+    def test_unreadable_artifact_is_ignored(self):
+        """Test that an artifact in another format is ignored with a warning."""
+        self.artifact_path.write_text('{"format": "something-else"}')
+
+        with self.assertLogs('letters.services', level='WARNING'):
+            topics = RankingIndex.search_topics(['mietrecht'])
+
+        self.assertEqual(topics, [self.wohnen])
+
+    def test_committee_edits_invalidate_committee_scores(self):
+        """Test that saving a committee updates its BM25 scores."""
+        self.assertEqual(set(RankingIndex.score_committees(['autobahn'])), {self.verkehrsausschuss.id})
+
+        self.bauausschuss.keywords += ', autobahn'
+        self.bauausschuss.save()
+
+        scores = RankingIndex.score_committees(['autobahn'])
+        self.assertEqual(set(scores), {self.verkehrsausschuss.id, self.bauausschuss.id})
+
+
+class RankingCommandTests(RankingIndexMixin, TestCase):
+    """Test the build_ranking_index and evaluate_ranking commands."""
+
+    def test_build_ranking_index_writes_artifact(self):
+        """Test that build_ranking_index writes the artifact and reports its size."""
+        create_topic('Verkehr', 'bahn, nahverkehr')
+
+        out = StringIO()
+        call_command('build_ranking_index', stdout=out)
+
+        self.assertTrue(self.artifact_path.exists())
+        self.assertIn('topic: 1 documents', out.getvalue())
+
+    def test_evaluate_ranking_reports_precision_and_mrr(self):
+        """Test that evaluate_ranking reports P@k and an MRR of at least 0.7 on the taxonomy."""
+        call_command('load_topic_taxonomy', stdout=StringIO())
+
+        out = StringIO()
+        call_command(
+            'evaluate_ranking', os.path.join(FIXTURE_DIR, 'ranking_queries.csv'), '--k', '3', stdout=out
+        )
+
+        output = out.getvalue()
+        self.assertIn('P@3:', output)
+        mrr = float(output.split('MRR:')[1].split()[0])
+        self.assertGreaterEqual(mrr, 0.7)
+
+
+# End of file
@@ -1,5 +1,5 @@
 from django.test import TestCase
-from letters.constants import normalize_german_state, get_state_code
+from letters.constants import normalize_german_state, get_state_code, normalize_address
 
 
 class NormalizeGermanStateTests(TestCase):
@@ -52,3 +52,33 @@ class GetStateCodeTests(TestCase):
     def test_returns_none_for_invalid_state(self):
         """Test invalid state returns None."""
         self.assertIsNone(get_state_code('Invalid'))
+
+
+class NormalizeAddressTests(TestCase):
+    """Test that normalize_address folds trivial address variants together."""
+
+    def test_folds_case_whitespace_and_punctuation(self):
+        """Test case, comma spacing and repeated blanks are ignored."""
+        self.assertEqual(
+            normalize_address('Unter den Linden 1, 10117 Berlin'),
+            normalize_address('unter den linden 1,10117  berlin')
+        )
+
+    def test_folds_umlauts_and_sharp_s(self):
+        """Test umlauts and ß match their transliterations."""
+        self.assertEqual(normalize_address('Münchner Freiheit'), normalize_address('Muenchner Freiheit'))
+        self.assertEqual(normalize_address('Große Allee'), normalize_address('Grosse Allee'))
+
+    def test_unifies_street_suffixes(self):
+        """Test Straße, Strasse and Str. forms are equivalent."""
+        self.assertEqual(normalize_address('Hauptstraße 5'), 'hauptstr 5')
+        self.assertEqual(normalize_address('Hauptstr. 5'), 'hauptstr 5')
+        self.assertEqual(normalize_address('Berliner Strasse 5'), 'berliner str 5')
+
+    def test_keeps_words_starting_with_strasse(self):
+        """Test only suffixes are rewritten, not words like Strassenbahnweg."""
+        self.assertEqual(normalize_address('Strassenbahnweg 2'), 'strassenbahnweg 2')
+
+    def test_returns_empty_string_for_none(self):
+        """Test None input returns an empty string."""
+        self.assertEqual(normalize_address(None), '')
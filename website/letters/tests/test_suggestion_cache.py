@@ -0,0 +1,116 @@
+# ABOUTME: Tests for the title suggestion cache behind the analyze-title endpoint.
+# ABOUTME: Covers token-set keys, rehydration from ids, data version invalidation and hit rate reporting.
+
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from letters.models import Committee, CommitteeMembership, IdentityVerification
+from letters.services import ConstituencySuggestionService
+from letters.services.expertise import ExpertiseIndex
+from letters.services.ranking import RankingIndex
+from letters.services.suggestion_cache import SuggestionCache
+from letters.services.versioning import bump_data_version
+from letters.tests.test_fixtures import ParliamentFixtureMixin, RankingIndexMixin, create_topic
+
+
+class SuggestionCacheTests(ParliamentFixtureMixin, RankingIndexMixin, TestCase):
+    """Test memoized title suggestions."""
+
+    INDEXES = (SuggestionCache, RankingIndex, ExpertiseIndex)
+    TITLE = 'Tempolimit auf Autobahnen einführen'
+
+    def setUp(self):
+        super().setUp()
+        self.verkehr = create_topic('Straßenverkehr', 'autobahn, tempolimit, verkehr', slug='strassenverkehr')
+        committee = Committee.objects.create(
+            parliament_term=self.term, name='Verkehrsausschuss', keywords='autobahn, verkehr'
+        )
+        committee.topic_areas.add(self.verkehr)
+        self.membership = CommitteeMembership.objects.create(
+            representative=self.federal_expert_rep, committee=committee, role='chair'
+        )
+        self.location = {'constituencies': [self.constituency_direct], 'state': 'Berlin'}
+
+    def test_reordered_title_is_served_from_cache(self):
+        """Test that a title with the same tokens in another order is a cache hit."""
+        fresh = SuggestionCache.suggest(self.TITLE, self.location)
+
+        with patch.object(ConstituencySuggestionService, 'suggest_from_concern') as pipeline:
+            cached = SuggestionCache.suggest('Autobahnen: Tempolimit einführen, auf!', self.location)
+
+        pipeline.assert_not_called()
+        self.assertEqual(cached['primary_topic'], self.verkehr)
+        self.assertEqual(cached['direct_representatives'], fresh['direct_representatives'])
+        self.assertEqual(cached['direct_representatives'][0].suggested_constituency, self.constituency_direct)
+        self.assertEqual(cached['expert_representatives'], [self.federal_expert_rep])
+        self.assertEqual(cached['expert_representatives'][0].relevant_committees, [self.membership])
+        self.assertEqual(cached['explanation'], fresh['explanation'])
+        self.assertEqual(cached['keywords'][0], 'autobahnen')
+
+    def test_repeated_tokens_miss(self):
+        """Test that repeating a word changes the key, since BM25 counts each occurrence."""
+        tokens = ConstituencySuggestionService._extract_tokens(self.TITLE)
+
+        self.assertNotEqual(
+            SuggestionCache.make_key(tokens, self.location),
+            SuggestionCache.make_key(tokens + tokens[:1], self.location),
+        )
+        self.assertEqual(
+            SuggestionCache.make_key(tokens, self.location),
+            SuggestionCache.make_key(list(reversed(tokens)), self.location),
+        )
+
+        SuggestionCache.suggest(self.TITLE, self.location)
+        SuggestionCache.suggest(f'{self.TITLE} Tempolimit', self.location)
+        self.assertEqual(SuggestionCache.stats()['misses'], 2)
+
+    def test_other_constituencies_miss(self):
+        """Test that the same title for other constituencies runs the pipeline."""
+        SuggestionCache.suggest(self.TITLE, self.location)
+
+        result = SuggestionCache.suggest(self.TITLE, {'constituencies': [self.constituency_other], 'state': 'Berlin'})
+
+        self.assertEqual(result['direct_representatives'], [self.other_direct_rep])
+        self.assertEqual(SuggestionCache.stats()['misses'], 2)
+
+    def test_data_version_bump_invalidates_entries(self):
+        """Test that bumping the suggestions data version drops cached entries."""
+        SuggestionCache.suggest(self.TITLE, self.location)
+
+        bump_data_version(SuggestionCache.VERSION_KEY)
+        SuggestionCache.suggest(self.TITLE, self.location)
+
+        self.assertEqual(SuggestionCache.stats()['hits'], 0)
+
+    def test_deleted_rows_fall_back_to_the_pipeline(self):
+        """Test that an entry referring to a deleted row is recomputed."""
+        SuggestionCache.suggest(self.TITLE, self.location)
+        self.direct_rep.delete()
+
+        result = SuggestionCache.suggest(self.TITLE, self.location)
+
+        self.assertEqual(result['direct_representatives'], [])
+        self.assertEqual(SuggestionCache.stats()['misses'], 2)
+
+    def test_analyze_title_reports_hit_rate(self):
+        """Test that analyze-title requests show up in the hit rate on the staff health details."""
+        verification = IdentityVerification.objects.create(
+            user=self.user, status='VERIFIED', verification_type='THIRD_PARTY', verified_at=timezone.now()
+        )
+        verification.constituencies.add(self.constituency_direct)
+        self.client.force_login(self.user)
+
+        for _ in range(2):
+            response = self.client.post(reverse('analyze_title'), {'title': self.TITLE})
+            self.assertContains(response, 'Max Mustermann')
+
+        self.user.is_staff = True
+        self.user.save()
+        stats = self.client.get(reverse('health_details')).json()['suggestion_cache']
+        self.assertEqual((stats['hits'], stats['misses'], stats['hit_rate']), (1, 1, 0.5))
+
+
+# End of file
@@ -0,0 +1,115 @@
+# ABOUTME: Tests for the German text analyzer and the matching services built on it.
+# ABOUTME: Covers stemming, compound splitting, synonyms, and topic, tag and committee matching.
+
+from django.test import SimpleTestCase, TestCase
+
+from letters.models import Committee, Parliament, ParliamentTerm, Tag
+from letters.services import ConstituencySuggestionService
+from letters.services.text_analysis import GermanAnalyzer
+from letters.services.ranking import RankingIndex
+from letters.services.tag_index import TagIndex
+from letters.services.topics import CommitteeTopicMappingService
+from letters.tests.test_fixtures import RankingIndexMixin, create_topic
+
+
+class GermanAnalyzerTests(SimpleTestCase):
+    """Test the analysis steps in isolation."""
+
+    def setUp(self):
+        self.analyzer = GermanAnalyzer()
+
+    def test_plurals_and_umlauts_share_a_stem(self):
+        """Test that plural, umlaut and singular forms reduce to one stem."""
+        self.assertEqual(self.analyzer.terms('Universitäten Universität'), ['universitat', 'universitat'])
+        self.assertEqual(self.analyzer.terms('Hochschulen Hochschule'), ['hochschul', 'hochschul'])
+        self.assertEqual(self.analyzer.terms('Mieten'), self.analyzer.terms('Miete'))
+
+    def test_stems_keep_a_final_n_that_is_not_an_ending(self):
+        """Test that a final n belonging to the word stem is kept."""
+        self.assertEqual(self.analyzer.terms('Bahn Bahnen'), ['bahn', 'bahn'])
+        self.assertEqual(self.analyzer.terms('Lohn Löhne'), ['lohn', 'lohn'])
+
+    def test_stopwords_and_short_tokens_are_dropped(self):
+        """Test that stopwords and tokens under three letters are dropped."""
+        self.assertEqual(self.analyzer.tokenize('Die Bahn und ab mit der Schule'), ['bahn', 'schule'])
+
+    def test_hyphenated_words_yield_their_parts(self):
+        """Test that a hyphenated word yields itself and its parts."""
+        self.assertEqual(self.analyzer.terms('CO2-Ausstoß'), ['co2-ausstoss', 'co2', 'ausstoss'])
+
+    def test_compounds_split_into_known_parts(self):
+        """Test that compounds split only into parts found in the vocabulary."""
+        vocabulary = {'forschung', 'forderung', 'wohnung', 'bau'}
+
+        self.assertEqual(self.analyzer.split_compound('forschungsforderung', vocabulary), ['forschung', 'forderung'])
+        self.assertEqual(self.analyzer.split_compound('wohnungsmarkt', vocabulary), ['wohnung', 'markt'])
+        self.assertEqual(self.analyzer.split_compound('klimaschutz', vocabulary), [])
+
+    def test_synonyms_expand_query_terms(self):
+        """Test that query terms include the synonyms of a word."""
+        terms = self.analyzer.query_terms('Universitäten', vocabulary=set())
+
+        self.assertIn('universitat', terms)
+        self.assertIn('hochschul', terms)
+
+
+class AnalyzedMatchingTests(RankingIndexMixin, TestCase):
+    """Test that topic, tag and committee matching go through the analyzer."""
+
+    INDEXES = (RankingIndex, TagIndex)
+
+    def setUp(self):
+        super().setUp()
+        self.bildung = create_topic('Bildung', 'hochschule, forschung, schule')
+        self.wohnen = create_topic('Wohnen', 'wohnung, miete, mietpreisbremse')
+
+    def test_plural_query_matches_synonym_topic(self):
+        """Test that a plural query matches a topic listing its synonym."""
+        self.assertEqual(ConstituencySuggestionService._match_topics(['universitäten']), [self.bildung])
+
+    def test_compound_query_matches_its_parts(self):
+        """Test that a compound query matches topics with its parts."""
+        self.assertEqual(RankingIndex.search_topics(['forschungsförderung']), [self.bildung])
+        self.assertEqual(RankingIndex.search_topics(['wohnungsnot']), [self.wohnen])
+
+    def test_tags_match_inflected_and_umlaut_forms(self):
+        """Test that tags match inflected queries across umlaut spellings."""
+        tag = Tag.objects.create(name='Hochschulförderung', slug='hochschulfoerderung')
+        Tag.objects.create(name='Verkehr', slug='verkehr')
+
+        self.assertEqual(ConstituencySuggestionService._match_tags(['hochschulen'], []), [tag])
+
+    def test_tag_index_is_built_once_and_rebuilt_after_tag_edits(self):
+        """Test that the tag index is served from memory until a tag changes."""
+        tag = Tag.objects.create(name='Verkehr', slug='verkehr')
+        ConstituencySuggestionService._match_tags(['verkehr'], [])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(ConstituencySuggestionService._match_tags(['verkehr'], []), [tag])
+
+        tag.name = 'Mobilität'
+        tag.slug = 'mobilitaet'
+        tag.save()
+        self.assertEqual(ConstituencySuggestionService._match_tags(['verkehr'], []), [])
+        self.assertEqual(ConstituencySuggestionService._match_tags(['mobilität'], []), [tag])
+
+    def test_committee_mapping_matches_plural_keywords(self):
+        """Test that committee keywords in the plural map to the topic."""
+        parliament = Parliament.objects.create(
+            name='Bundestag', level='FEDERAL', legislative_body='Bundestag', region='DE'
+        )
+        term = ParliamentTerm.objects.create(parliament=parliament, name='21. Wahlperiode')
+        committee = Committee.objects.create(
+            parliament_term=term,
+            name='Ausschuss für Bildung und Forschung',
+            keywords='Hochschulen, Universitäten, Verkehr',
+        )
+
+        CommitteeTopicMappingService.map_all_committees()
+
+        self.assertEqual(list(committee.topic_areas.all()), [self.bildung])
+        report = CommitteeTopicMappingService.get_committee_mapping_report(committee)
+        self.assertEqual(report['matched_topics'][0]['overlap_keywords'], ['Hochschulen'])
+
+
+# End of file
@@ -1,9 +1,14 @@
 # ABOUTME: Test topic suggestion and matching based on letter content.
 # ABOUTME: Covers TopicSuggestionService keyword matching and level suggestion logic.
 
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
-from letters.services import TopicSuggestionService
+from letters.services import ConstituencySuggestionService, TopicSuggestionService
+from letters.services.ranking import RankingIndex
 from letters.models import TopicArea
+from letters.tests.test_fixtures import RankingIndexMixin, create_topic
 
 
 class TopicMatchingTests(TestCase):
@@ -68,6 +73,58 @@ class TopicMatchingTests(TestCase):
         self.assertEqual(len(matched_topics), 0)
 
 
+class TopicRankingTests(RankingIndexMixin, TestCase):
+    """Test the BM25 index behind topic matching."""
+
+    def setUp(self):
+        super().setUp()
+        self.verkehr = create_topic(
+            'Verkehr', 'verkehr, bahn, nahverkehr, bus', 'Straßen, Bahn und öffentlicher Nahverkehr'
+        )
+        self.umwelt = create_topic('Umwelt', 'umweltschutz, klimaschutz, co2-ausstoß', 'Schutz vor Verkehr und Lärm')
+
+    def test_name_outweighs_description(self):
+        """Test that a name match ranks above a description match."""
+        self.assertEqual(RankingIndex.search_topics(['verkehr']), [self.verkehr, self.umwelt])
+
+    def test_hyphenated_keywords_match_their_parts(self):
+        """Test that a part of a hyphenated keyword matches the topic."""
+        self.assertEqual(RankingIndex.search_topics(['co2']), [self.umwelt])
+
+    def test_substring_fallback_when_no_whole_word_matches(self):
+        """Test that a token without whole-word hits falls back to keyword substrings."""
+        self.assertEqual(RankingIndex.search_topics(['klima']), [self.umwelt])
+        self.assertEqual(RankingIndex.search_topics(['xyzabc']), [])
+
+    def test_matching_is_served_from_memory(self):
+        """Test that topic matching needs no queries once the index is loaded."""
+        RankingIndex.search_topics(['bahn'])
+
+        with self.assertNumQueries(0):
+            topics = ConstituencySuggestionService._match_topics(['bahn', 'bus'])
+
+        self.assertEqual(topics, [self.verkehr])
+
+    def test_saving_and_deleting_topics_rebuilds_index(self):
+        """Test that TopicArea saves and deletes reach the index."""
+        self.assertEqual(RankingIndex.search_topics(['fahrrad']), [])
+
+        self.umwelt.keywords += ', fahrrad'
+        self.umwelt.save()
+        self.assertEqual(RankingIndex.search_topics(['fahrrad']), [self.umwelt])
+
+        self.umwelt.delete()
+        self.assertEqual(RankingIndex.search_topics(['fahrrad']), [])
+
+    def test_load_topic_taxonomy_rebuilds_index(self):
+        """Test that load_topic_taxonomy rebuilds the index with the new topics."""
+        RankingIndex.search_topics(['bundeswehr'])
+
+        call_command('load_topic_taxonomy', stdout=StringIO())
+
+        self.assertEqual([topic.name for topic in RankingIndex.search_topics(['bundeswehr'])], ['Verteidigung'])
+
+
 class LevelSuggestionTests(TestCase):
     """Test government level suggestion logic."""
 
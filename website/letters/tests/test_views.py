@@ -72,3 +72,47 @@ class ProfileViewAddressTests(TestCase):
         # Verify constituency was saved
         verification = IdentityVerification.objects.get(user=self.user)
         self.assertEqual(verification.federal_constituency, federal_const)
+
+
+class HealthCheckTests(TestCase):
+    """Test the public liveness probe and the staff-only health details."""
+
+    def tearDown(self):
+        from letters.services import WahlkreisLocator
+        WahlkreisLocator._warm_up_finished = False
+
+    def test_public_health_reports_liveness_only(self):
+        """Public health check should not expose warm-up state or cache stats"""
+        response = self.client.get(reverse('health'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'status': 'ok'})
+
+    def test_health_details_require_staff(self):
+        """Health details should redirect anonymous and non-staff users to the admin login"""
+        response = self.client.get(reverse('health_details'))
+        self.assertEqual(response.status_code, 302)
+
+        self.client.force_login(User.objects.create_user(username='member', password='password123'))
+        response = self.client.get(reverse('health_details'))
+        self.assertEqual(response.status_code, 302)
+
+    def test_health_details_report_boundary_warm_up(self):
+        """Health details should report boundary warm-up and geocode cache stats to staff"""
+        import os
+        from letters.services import WahlkreisLocator
+
+        self.client.force_login(
+            User.objects.create_user(username='staff', password='password123', is_staff=True)
+        )
+        response = self.client.get(reverse('health_details'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'ok')
+        self.assertFalse(response.json()['boundaries_warm'])
+        self.assertIn('memory', response.json()['geocode_cache'])
+
+        fixture_path = os.path.join(os.path.dirname(__file__), 'fixtures', 'wahlkreise.geojson')
+        WahlkreisLocator.warm_up(fixture_path)
+
+        response = self.client.get(reverse('health_details'))
+        self.assertTrue(response.json()['boundaries_warm'])
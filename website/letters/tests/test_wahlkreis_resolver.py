@@ -1,8 +1,10 @@
 # ABOUTME: Tests for WahlkreisResolver service that maps addresses to Wahlkreis identifiers
 # ABOUTME: and then resolves those identifiers to Constituency objects.
 from unittest.mock import patch, MagicMock
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
+from letters.services.constituency_directory import ConstituencyDirectory
+from letters.services.versioning import bump_data_version
 from letters.services.wahlkreis import WahlkreisResolver
 from letters.models import Parliament, ParliamentTerm, Constituency
 
@@ -139,3 +141,80 @@ class WahlkreisResolverTests(TestCase):
                      "Should include federal state list")
         self.assertIn(state_district.id, constituency_ids,
                      "Should include state district")
+
+
+class ConstituencyDirectoryTests(TestCase):
+    """Test that constituency lookups are served from memory and invalidated on writes."""
+
+    def setUp(self):
+        ConstituencyDirectory.clear()
+        parliament = Parliament.objects.create(
+            name='Bundestag', level='FEDERAL', legislative_body='Bundestag', region='DE'
+        )
+        self.term = ParliamentTerm.objects.create(parliament=parliament, name='21. Wahlperiode')
+        self.district = Constituency.objects.create(
+            parliament_term=self.term,
+            name='Berlin-Mitte',
+            scope='FEDERAL_DISTRICT',
+            list_id='075',
+            metadata={'state': 'Berlin'}
+        )
+        self.state_list = Constituency.objects.create(
+            parliament_term=self.term,
+            name='Landesliste Berlin',
+            scope='FEDERAL_STATE_LIST',
+            metadata={'state': 'Berlin'}
+        )
+
+        self.resolver = WahlkreisResolver()
+        self.resolver._wahlkreis_locator = MagicMock()
+        self.resolver._wahlkreis_locator.locate.return_value = {
+            'federal': {'wkr_nr': 75, 'wkr_name': 'Berlin-Mitte', 'land_name': 'Berlin', 'land_code': 'BE'},
+            'state': None,
+        }
+
+    @patch('letters.services.wahlkreis.AddressGeocoder.geocode')
+    def test_repeat_resolve_needs_no_queries(self, mock_geocode):
+        mock_geocode.return_value = (52.52, 13.38, True, None)
+        self.resolver.resolve('Unter den Linden 1, Berlin')
+
+        with self.assertNumQueries(0):
+            result = self.resolver.resolve('Unter den Linden 1, Berlin')
+
+        self.assertEqual(result['constituencies'], [self.district, self.state_list])
+
+    @patch('letters.services.wahlkreis.AddressGeocoder.geocode')
+    def test_constituency_save_invalidates_directory(self, mock_geocode):
+        mock_geocode.return_value = (52.52, 13.38, True, None)
+        self.resolver.resolve('Unter den Linden 1, Berlin')
+
+        next_term = ParliamentTerm.objects.create(parliament=self.term.parliament, name='22. Wahlperiode')
+        second = Constituency.objects.create(
+            parliament_term=next_term,
+            name='Berlin-Mitte',
+            scope='FEDERAL_DISTRICT',
+            list_id='075',
+            metadata={'state': 'Berlin'}
+        )
+        result = self.resolver.resolve('Unter den Linden 1, Berlin')
+
+        self.assertIn(second, result['constituencies'])
+
+    def test_bulk_update_needs_version_bump(self):
+        self.assertEqual(ConstituencyDirectory.by_list_id('FEDERAL_DISTRICT', '075'), [self.district])
+
+        # queryset.update() sends no signals, so writers bump the version themselves
+        Constituency.objects.filter(pk=self.district.pk).update(list_id='076')
+        self.assertEqual(ConstituencyDirectory.by_list_id('FEDERAL_DISTRICT', '075'), [self.district])
+
+        bump_data_version(ConstituencyDirectory.VERSION_KEY)
+        self.assertEqual(ConstituencyDirectory.by_list_id('FEDERAL_DISTRICT', '075'), [])
+        self.assertEqual(ConstituencyDirectory.by_list_id('FEDERAL_DISTRICT', '076'), [self.district])
+
+    def test_expired_ttl_reloads_without_version_bump(self):
+        """Test that CONSTITUENCY_DIRECTORY_TTL bounds staleness when no bump reaches this worker."""
+        self.assertEqual(ConstituencyDirectory.by_list_id('FEDERAL_DISTRICT', '075'), [self.district])
+        Constituency.objects.filter(pk=self.district.pk).update(list_id='076')
+
+        with override_settings(CONSTITUENCY_DIRECTORY_TTL=0):
+            self.assertEqual(ConstituencyDirectory.by_list_id('FEDERAL_DISTRICT', '075'), [])
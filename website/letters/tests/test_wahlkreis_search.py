@@ -1,12 +1,19 @@
 # ABOUTME: Tests for wahlkreis search endpoint that geocodes addresses without storing them.
 # ABOUTME: Validates authentication, valid/invalid addresses, and error handling.
+from unittest.mock import AsyncMock, MagicMock, patch
+
 from django.test import TestCase, Client
 from django.contrib.auth.models import User
+from django.core.cache import caches
 from django.urls import reverse
 
+from letters.models import Constituency, GeocodeJob, Parliament, ParliamentTerm, PostalCodeWahlkreis
+from letters.services.geocoding_cache import GeocodeResultCache
+
 
 class WahlkreisSearchTestCase(TestCase):
     def setUp(self):
+        GeocodeResultCache.clear()
         self.client = Client()
         self.user = User.objects.create_user(username='testuser', password='testpass')
         self.client.login(username='testuser', password='testpass')
@@ -60,3 +67,155 @@ class WahlkreisSearchTestCase(TestCase):
         content = response.content.decode('utf-8')
         self.assertIn('alert-danger', content)
         self.assertIn('Please provide street address, postal code, and city', content)
+
+
+class AsyncWahlkreisSearchTestCase(TestCase):
+    def setUp(self):
+        GeocodeResultCache.clear()
+        self.client = Client()
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.client.login(username='testuser', password='testpass')
+        self.url = reverse('search_wahlkreis_async')
+
+        parliament = Parliament.objects.create(
+            name='Bundestag', level='FEDERAL', legislative_body='Bundestag', region='DE'
+        )
+        term = ParliamentTerm.objects.create(parliament=parliament, name='21. Wahlperiode')
+        self.constituency = Constituency.objects.create(
+            parliament_term=term,
+            name='Berlin-Mitte',
+            scope='FEDERAL_DISTRICT',
+            list_id='075',
+            metadata={'state': 'Berlin'}
+        )
+
+    def test_async_search_requires_authentication(self):
+        self.client.logout()
+        response = self.client.post(self.url, {
+            'street_address': 'Platz der Republik 1',
+            'postal_code': '11011',
+            'city': 'Berlin'
+        })
+        self.assertEqual(response.status_code, 302)
+
+    @patch('letters.services.wahlkreis.WahlkreisLocator')
+    @patch('letters.services.geocoding_backends.NominatimBackend.lookup_structured_async', new_callable=AsyncMock)
+    @patch('letters.services.geocoding_backends.requests.get')
+    def test_async_search_uses_async_backend(self, mock_get, mock_lookup, mock_locator_class):
+        mock_lookup.return_value = (52.5186, 13.3761)
+        mock_locator = MagicMock()
+        mock_locator.locate.return_value = {
+            'federal': {'wkr_nr': 75, 'wkr_name': 'Berlin-Mitte', 'land_name': 'Berlin', 'land_code': 'BE'},
+            'state': None,
+        }
+        mock_locator_class.return_value = mock_locator
+
+        response = self.client.post(self.url, {
+            'street_address': 'Platz der Republik 1',
+            'postal_code': '11011',
+            'city': 'Berlin'
+        }, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+        self.assertEqual(response.status_code, 200)
+        content = response.content.decode('utf-8')
+        self.assertIn('alert-success', content)
+        self.assertIn(f'data-federal-wahlkreis-id="{self.constituency.id}"', content)
+        mock_lookup.assert_awaited_once_with('Platz der Republik 1', '11011', 'Berlin', 'DE')
+        mock_get.assert_not_called()
+
+    def test_async_search_missing_fields(self):
+        response = self.client.post(self.url, {
+            'street_address': 'Platz der Republik 1'
+        }, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Please provide street address, postal code, and city', response.content.decode('utf-8'))
+
+
+class QueuedWahlkreisSearchTestCase(TestCase):
+    def setUp(self):
+        GeocodeResultCache.clear()
+        self.client = Client()
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.client.login(username='testuser', password='testpass')
+        self.url = reverse('search_wahlkreis_queued')
+        # Per-user enqueue quota
+        caches['default'].clear()
+        self.address = {
+            'street_address': 'Platz der Republik 1',
+            'postal_code': '11011',
+            'city': 'Berlin'
+        }
+
+        parliament = Parliament.objects.create(
+            name='Bundestag', level='FEDERAL', legislative_body='Bundestag', region='DE'
+        )
+        term = ParliamentTerm.objects.create(parliament=parliament, name='21. Wahlperiode')
+        self.constituency = Constituency.objects.create(
+            parliament_term=term,
+            name='Berlin-Mitte',
+            scope='FEDERAL_DISTRICT',
+            list_id='075',
+            metadata={'state': 'Berlin'}
+        )
+
+    def test_queued_search_requires_authentication(self):
+        self.client.logout()
+        response = self.client.post(self.url, self.address)
+        self.assertEqual(response.status_code, 302)
+
+    @patch('letters.services.geocoding_backends.requests.get')
+    def test_queued_search_enqueues_and_polls(self, mock_get):
+        response = self.client.post(self.url, self.address, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+        self.assertEqual(response.status_code, 200)
+        job = GeocodeJob.objects.get()
+        self.assertEqual(job.status, 'PENDING')
+        poll_url = reverse('search_wahlkreis_job', kwargs={'token': job.token})
+        self.assertIn(f'hx-get="{poll_url}"', response.content.decode('utf-8'))
+        mock_get.assert_not_called()
+
+        # Still pending: the placeholder keeps polling
+        poll = self.client.get(poll_url)
+        self.assertIn(f'hx-get="{poll_url}"', poll.content.decode('utf-8'))
+
+    @patch('letters.services.wahlkreis.WahlkreisLocator')
+    def test_poll_renders_result_of_finished_job(self, mock_locator_class):
+        mock_locator = MagicMock()
+        mock_locator.locate.return_value = {
+            'federal': {'wkr_nr': 75, 'wkr_name': 'Berlin-Mitte', 'land_name': 'Berlin', 'land_code': 'BE'},
+            'state': None,
+        }
+        mock_locator_class.return_value = mock_locator
+        job = GeocodeJob.objects.create(
+            address_hash='x' * 64,
+            address='Platz der Republik 1, 11011 Berlin',
+            status='DONE',
+            latitude=52.5186,
+            longitude=13.3761,
+        )
+
+        response = self.client.get(reverse('search_wahlkreis_job', kwargs={'token': job.token}))
+
+        content = response.content.decode('utf-8')
+        self.assertIn('alert-success', content)
+        self.assertIn(f'data-federal-wahlkreis-id="{self.constituency.id}"', content)
+        mock_locator.locate.assert_called_once_with(52.5186, 13.3761)
+
+    @patch('letters.services.geocoding_backends.requests.get')
+    def test_street_address_in_mapped_postal_code_is_still_queued(self, mock_get):
+        """Test that the postal code table never stands in for geocoding a street address."""
+        PostalCodeWahlkreis.objects.create(
+            postal_code='11011',
+            federal_wkr_nr=75,
+            federal_wkr_name='Berlin-Mitte',
+            land_name='Berlin',
+            land_code='BE',
+            source='AREAS',
+        )
+
+        response = self.client.post(self.url, self.address, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+        self.assertIn('hx-get', response.content.decode('utf-8'))
+        self.assertTrue(GeocodeJob.objects.filter(status='PENDING').exists())
+        mock_get.assert_not_called()
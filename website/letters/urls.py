@@ -22,6 +22,11 @@ urlpatterns = [
     # HTMX endpoints
     path('api/analyze-title/', views.analyze_letter_title, name='analyze_title'),
     path('api/search-wahlkreis/', views.search_wahlkreis, name='search_wahlkreis'),
+    path('api/search-wahlkreis/async/', views.search_wahlkreis_async, name='search_wahlkreis_async'),
+    path('api/search-wahlkreis/queued/', views.search_wahlkreis_queued, name='search_wahlkreis_queued'),
+    path('api/search-wahlkreis/jobs/<uuid:token>/', views.search_wahlkreis_job, name='search_wahlkreis_job'),
+    path('api/geocode-jobs/', views.enqueue_geocode_job, name='enqueue_geocode_job'),
+    path('api/geocode-jobs/<uuid:token>/', views.geocode_job_status, name='geocode_job_status'),
 
     # Authentication URLs
     path('register/', views.register, name='register'),
@@ -2,9 +2,11 @@ import logging
 import re
 from collections import OrderedDict
 
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect, get_object_or_404
 from django.http import JsonResponse
 from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import logout
 from django.contrib.auth.models import User
@@ -30,7 +32,9 @@ from .forms import (
     UserRegisterForm,
     SelfDeclaredConstituencyForm,
 )
-from .services import IdentityVerificationService, ConstituencySuggestionService
+from .services import IdentityVerificationService, WahlkreisLocator, GeocodeQueue
+from .services.geocoding_cache import GeocodeResultCache
+from .services.suggestion_cache import SuggestionCache
 from .services.wahlkreis import WahlkreisResolver
 
 logger = logging.getLogger('letters.services')
@@ -581,6 +585,68 @@ def complete_verification(request):
     return redirect('profile')
 
 
+def _wahlkreis_search_fields(request):
+    return (
+        request.POST.get('street_address', '').strip(),
+        request.POST.get('postal_code', '').strip(),
+        request.POST.get('city', '').strip(),
+    )
+
+
+def _wahlkreis_search_context(result, address):
+    """Template context for a WahlkreisResolver result, or an error message if nothing matched."""
+    constituencies = result['constituencies']
+
+    if not constituencies:
+        logger.warning(
+            f'Address search found no constituencies for {address}'
+        )
+        return {
+            'success': False,
+            'error': 'Could not find constituencies for this address. Please select manually.'
+        }
+
+    # Find federal and state constituencies
+    federal_constituency = None
+    state_constituency = None
+
+    for constituency in constituencies:
+        if constituency.scope == 'FEDERAL_DISTRICT' and not federal_constituency:
+            federal_constituency = constituency
+        elif constituency.scope in ['STATE_LIST', 'STATE_DISTRICT'] and not state_constituency:
+            state_constituency = constituency
+
+    # Get display name from metadata if available
+    wahlkreis_name = 'Unknown'
+    land_name = 'Unknown'
+
+    if federal_constituency and federal_constituency.metadata:
+        wahlkreis_name = federal_constituency.name
+        land_name = federal_constituency.metadata.get('state', 'Unknown')
+
+    return {
+        'success': True,
+        'wahlkreis_name': wahlkreis_name,
+        'land_name': land_name,
+        'federal_constituency_id': federal_constituency.id if federal_constituency else None,
+        'state_constituency_id': state_constituency.id if state_constituency else None,
+    }
+
+
+WAHLKREIS_SEARCH_MISSING_FIELDS = {
+    'success': False,
+    'error': 'Please provide street address, postal code, and city.'
+}
+WAHLKREIS_SEARCH_UNAVAILABLE = {
+    'success': False,
+    'error': 'Search temporarily unavailable. Please select Wahlkreise manually.'
+}
+WAHLKREIS_SEARCH_THROTTLED = {
+    'success': False,
+    'error': 'Too many address lookups. Please try again later or select Wahlkreise manually.'
+}
+
+
 @login_required
 @require_http_methods(["POST"])
 def search_wahlkreis(request):
@@ -588,68 +654,156 @@ def search_wahlkreis(request):
     HTMX endpoint: Search for Wahlkreis by address.
     Returns HTML fragment with constituency data or error message.
     """
-    street_address = request.POST.get('street_address', '').strip()
-    postal_code = request.POST.get('postal_code', '').strip()
-    city = request.POST.get('city', '').strip()
+    street_address, postal_code, city = _wahlkreis_search_fields(request)
 
     # Validate required fields
     if not all([street_address, postal_code, city]):
-        return render(request, 'letters/partials/wahlkreis_search_result.html', {
-            'success': False,
-            'error': 'Please provide street address, postal code, and city.'
-        })
+        return render(request, 'letters/partials/wahlkreis_search_result.html', WAHLKREIS_SEARCH_MISSING_FIELDS)
 
-    # Build full address string
+    # Full address string for logging
     address = f"{street_address}, {postal_code} {city}"
 
     # Find constituencies using WahlkreisResolver
     try:
         resolver = WahlkreisResolver()
-        result = resolver.resolve(address=address, country='DE')
-        constituencies = result['constituencies']
+        result = resolver.resolve_structured(street_address, postal_code, city, country='DE')
+        context = _wahlkreis_search_context(result, address)
+    except Exception:
+        logger.exception('Unexpected error during wahlkreis search')
+        context = WAHLKREIS_SEARCH_UNAVAILABLE
 
-        if not constituencies:
-            logger.warning(
-                f'Address search found no constituencies for {address}'
-            )
-            return render(request, 'letters/partials/wahlkreis_search_result.html', {
-                'success': False,
-                'error': 'Could not find constituencies for this address. Please select manually.'
-            })
+    return render(request, 'letters/partials/wahlkreis_search_result.html', context)
 
-        # Find federal and state constituencies
-        federal_constituency = None
-        state_constituency = None
-
-        for constituency in constituencies:
-            if constituency.scope == 'FEDERAL_DISTRICT' and not federal_constituency:
-                federal_constituency = constituency
-            elif constituency.scope in ['STATE_LIST', 'STATE_DISTRICT'] and not state_constituency:
-                state_constituency = constituency
-
-        # Get display name from metadata if available
-        wahlkreis_name = 'Unknown'
-        land_name = 'Unknown'
-
-        if federal_constituency and federal_constituency.metadata:
-            wahlkreis_name = federal_constituency.name
-            land_name = federal_constituency.metadata.get('state', 'Unknown')
-
-        return render(request, 'letters/partials/wahlkreis_search_result.html', {
-            'success': True,
-            'wahlkreis_name': wahlkreis_name,
-            'land_name': land_name,
-            'federal_constituency_id': federal_constituency.id if federal_constituency else None,
-            'state_constituency_id': state_constituency.id if state_constituency else None,
-        })
 
-    except Exception as e:
-        logger.exception('Unexpected error during wahlkreis search')
-        return render(request, 'letters/partials/wahlkreis_search_result.html', {
-            'success': False,
-            'error': 'Search temporarily unavailable. Please select Wahlkreise manually.'
+@login_required
+@require_http_methods(["POST"])
+async def search_wahlkreis_async(request):
+    """
+    HTMX endpoint: async variant of search_wahlkreis for ASGI deployments.
+    Waiting on the geocoder suspends the coroutine instead of holding a worker.
+    """
+    street_address, postal_code, city = _wahlkreis_search_fields(request)
+
+    if not all([street_address, postal_code, city]):
+        context = WAHLKREIS_SEARCH_MISSING_FIELDS
+    else:
+        address = f"{street_address}, {postal_code} {city}"
+        try:
+            resolver = WahlkreisResolver()
+            result = await resolver.resolve_structured_async(street_address, postal_code, city, country='DE')
+            context = _wahlkreis_search_context(result, address)
+        except Exception:
+            logger.exception('Unexpected error during wahlkreis search')
+            context = WAHLKREIS_SEARCH_UNAVAILABLE
+
+    # Context processors may touch the session and user, which need the ORM
+    return await sync_to_async(render)(request, 'letters/partials/wahlkreis_search_result.html', context)
+
+
+def _render_wahlkreis_job(request, job):
+    """Render a queued Wahlkreis search: a polling placeholder until the job has finished."""
+    if not job.is_finished:
+        return render(request, 'letters/partials/wahlkreis_search_pending.html', {
+            'poll_url': reverse('search_wahlkreis_job', kwargs={'token': job.token}),
         })
 
+    if job.status == 'FAILED':
+        context = _wahlkreis_search_context({'constituencies': []}, job.address)
+    else:
+        try:
+            result = WahlkreisResolver().resolve_coordinates(job.latitude, job.longitude, job.address)
+            context = _wahlkreis_search_context(result, job.address)
+        except Exception:
+            logger.exception('Unexpected error during wahlkreis search')
+            context = WAHLKREIS_SEARCH_UNAVAILABLE
+
+    return render(request, 'letters/partials/wahlkreis_search_result.html', context)
+
+
+@login_required
+@require_http_methods(["POST"])
+def search_wahlkreis_queued(request):
+    """
+    HTMX endpoint: Wahlkreis search that geocodes through the GeocodeQueue.
+
+    The address is enqueued for geocode_worker and the response polls
+    search_wahlkreis_job, so the request never waits on the Nominatim rate
+    limit. Cached addresses come back finished at once.
+    """
+    street_address, postal_code, city = _wahlkreis_search_fields(request)
+
+    if not all([street_address, postal_code, city]):
+        return render(request, 'letters/partials/wahlkreis_search_result.html', WAHLKREIS_SEARCH_MISSING_FIELDS)
+
+    address = f"{street_address}, {postal_code} {city}"
+
+    if not GeocodeQueue.allow_user_enqueue(request.user.pk):
+        return render(request, 'letters/partials/wahlkreis_search_result.html', WAHLKREIS_SEARCH_THROTTLED)
+
+    job = GeocodeQueue.enqueue(address, country='DE')
+    return _render_wahlkreis_job(request, job)
+
+
+@login_required
+@require_http_methods(["GET"])
+def search_wahlkreis_job(request, token):
+    """HTMX endpoint: poll a queued Wahlkreis search started by search_wahlkreis_queued."""
+    job = GeocodeQueue.get(token)
+    if job is None:
+        return render(request, 'letters/partials/wahlkreis_search_result.html', WAHLKREIS_SEARCH_UNAVAILABLE)
+    return _render_wahlkreis_job(request, job)
+
+
+def _geocode_job_payload(request, job):
+    return {
+        'token': str(job.token),
+        'status': job.status,
+        'latitude': job.latitude,
+        'longitude': job.longitude,
+        'error': job.error_message or None,
+        'poll_url': request.build_absolute_uri(
+            reverse('geocode_job_status', kwargs={'token': job.token})
+        ),
+    }
+
+
+@login_required
+@require_http_methods(["POST"])
+def enqueue_geocode_job(request):
+    """
+    Queue an address for background geocoding.
+    Returns the job handle immediately; poll geocode_job_status for the result.
+    Each user may enqueue GEOCODE_JOB_USER_LIMIT addresses per window.
+    """
+    street_address = request.POST.get('street_address', '').strip()
+    postal_code = request.POST.get('postal_code', '').strip()
+    city = request.POST.get('city', '').strip()
+
+    if not all([street_address, postal_code, city]):
+        return JsonResponse(
+            {'error': 'Please provide street address, postal code, and city.'},
+            status=400
+        )
+
+    if not GeocodeQueue.allow_user_enqueue(request.user.pk):
+        return JsonResponse(
+            {'error': 'Too many address lookups. Please try again later.'},
+            status=429
+        )
+
+    job = GeocodeQueue.enqueue(f"{street_address}, {postal_code} {city}", country='DE')
+    return JsonResponse(_geocode_job_payload(request, job), status=200 if job.is_finished else 202)
+
+
+@login_required
+@require_http_methods(["GET"])
+def geocode_job_status(request, token):
+    """Poll a queued geocoding job. Responds 202 while the job is still pending."""
+    job = GeocodeQueue.get(token)
+    if job is None:
+        return JsonResponse({'error': 'Unknown geocode job'}, status=404)
+    return JsonResponse(_geocode_job_payload(request, job), status=200 if job.is_finished else 202)
+
 
 # Letter Creation Suggestions (HTMX endpoints)
 
@@ -681,8 +835,8 @@ def analyze_letter_title(request):
             if constituency_states:
                 user_location.setdefault('state', next(iter(constituency_states)))
 
-    # Analyze with ConstituencySuggestionService
-    suggestion_result = ConstituencySuggestionService.suggest_from_concern(
+    # Analyze with ConstituencySuggestionService, memoized per token set and location
+    suggestion_result = SuggestionCache.suggest(
         title,
         user_location=user_location or None
     )
@@ -815,6 +969,23 @@ class CommitteeDetailView(DetailView):
         return context
 
 
+def health(request):
+    """Public liveness probe for load balancers."""
+    return JsonResponse({'status': 'ok'})
+
+
+@staff_member_required
+def health_details(request):
+    """Staff-only report of this process's boundary warm-up state and geocode and suggestion cache hit rates."""
+    return JsonResponse({
+        'status': 'ok',
+        'boundaries_preload_enabled': getattr(settings, 'PRELOAD_BOUNDARIES', False),
+        'boundaries_warm': WahlkreisLocator.is_warm(),
+        'geocode_cache': GeocodeResultCache.stats(),
+        'suggestion_cache': SuggestionCache.stats(),
+    })
+
+
 def data_sources(request):
     """Display data sources and attribution information."""
     # Hardcoded list of states with constituency data available
@@ -149,6 +149,71 @@ LOGOUT_REDIRECT_URL = 'letter_list'
 
 # Constituency boundary data
 CONSTITUENCY_BOUNDARIES_PATH = BASE_DIR / 'letters' / 'data' / 'wahlkreise.geojson'
+# Load boundary data in LettersConfig.ready() instead of on the first lookup.
+# Enable together with gunicorn --preload so workers share the parsed geometries.
+PRELOAD_BOUNDARIES = False
+# Precompiled WKB snapshot of all boundary files (built by `compile_boundaries`); used when present
+CONSTITUENCY_BOUNDARIES_ARTIFACT_PATH = BASE_DIR / 'letters' / 'data' / 'boundaries.bin'
+# Each boundary also gets a simplified inner polygon and outer hull (degrees); points clearly
+# inside or outside skip the full geometry. 0 disables the tiers. Re-run compile_boundaries after changing it.
+BOUNDARY_SIMPLIFY_TOLERANCE = 0.0005
+# WahlkreisLocator caches results per grid cell (0.0005° ≈ 55 m north-south); 0 disables it.
+# Cells on a boundary are flagged on the first lookup (or PRELOAD_BOUNDARIES warm-up); smaller cells flag more of them (memory grows ~1/size).
+WAHLKREIS_CELL_SIZE_DEGREES = 0.0005
+WAHLKREIS_CELL_CACHE_SIZE = 100_000
+# In-memory snapshots (VersionedSnapshot subclasses) are rebuilt when their data version is bumped or,
+# since another worker may have bumped it in a per-process cache, at the latest after their *_TTL seconds:
+# CONSTITUENCY_DIRECTORY_TTL - constituencies by Wahlkreis number, for WahlkreisResolver
+# RANKING_INDEX_TTL - BM25 index over topics and committees (re-checked against RANKING_INDEX_PATH)
+# EXPERTISE_INDEX_TTL - RepresentativeExpertise profiles used for expert ranking
+# TAG_INDEX_TTL - normalized tag names for tag suggestions
+CONSTITUENCY_DIRECTORY_TTL = 300
+RANKING_INDEX_TTL = 300
+EXPERTISE_INDEX_TTL = 300
+TAG_INDEX_TTL = 300
+# BM25 index artifact written by load_topic_taxonomy, sync_representatives and build_ranking_index.
+# Workers load it when it matches the tables and rebuild the index in memory otherwise.
+RANKING_INDEX_PATH = BASE_DIR / 'letters' / 'data' / 'ranking_index.json'
+# Title analysis results (topic, representative and tag ids per token set and location) are cached
+# per process and, when SUGGESTION_SHARED_CACHE_ALIAS names a CACHES alias, across workers. Syncs and
+# taxonomy loads invalidate them; other edits show up after SUGGESTION_CACHE_TTL seconds.
+SUGGESTION_MEMORY_CACHE_SIZE = 1024
+SUGGESTION_CACHE_TTL = 10 * 60
+SUGGESTION_SHARED_CACHE_ALIAS = None
+# Text analyzer for topic, tag and committee keyword matching (stemming, compounds, synonyms)
+TEXT_ANALYZER = 'letters.services.text_analysis.GermanAnalyzer'
+
+# Address geocoding backend: 'nominatim' (public API, 1 req/s),
+# 'nominatim-self-hosted' (GEOCODER_NOMINATIM_URL, no rate limit) or
+# 'local' (offline PLZ/street centroid CSV at GEOCODER_GAZETTEER_PATH)
+GEOCODER_BACKEND = 'nominatim'
+GEOCODER_NOMINATIM_URL = None
+GEOCODER_GAZETTEER_PATH = BASE_DIR / 'letters' / 'data' / 'gazetteer.csv'
+# Rate-limited backends share one limiter per host through a lock file in this directory
+# (None: the system temp directory). Web requests give up after GEOCODER_RATE_LIMIT_MAX_WAIT
+# seconds; geocode_worker always waits. BURST allows that many back-to-back requests after idling.
+GEOCODER_RATE_LIMIT_DIR = None
+GEOCODER_RATE_LIMIT_MAX_WAIT = 10.0
+GEOCODER_RATE_LIMIT_BURST = 1
+# Geocoding result cache tiers in front of the GeocodeCache table (seconds / entries).
+# Set GEOCODE_SHARED_CACHE_ALIAS to a CACHES alias (e.g. Redis) to share results across workers.
+GEOCODE_MEMORY_CACHE_SIZE = 2048
+GEOCODE_CACHE_TTL = 24 * 60 * 60
+GEOCODE_NEGATIVE_CACHE_TTL = 5 * 60
+GEOCODE_SHARED_CACHE_ALIAS = None
+# Failed lookups are retried: transient errors back off exponentially, misses after 30 days,
+# other errors (4xx, malformed responses) after 7 days
+GEOCODE_RETRY_BASE_SECONDS = 60
+GEOCODE_RETRY_MAX_SECONDS = 24 * 60 * 60
+GEOCODE_NOT_FOUND_RETRY_SECONDS = 30 * 24 * 60 * 60
+GEOCODE_PERMANENT_RETRY_SECONDS = 7 * 24 * 60 * 60
+# Each user may enqueue this many background geocoding jobs per window (seconds)
+GEOCODE_JOB_USER_LIMIT = 20
+GEOCODE_JOB_USER_WINDOW = 60 * 60
+# Address resolution records timing spans (geocode.http, locator.locate, ...) at DEBUG level on the
+# 'letters.services' logger. Set to the dotted path of a callable sink(name, seconds, tags) to also
+# send them to a metrics system.
+INSTRUMENTATION_SINK = None
 
 # Email settings (development defaults; override in production)
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
@@ -21,9 +21,14 @@ from django.conf.urls.static import static
 from django.conf.urls.i18n import i18n_patterns
 from django.views.i18n import set_language
 
+from letters import views as letters_views
+
 urlpatterns = [
     # Language switcher endpoint (no prefix)
     path('i18n/setlang/', set_language, name='set_language'),
+    # Health check for load balancers (no prefix); cache and warm-up stats for staff
+    path('health/', letters_views.health, name='health'),
+    path('health/details/', letters_views.health_details, name='health_details'),
 ]
 
 # All user-facing URLs get language prefix